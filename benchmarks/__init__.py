@@ -0,0 +1 @@
+"""Performance benchmarks; see e2e.py."""
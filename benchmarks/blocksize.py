@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Veri döngüsü blok boyutu ölçümleri.
+
+Hızlı bir hatta (10 GbE) darboğaz ağ değil, blok başına Python işidir: her
+blokta yeni bir bytes nesnesi, bir geri çağırma, bir write() çağrısı. Bu
+betik localhost üstünde bir socketpair'den dosyaya aynı miktarda veriyi
+iki yolla taşır:
+
+    chunks_8k     ftplib retrbinary gibi: recv(8192) → yeni bytes → f.write
+    pool_<boyut>  bağlayıcıların yolu: havuzdan tek tampon, recv_into → yazma
+
+ve MB/s ile blok başına mikro saniyeyi raporlar. Disk hızı karışmasın diye
+varsayılan hedef /dev/null'dur; --dir ile gerçek bir diske yazılır.
+
+Kullanım (proje kökünden):
+
+    python -m benchmarks.blocksize
+    python -m benchmarks.blocksize --size-mb 2048 --block-kb 256 --block-kb 4096
+    python -m benchmarks.blocksize --dir /mnt/nvme
+"""
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+from connectors.buffers import BufferPool, write_all
+
+from . import report
+
+
+MB = 1024 * 1024
+DEFAULT_BLOCKS_KB = (256, 1024, 4096, 8192)
+
+
+def _sender(sock: socket.socket, total: int) -> threading.Thread:
+    def send():
+        chunk = memoryview(os.urandom(4 * MB))
+        left = total
+        while left > 0:
+            n = min(left, len(chunk))
+            sock.sendall(chunk[:n])
+            left -= n
+        sock.close()
+
+    thread = threading.Thread(target=send, daemon=True)
+    thread.start()
+    return thread
+
+
+def _pair() -> tuple[socket.socket, socket.socket]:
+    recv, send = socket.socketpair()
+    for s in (recv, send):
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * MB)
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * MB)
+    return recv, send
+
+
+def run_chunks(path: str, total: int) -> tuple[float, int]:
+    recv, send = _pair()
+    thread = _sender(send, total)
+    blocks = 0
+    start = time.perf_counter()
+    with open(path, "wb") as f:
+        while True:
+            data = recv.recv(8192)
+            if not data:
+                break
+            f.write(data)
+            blocks += 1
+    elapsed = time.perf_counter() - start
+    thread.join()
+    recv.close()
+    return elapsed, blocks
+
+
+def run_pool(path: str, total: int, block_size: int) -> tuple[float, int]:
+    recv, send = _pair()
+    thread = _sender(send, total)
+    blocks = 0
+    start = time.perf_counter()
+    with open(path, "wb", buffering=0) as f, BufferPool(block_size).lease() as buf:
+        while True:
+            n = recv.recv_into(buf)
+            if not n:
+                break
+            write_all(f, buf[:n])
+            blocks += 1
+    elapsed = time.perf_counter() - start
+    thread.join()
+    recv.close()
+    return elapsed, blocks
+
+
+def _result(total: int, elapsed: float, blocks: int) -> dict:
+    return {
+        "mb_s": total / MB / elapsed,
+        "blocks": blocks,
+        "us_per_block": elapsed / max(1, blocks) * 1e6,
+    }
+
+
+def run(total: int, blocks_kb: list[int], repeat: int, directory: str = "") -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory or None) as tmp:
+        path = os.path.join(tmp, "out.bin") if directory else os.devnull
+        cases = [("chunks_8k", lambda: run_chunks(path, total))]
+        cases += [(f"pool_{kb}k", lambda kb=kb: run_pool(path, total, kb * 1024)) for kb in blocks_kb]
+        for name, func in cases:
+            print(f"{name} ...", end=" ", flush=True)
+            best = min((func() for _ in range(repeat)), key=lambda r: r[0])
+            results[name] = _result(total, *best)
+            print(f"{results[name]['mb_s']:.0f} MB/s")
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="DuckTransfer veri döngüsü blok boyutu ölçümleri")
+    parser.add_argument("--size-mb", type=float, default=512, help="taşınacak veri miktarı")
+    parser.add_argument("--block-kb", type=int, action="append", help=f"havuz blok boyutu, KB (varsayılan: {DEFAULT_BLOCKS_KB})")
+    parser.add_argument("--repeat", type=int, default=3, help="ölçüm sayısı (en iyisi alınır)")
+    parser.add_argument("--dir", default="", help="/dev/null yerine bu klasörde bir dosyaya yaz")
+    parser.add_argument("--output", help="sonucu bu JSON dosyasına da yaz")
+    args = parser.parse_args(argv)
+
+    blocks_kb = args.block_kb or list(DEFAULT_BLOCKS_KB)
+    results = run(int(args.size_mb * MB), blocks_kb, max(1, args.repeat), args.dir)
+    print()
+    report.print_table(results)
+    if args.output:
+        report.save(args.output, {"meta": report.metadata(size_mb=args.size_mb, blocks_kb=blocks_kb), "results": results})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Hat üstü sıkıştırma ölçümleri.
+
+Sıkıştırmanın işe yarayıp yaramadığı iki şeye bağlıdır: verinin ne kadar
+sıkıştığı ve bu makinenin saniyede kaç MB sıkıştırıp açabildiği. Bu betik
+ikisini de tipik yüklerle ölçer ve farklı hat hızlarında beklenen etkin
+hızı hesaplar:
+
+    log      tekrar eden uygulama günlüğü satırları
+    csv      sayısal/metin karışık tablo
+    json     iç içe JSON dökümü
+    random   sıkışmayan veri (zaten sıkıştırılmış arşiv, medya)
+
+İki kip ölçülür:
+
+    ftp_mode_z   FTPConnector'ın MODE Z akışı (tek deflate akışı)
+    ssh_zlib     SSH transport sıkıştırması (paket başına Z_FULL_FLUSH)
+
+Aktarım sıkıştırma, hat ve açma aşamalarından oluşan bir boru hattıdır;
+etkin hız = min(sıkıştırma, açma, hat × oran). `speedup` > 1 ise sıkıştırma
+o hatta kazandırıyor; `break_even_mbit` bu makinede sıkıştırmanın artık
+darboğaz olduğu hat hızıdır.
+
+Kullanım (proje kökünden):
+
+    python -m benchmarks.compression
+    python -m benchmarks.compression --size-mb 64 --link 5 --link 20 --output sonuc.json
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+import zlib
+
+from connectors.buffers import DEFAULT_BLOCK_SIZE
+
+from . import report
+
+
+MB = 1024 * 1024
+DEFAULT_LINKS = (2, 10, 50, 100, 1000)
+# paramiko en fazla 32 KB'lık paketler gönderir
+SSH_PACKET = 32768
+# FTPConnector._store bloğu (io_block_kb varsayılanı)
+BLOCK = DEFAULT_BLOCK_SIZE
+
+
+def payload_log(size: int) -> bytes:
+    rng = random.Random(1)
+    levels = ("INFO", "INFO", "INFO", "DEBUG", "WARNING", "ERROR")
+    paths = ("/api/v1/orders", "/api/v1/users", "/healthz", "/static/app.js", "/api/v1/reports/daily")
+    lines, total, t = [], 0, 1715953500
+    while total < size:
+        t += rng.randint(0, 3)
+        line = (
+            f"2024-05-17T{(t // 3600) % 24:02d}:{(t // 60) % 60:02d}:{t % 60:02d}Z {rng.choice(levels):<7} "
+            f"web-{rng.randint(1, 8)} request_id={rng.getrandbits(64):016x} method=GET "
+            f"path={rng.choice(paths)} status={rng.choice((200, 200, 200, 304, 404, 500))} "
+            f"duration_ms={rng.randint(1, 900)}\n"
+        )
+        lines.append(line)
+        total += len(line)
+    return "".join(lines).encode()[:size]
+
+
+def payload_csv(size: int) -> bytes:
+    rng = random.Random(2)
+    rows, total = ["id,date,customer,country,amount,currency,status\n"], 0
+    countries = ("TR", "DE", "US", "GB", "NL", "FR")
+    i = 0
+    while total < size:
+        i += 1
+        row = (
+            f"{i},2024-05-{rng.randint(1, 31):02d},customer_{rng.randint(1, 5000):05d},"
+            f"{rng.choice(countries)},{rng.uniform(1, 5000):.2f},EUR,{rng.choice(('paid', 'open', 'refunded'))}\n"
+        )
+        rows.append(row)
+        total += len(row)
+    return "".join(rows).encode()[:size]
+
+
+def payload_json(size: int) -> bytes:
+    rng = random.Random(3)
+    chunks, total, i = [], 0, 0
+    while total < size:
+        i += 1
+        record = {
+            "id": i,
+            "user": {"name": f"user{rng.randint(1, 10000)}", "active": rng.random() > 0.2, "roles": ["reader"]},
+            "items": [{"sku": f"SKU-{rng.randint(1, 999):03d}", "qty": rng.randint(1, 5)} for _ in range(3)],
+            "total": round(rng.uniform(5, 900), 2),
+        }
+        chunk = json.dumps(record, indent=2) + ",\n"
+        chunks.append(chunk)
+        total += len(chunk)
+    return "".join(chunks).encode()[:size]
+
+
+def payload_random(size: int) -> bytes:
+    return random.Random(4).randbytes(size)
+
+
+PAYLOADS = {"log": payload_log, "csv": payload_csv, "json": payload_json, "random": payload_random}
+
+
+def deflate_stream(data: bytes) -> bytes:
+    """What FTPConnector._store sends in MODE Z."""
+    deflate = zlib.compressobj()
+    view = memoryview(data)
+    out = [deflate.compress(view[i:i + BLOCK]) for i in range(0, len(view), BLOCK)]
+    out.append(deflate.flush())
+    return b"".join(out)
+
+
+def deflate_ssh(data: bytes) -> bytes:
+    """paramiko's ZlibCompressor: every packet is flushed with Z_FULL_FLUSH."""
+    deflate = zlib.compressobj()
+    view = memoryview(data)
+    return b"".join(
+        deflate.compress(view[i:i + SSH_PACKET]) + deflate.flush(zlib.Z_FULL_FLUSH)
+        for i in range(0, len(view), SSH_PACKET)
+    )
+
+
+def inflate(compressed: bytes) -> bytes:
+    inflater = zlib.decompressobj()
+    view = memoryview(compressed)
+    out = [inflater.decompress(view[i:i + BLOCK]) for i in range(0, len(view), BLOCK)]
+    out.append(inflater.flush())
+    return b"".join(out)
+
+
+MODES = {"ftp_mode_z": deflate_stream, "ssh_zlib": deflate_ssh}
+
+
+def _best(func, arg, repeat: int):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def measure(data: bytes, deflate, links: list[float], repeat: int) -> dict:
+    mb = len(data) / MB
+    deflate_s, compressed = _best(deflate, data, repeat)
+    inflate_s, restored = _best(inflate, compressed, repeat)
+    if restored != data:
+        raise RuntimeError("açılan veri aslıyla aynı değil")
+
+    ratio = len(data) / max(1, len(compressed))
+    deflate_mb_s, inflate_mb_s = mb / deflate_s, mb / inflate_s
+    cpu_mb_s = min(deflate_mb_s, inflate_mb_s)
+    result = {
+        "ratio": ratio,
+        "deflate_mb_s": deflate_mb_s,
+        "inflate_mb_s": inflate_mb_s,
+        # Hat bundan hızlıysa sıkıştırma darboğaz olur
+        "break_even_mbit": cpu_mb_s * 8 if ratio > 1 else 0.0,
+    }
+    for link in links:
+        link_mb_s = link / 8
+        result[f"link_{link:g}mbit_speedup"] = min(cpu_mb_s, link_mb_s * ratio) / link_mb_s
+    return result
+
+
+def run(payloads: list[str], size: int, links: list[float], repeat: int) -> dict:
+    results = {}
+    for name in payloads:
+        data = PAYLOADS[name](size)
+        for mode, deflate in MODES.items():
+            print(f"{name}/{mode} ...", end=" ", flush=True)
+            results[f"{name}.{mode}"] = measure(data, deflate, links, repeat)
+            print(f"oran {results[f'{name}.{mode}']['ratio']:.1f}:1")
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="DuckTransfer hat üstü sıkıştırma ölçümleri")
+    parser.add_argument("-p", "--payload", action="append", choices=list(PAYLOADS), help="sadece bu yük (tekrarlanabilir)")
+    parser.add_argument("--size-mb", type=float, default=32, help="yük başına veri boyutu")
+    parser.add_argument("--link", type=float, action="append", help=f"hat hızı, Mbit/s (varsayılan: {DEFAULT_LINKS})")
+    parser.add_argument("--repeat", type=int, default=3, help="ölçüm sayısı (en iyisi alınır)")
+    parser.add_argument("--output", help="sonucu bu JSON dosyasına da yaz")
+    args = parser.parse_args(argv)
+
+    links = args.link or list(DEFAULT_LINKS)
+    results = run(args.payload or list(PAYLOADS), int(args.size_mb * MB), links, max(1, args.repeat))
+    print()
+    report.print_table(results)
+
+    print()
+    for name, result in results.items():
+        if result["ratio"] <= 1.05:
+            print(f"  {name}: sıkışmıyor, kapalı kalmalı")
+        else:
+            print(f"  {name}: {result['break_even_mbit']:.0f} Mbit/s altındaki hatlarda kazandırır")
+    if args.output:
+        report.save(args.output, {"meta": report.metadata(size_mb=args.size_mb, links=links), "results": results})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+DuckTransfer uçtan uca transfer ölçümleri.
+
+FTP, FTPS, SFTP ve S3 için localhost'ta sahte sunucular açar, gerçek
+bağlayıcıları (FTPConnector, SFTPConnector, S3Connector) dört senaryodan
+geçirir ve sonucu benchmarks/baseline.json ile karşılaştırır:
+
+    huge_file    tek büyük dosya yükle / indir           → MB/s
+    tiny_files   10.000 adet 1 KB dosya yükle / indir    → dosya/s, p50/p99
+    deep_tree    derin klasör ağacı yükle / gez / indir  → dosya/s, listeleme p50/p99
+    big_listing  100.000 girdili tek klasörü listele     → girdi/s, ilk parti süresi
+
+Kullanım (proje kökünden):
+
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.e2e                      # hepsi, tam boy
+    python -m benchmarks.e2e --quick -p sftp      # küçük ölçekte tek protokol
+    python -m benchmarks.e2e --save-baseline      # sonucu yeni taban olarak kaydet
+
+Tabana göre --threshold'dan (varsayılan %25) fazla kötüleşen ölçüm varsa
+çıkış kodu 1 olur. Taban sadece aynı --scale ile alınmışsa karşılaştırılır.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from connectors import FTPConnector, S3Connector, SFTPConnector
+from connectors.base import BaseConnector
+from transfer import join_remote, walk_local, walk_remote
+from . import report
+from .servers import BUCKET, PASSWORD, USERNAME, FTPStandIn, S3StandIn, SFTPStandIn
+
+
+MB = 1024 * 1024
+PROTOCOLS = ("ftp", "ftps", "sftp", "s3")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+QUICK_SCALE = 0.05
+
+
+class Target:
+    """One protocol under test: its stand-in server and a connected connector."""
+
+    def __init__(self, protocol: str, workdir: str):
+        self.protocol = protocol
+        self.workdir = workdir
+        self.server_root = os.path.join(workdir, "server")
+        os.makedirs(self.server_root)
+        state_dir = os.path.join(workdir, "state")
+
+        if protocol in ("ftp", "ftps"):
+            self.server = FTPStandIn(self.server_root, tls=protocol == "ftps", cert_dir=workdir)
+            self.connector: BaseConnector = FTPConnector()
+            self.connector.connect(
+                host="127.0.0.1", port=self.server.port, username=USERNAME, password=PASSWORD,
+                use_ssl=protocol == "ftps", resume_dir=state_dir,
+            )
+            self.remote_root = "/bench"
+        elif protocol == "sftp":
+            self.server = SFTPStandIn(self.server_root)
+            self.connector = SFTPConnector()
+            self.connector.connect(
+                host="127.0.0.1", port=self.server.port, username=USERNAME, password=PASSWORD,
+                resume_dir=state_dir,
+            )
+            self.remote_root = "/bench"
+        else:
+            self.server = S3StandIn()
+            self.s3 = self.server.client()
+            self.s3.create_bucket(Bucket=BUCKET)
+            self.connector = S3Connector()
+            self.connector.connect(
+                access_key=USERNAME, secret_key=PASSWORD, bucket=BUCKET,
+                endpoint_url=self.server.endpoint_url, state_dir=state_dir, resume_dir=state_dir,
+            )
+            self.remote_root = "bench"
+        self.mkdir(self.remote_root)
+
+    def remote(self, *parts: str) -> str:
+        path = self.remote_root
+        for part in parts:
+            path = join_remote(path, part)
+        return path
+
+    def mkdir(self, path: str) -> None:
+        if self.connector.needs_directories:
+            self.connector.create_directory(path)
+
+    def local(self, *parts: str) -> str:
+        path = os.path.join(self.workdir, "local", *parts)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def seed(self, remote_dir: str, names: list[str], data: bytes = b"") -> None:
+        """Create files on the server side directly, without going through the connector."""
+        if self.protocol == "s3":
+            prefix = remote_dir.strip("/") + "/"
+            with ThreadPoolExecutor(32) as pool:
+                list(pool.map(lambda n: self.s3.put_object(Bucket=BUCKET, Key=prefix + n, Body=data), names))
+            return
+        directory = os.path.join(self.server_root, remote_dir.lstrip("/"))
+        os.makedirs(directory, exist_ok=True)
+        for name in names:
+            with open(os.path.join(directory, name), "wb") as f:
+                f.write(data)
+
+    def close(self) -> None:
+        try:
+            self.connector.disconnect()
+        finally:
+            self.server.stop()
+
+
+def _write(path: str, size: int) -> None:
+    # Rastgele veri: ileride sıkıştırma açılırsa sonuç şişmesin
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining > 0:
+            chunk = min(remaining, 4 * MB)
+            f.write(os.urandom(chunk))
+            remaining -= chunk
+
+
+def _timed(func: Callable, *args) -> float:
+    start = time.perf_counter()
+    if func(*args) is False:
+        raise RuntimeError(f"{func.__name__}{args} başarısız")
+    return time.perf_counter() - start
+
+
+def huge_file(t: Target, scale: float) -> dict:
+    size = max(MB, int(256 * MB * scale))
+    src = os.path.join(t.local("huge"), "huge.bin")
+    dst = os.path.join(t.local("huge"), "huge.down")
+    _write(src, size)
+    t.mkdir(t.remote("huge"))
+    remote = t.remote("huge", "huge.bin")
+
+    up = _timed(t.connector.upload_file, src, remote)
+    down = _timed(t.connector.download_file, remote, dst)
+    if os.path.getsize(dst) != size:
+        raise RuntimeError("indirilen dosyanın boyutu tutmuyor")
+    return {"upload_mb_s": size / MB / up, "download_mb_s": size / MB / down}
+
+
+def tiny_files(t: Target, scale: float) -> dict:
+    count = max(50, int(10_000 * scale))
+    src_dir, dst_dir = t.local("tiny", "src"), t.local("tiny", "dst")
+    payload = os.urandom(1024)
+    names = [f"f{i:05d}.bin" for i in range(count)]
+    for name in names:
+        with open(os.path.join(src_dir, name), "wb") as f:
+            f.write(payload)
+    t.mkdir(t.remote("tiny"))
+
+    up = [_timed(t.connector.upload_file, os.path.join(src_dir, n), t.remote("tiny", n)) for n in names]
+    down = [_timed(t.connector.download_file, t.remote("tiny", n), os.path.join(dst_dir, n)) for n in names]
+    return {
+        "upload_files_s": count / sum(up),
+        "download_files_s": count / sum(down),
+        **report.latency_summary("upload", up),
+        **report.latency_summary("download", down),
+    }
+
+
+def deep_tree(t: Target, scale: float) -> dict:
+    depth = max(4, int(64 * scale))
+    files_per_level = 8
+    src_root, dst_root = t.local("deep", "src"), t.local("deep", "dst")
+    payload = os.urandom(4096)
+    level = src_root
+    for d in range(depth):
+        for i in range(files_per_level):
+            with open(os.path.join(level, f"f{i}.bin"), "wb") as f:
+                f.write(payload)
+        level = os.path.join(level, f"d{d:03d}")
+        os.makedirs(level)
+    remote_root = t.remote("deep")
+    t.mkdir(remote_root)
+
+    # Yükleme: uygulamanın klasör yüklemesiyle aynı sıra (walk_local → mkdir → upload)
+    start = time.perf_counter()
+    files = 0
+    for rel, entry in walk_local(src_root):
+        remote = join_remote(remote_root, rel)
+        if entry.is_directory:
+            t.mkdir(remote)
+        else:
+            t.connector.upload_file(entry.path, remote)
+            files += 1
+    upload = time.perf_counter() - start
+
+    # Gezinme: her klasör listesinin süresi ayrı ayrı
+    listings = []
+    stack = [remote_root]
+    while stack:
+        path = stack.pop()
+        start = time.perf_counter()
+        entries = t.connector.list_directory(path)
+        listings.append(time.perf_counter() - start)
+        stack.extend(e.path for e in entries if e.is_directory)
+
+    start = time.perf_counter()
+    for rel, entry in walk_remote(t.connector, remote_root):
+        local = os.path.join(dst_root, *rel.split("/"))
+        if entry.is_directory:
+            os.makedirs(local, exist_ok=True)
+        else:
+            t.connector.download_file(entry.path, local)
+    download = time.perf_counter() - start
+    return {
+        "upload_files_s": files / upload,
+        "download_files_s": files / download,
+        **report.latency_summary("list", listings),
+    }
+
+
+def big_listing(t: Target, scale: float) -> dict:
+    count = max(1000, int(100_000 * scale))
+    remote = t.remote("listing")
+    t.seed(remote, [f"entry{i:06d}.dat" for i in range(count)])
+
+    full, first = [], []
+    for _ in range(3):
+        start = time.perf_counter()
+        entries = t.connector.list_directory(remote)
+        full.append(time.perf_counter() - start)
+        if len(entries) != count:
+            raise RuntimeError(f"{count} girdi bekleniyordu, {len(entries)} geldi")
+
+        start = time.perf_counter()
+        batches = t.connector.iter_directory(remote)
+        next(batches)
+        first.append(time.perf_counter() - start)
+        batches.close()
+    seconds = report.median(full)
+    return {
+        "list_seconds": seconds,
+        "entries_s": count / seconds,
+        "first_batch_ms": report.median(first) * 1000,
+    }
+
+
+SCENARIOS = {
+    "huge_file": huge_file,
+    "tiny_files": tiny_files,
+    "deep_tree": deep_tree,
+    "big_listing": big_listing,
+}
+
+
+def run(protocols: list[str], scenarios: list[str], scale: float) -> dict:
+    results = {}
+    for protocol in protocols:
+        workdir = tempfile.mkdtemp(prefix=f"ducktransfer-bench-{protocol}-")
+        try:
+            try:
+                target = Target(protocol, workdir)
+            except ImportError as e:
+                print(f"{protocol}: atlandı, sahte sunucu için paket eksik ({e.name})")
+                continue
+            try:
+                for name in scenarios:
+                    print(f"{protocol}/{name} ...", end=" ", flush=True)
+                    start = time.perf_counter()
+                    results.setdefault(protocol, {})[name] = SCENARIOS[name](target, scale)
+                    print(f"{time.perf_counter() - start:.1f} s")
+            finally:
+                target.close()
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="DuckTransfer uçtan uca transfer ölçümleri")
+    parser.add_argument("-p", "--protocol", action="append", choices=PROTOCOLS, help="sadece bu protokol (tekrarlanabilir)")
+    parser.add_argument("-s", "--scenario", action="append", choices=list(SCENARIOS), help="sadece bu senaryo (tekrarlanabilir)")
+    parser.add_argument("--scale", type=float, default=1.0, help="dosya boyutu ve sayılarının çarpanı")
+    parser.add_argument("--quick", action="store_true", help=f"--scale {QUICK_SCALE} kısayolu")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="karşılaştırılacak taban JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="sonucu taban olarak kaydet")
+    parser.add_argument("--threshold", type=float, default=0.25, help="gerileme sayılacak kötüleşme oranı")
+    parser.add_argument("--output", help="sonucu bu JSON dosyasına da yaz")
+    args = parser.parse_args(argv)
+
+    scale = QUICK_SCALE if args.quick else args.scale
+    results = run(args.protocol or list(PROTOCOLS), args.scenario or list(SCENARIOS), scale)
+    data = {"meta": report.metadata(scale=scale), "results": results}
+
+    baseline = report.load(args.baseline)
+    if baseline and baseline["meta"].get("scale") != scale:
+        print(f"\nTaban --scale {baseline['meta'].get('scale')} ile alınmış, karşılaştırılmıyor.")
+        baseline = None
+
+    print()
+    report.print_table(results, baseline["results"] if baseline else None)
+    if args.output:
+        report.save(args.output, data)
+    if args.save_baseline:
+        report.save(args.baseline, data)
+        print(f"\nTaban kaydedildi: {args.baseline}")
+        return 0
+    if not baseline:
+        return 0
+    regressions = report.compare(results, baseline["results"], args.threshold)
+    report.print_regressions(regressions, args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+DuckTransfer listeleme yolu mikro ölçümleri.
+
+Ağ olmadan, sentetik veriyle listeleme zincirinin saf Python aşamalarını tek
+tek ölçer. Her aşama için süre, girdi/s ve en yüksek bellek kullanımı
+raporlanır; sonuç benchmarks/micro_baseline.json ile karşılaştırılır:
+
+    mlsd_entry    FTP MLSD satırı → RemoteFile (FTPConnector._mlsd_entry)
+    parse_mlsd    eski MLSD ayrıştırıcısı (FTPConnector._parse_mlsd)
+    sftp_entry    SFTPAttributes → RemoteFile (SFTPConnector._entry)
+    s3_page       list_objects_v2 sayfaları → RemoteFile (LastModified.strftime dahil)
+    remote_file   sadece RemoteFile oluşturma
+    sort_listing  klasörler önce, isme göre sıralama
+    format_size   boyut metni
+    row_values    panel satırı (FilePanel._row_values)
+
+Kullanım (proje kökünden):
+
+    python -m benchmarks.micro                    # 1.000.000 girdi, hepsi
+    python -m benchmarks.micro -n 100000 -s sort_listing
+    python -m benchmarks.micro --save-baseline
+
+Süre, --repeat çalıştırmanın en iyisidir ve tracemalloc kapalıyken ölçülür;
+bellek ayrı bir çalıştırmada tracemalloc ile ölçülür. Bağımlılığı kurulu
+olmayan aşamalar atlanır.
+"""
+
+import argparse
+import datetime
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+from . import report
+
+
+MB = 1024 * 1024
+DEFAULT_ENTRIES = 1_000_000
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "micro_baseline.json")
+DIR_RATIO = 0.05
+
+
+def _names(n: int) -> list[str]:
+    # Sabit tohum: her çalıştırmada aynı karışık sıra, sıralama gerçekten iş yapsın
+    rng = random.Random(n)
+    names = [f"{'Report' if i % 3 else 'data'}_{i:07d}.{('csv', 'log', 'json')[i % 3]}" for i in range(n)]
+    rng.shuffle(names)
+    return names
+
+
+def _sizes(n: int) -> list[int]:
+    rng = random.Random(n + 1)
+    return [int(rng.lognormvariate(10, 3)) for _ in range(n)]
+
+
+def _is_dir(i: int) -> bool:
+    return i % int(1 / DIR_RATIO) == 0
+
+
+def _remote_files(n: int) -> list:
+    from connectors.base import RemoteFile
+
+    names, sizes = _names(n), _sizes(n)
+    return [
+        RemoteFile(
+            name=name,
+            path="/data/" + name,
+            size=0 if _is_dir(i) else sizes[i],
+            is_directory=_is_dir(i),
+            modified="2024-05-17 13:45",
+            mtime=1715953500.0,
+        )
+        for i, name in enumerate(names)
+    ]
+
+
+# Her aşama (n) veriyi hazırlayıp ölçülecek fonksiyonu döndürür; hazırlık ölçülmez
+
+def stage_mlsd_entry(n: int):
+    from connectors.ftp_connector import FTPConnector
+
+    connector = FTPConnector()
+    names, sizes = _names(n), _sizes(n)
+    lines = [
+        f"type={'dir' if _is_dir(i) else 'file'};size={sizes[i]};modify=20240517134500;perm=adfrw; {name}"
+        for i, name in enumerate(names)
+    ]
+
+    def run():
+        entry = connector._mlsd_entry
+        return [entry("/data", line) for line in lines]
+
+    return run
+
+
+def stage_parse_mlsd(n: int):
+    from connectors.ftp_connector import FTPConnector
+
+    connector = FTPConnector()
+    names, sizes = _names(n), _sizes(n)
+    lines = [
+        f"type={'dir' if _is_dir(i) else 'file'};size={sizes[i]};modify=20240517134500;perm=adfrw; {name}"
+        for i, name in enumerate(names)
+    ]
+
+    def run():
+        parse = connector._parse_mlsd
+        return [parse(line) for line in lines]
+
+    return run
+
+
+def stage_sftp_entry(n: int):
+    from paramiko import SFTPAttributes
+    from connectors.sftp_connector import SFTPConnector
+
+    connector = SFTPConnector()
+    names, sizes = _names(n), _sizes(n)
+    attrs = []
+    for i, name in enumerate(names):
+        attr = SFTPAttributes()
+        attr.filename = name
+        attr.st_mode = 0o040755 if _is_dir(i) else 0o100644
+        attr.st_size = sizes[i]
+        attr.st_mtime = 1715953500 + i
+        attrs.append(attr)
+
+    def run():
+        entry = connector._entry
+        return [entry("/data", attr) for attr in attrs]
+
+    return run
+
+
+class _FakePaginator:
+    """Stands in for boto3's list_objects_v2 paginator with prebuilt pages."""
+
+    def __init__(self, pages: list[dict]):
+        self._pages = pages
+
+    def paginate(self, **kwargs):
+        return iter(self._pages)
+
+
+class _FakeS3:
+    def __init__(self, pages: list[dict]):
+        self._pages = pages
+
+    def get_paginator(self, name: str):
+        return _FakePaginator(self._pages)
+
+
+def stage_s3_page(n: int):
+    from connectors.s3_connector import S3Connector
+
+    names, sizes = _names(n), _sizes(n)
+    base = datetime.datetime(2024, 5, 17, 13, 45, tzinfo=datetime.timezone.utc)
+    pages = []
+    for start in range(0, n, 1000):
+        page = {"CommonPrefixes": [], "Contents": []}
+        for i in range(start, min(start + 1000, n)):
+            if _is_dir(i):
+                page["CommonPrefixes"].append({"Prefix": f"data/{names[i]}/"})
+            else:
+                page["Contents"].append({
+                    "Key": f"data/{names[i]}",
+                    "Size": sizes[i],
+                    "LastModified": base + datetime.timedelta(seconds=i),
+                    "ETag": f'"{i:032x}"',
+                })
+        pages.append(page)
+
+    connector = S3Connector()
+    connector._s3 = _FakeS3(pages)
+    connector._bucket = "bench"
+
+    def run():
+        files = []
+        for batch in connector.iter_directory("data/"):
+            files.extend(batch)
+        return files
+
+    return run
+
+
+def stage_remote_file(n: int):
+    from connectors.base import RemoteFile
+
+    names, sizes = _names(n), _sizes(n)
+    paths = ["/data/" + name for name in names]
+
+    def run():
+        return [
+            RemoteFile(name=names[i], path=paths[i], size=sizes[i], is_directory=False, modified="2024-05-17 13:45")
+            for i in range(n)
+        ]
+
+    return run
+
+
+def stage_sort_listing(n: int):
+    from connectors.base import sort_listing
+
+    items = _remote_files(n)
+
+    def run():
+        return sort_listing(items)
+
+    return run
+
+
+def stage_format_size(n: int):
+    from ui.panels import format_size
+
+    sizes = _sizes(n)
+
+    def run():
+        return [format_size(size) for size in sizes]
+
+    return run
+
+
+def stage_row_values(n: int):
+    from ui.panels import FilePanel
+
+    items = _remote_files(n)
+    # _row_values self'e dokunmuyor; pencere açmadan çağrılabilir
+    row_values = FilePanel._row_values
+
+    def run():
+        return [row_values(None, f) for f in items]
+
+    return run
+
+
+STAGES: dict[str, Callable] = {
+    "mlsd_entry": stage_mlsd_entry,
+    "parse_mlsd": stage_parse_mlsd,
+    "sftp_entry": stage_sftp_entry,
+    "s3_page": stage_s3_page,
+    "remote_file": stage_remote_file,
+    "sort_listing": stage_sort_listing,
+    "format_size": stage_format_size,
+    "row_values": stage_row_values,
+}
+
+
+def measure(name: str, n: int, repeat: int) -> dict:
+    """Best-of-repeat wall time with tracemalloc off, then one traced run for peak memory."""
+    work = STAGES[name](n)
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = work()
+        best = min(best, time.perf_counter() - start)
+        del result
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = work()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"seconds": best, "entries_s": n / best if best else 0.0, "peak_mb": peak / MB}
+
+
+def run(stages: list[str], n: int, repeat: int) -> dict:
+    results = {}
+    for name in stages:
+        print(f"{name} ...", end=" ", flush=True)
+        try:
+            results[name] = measure(name, n, repeat)
+        except ImportError as e:
+            print(f"atlandı, paket eksik ({e.name})")
+            continue
+        print(f"{results[name]['seconds']:.3f} s")
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="DuckTransfer listeleme yolu mikro ölçümleri")
+    parser.add_argument("-s", "--stage", action="append", choices=list(STAGES), help="sadece bu aşama (tekrarlanabilir)")
+    parser.add_argument("-n", "--entries", type=int, default=DEFAULT_ENTRIES, help="sentetik listedeki girdi sayısı")
+    parser.add_argument("--repeat", type=int, default=3, help="süre için tekrar sayısı (en iyisi alınır)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="karşılaştırılacak taban JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="sonucu taban olarak kaydet")
+    parser.add_argument("--threshold", type=float, default=0.25, help="gerileme sayılacak kötüleşme oranı")
+    parser.add_argument("--output", help="sonucu bu JSON dosyasına da yaz")
+    args = parser.parse_args(argv)
+
+    results = run(args.stage or list(STAGES), args.entries, max(1, args.repeat))
+    data = {"meta": report.metadata(entries=args.entries), "results": results}
+
+    baseline = report.load(args.baseline)
+    if baseline and baseline["meta"].get("entries") != args.entries:
+        print(f"\nTaban {baseline['meta'].get('entries')} girdiyle alınmış, karşılaştırılmıyor.")
+        baseline = None
+
+    print()
+    report.print_table(results, baseline["results"] if baseline else None)
+    if args.output:
+        report.save(args.output, data)
+    if args.save_baseline:
+        report.save(args.baseline, data)
+        print(f"\nTaban kaydedildi: {args.baseline}")
+        return 0
+    if not baseline:
+        return 0
+    regressions = report.compare(results, baseline["results"], args.threshold)
+    report.print_regressions(regressions, args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
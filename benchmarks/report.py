@@ -0,0 +1,114 @@
+"""Result tables and baseline comparison shared by the benchmark scripts."""
+
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Optional
+
+
+# Metrik adının sonu hangi yönün iyi olduğunu belirler
+HIGHER_IS_BETTER = ("_mb_s", "_files_s", "_entries_s", "_ops_s")
+LOWER_IS_BETTER = ("_ms", "_seconds", "_us", "_mb")
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, q in 0..100."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def latency_summary(prefix: str, seconds: list[float]) -> dict:
+    """p50/p99 in milliseconds for a list of per-operation durations."""
+    return {
+        f"{prefix}_p50_ms": percentile(seconds, 50) * 1000,
+        f"{prefix}_p99_ms": percentile(seconds, 99) * 1000,
+    }
+
+
+def median(values: list[float]) -> float:
+    return statistics.median(values) if values else 0.0
+
+
+def metadata(**extra) -> dict:
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": f"{platform.system()} {platform.machine()}",
+        **extra,
+    }
+
+
+def flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        else:
+            flat[name] = value
+    return flat
+
+
+def load(path: str) -> Optional[dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save(path: str, data: dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[tuple[str, float, float, float]]:
+    """
+    (metric, baseline, current, change) for every metric that got worse by
+    more than threshold (0.25 = 25 %). Metrics missing on either side are
+    ignored; so are metrics whose name does not say which direction is better.
+    """
+    regressions = []
+    old, new = flatten(baseline), flatten(results)
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name], new[name]
+        if not before:
+            continue
+        change = (after - before) / before
+        if name.endswith(HIGHER_IS_BETTER):
+            worse = -change
+        elif name.endswith(LOWER_IS_BETTER):
+            worse = change
+        else:
+            continue
+        if worse > threshold:
+            regressions.append((name, before, after, change))
+    return regressions
+
+
+def print_table(results: dict, baseline: Optional[dict] = None) -> None:
+    old = flatten(baseline) if baseline else {}
+    rows = sorted(flatten(results).items())
+    width = max((len(name) for name, _ in rows), default=10)
+    for name, value in rows:
+        line = f"  {name:<{width}}  {value:>12.2f}"
+        if old.get(name):
+            line += f"   (taban {old[name]:.2f}, {(value - old[name]) / old[name]:+.0%})"
+        print(line)
+
+
+def print_regressions(regressions: list, threshold: float) -> None:
+    if not regressions:
+        print(f"\n✓ Tabana göre %{threshold * 100:.0f}'ten fazla kötüleşen ölçüm yok.")
+        return
+    print(f"\n✗ {len(regressions)} ölçüm tabana göre %{threshold * 100:.0f}'ten fazla kötüleşti:")
+    for name, before, after, change in regressions:
+        print(f"  {name}: {before:.2f} → {after:.2f} ({change:+.0%})")
@@ -0,0 +1,263 @@
+"""
+Local stand-in servers for the benchmarks.
+
+FTP/FTPS come from pyftpdlib, SFTP from a minimal paramiko server that maps
+the SFTP namespace onto a local directory, and S3 from moto's threaded
+server. Everything binds to 127.0.0.1 on a free port and runs in daemon
+threads of the benchmark process.
+"""
+
+import datetime
+import logging
+import os
+import socket
+import threading
+from typing import Optional
+
+import paramiko
+from paramiko import SFTPAttributes, SFTPHandle, SFTPServer, SFTPServerInterface
+from paramiko.sftp import SFTP_OK
+
+
+USERNAME = "bench"
+PASSWORD = "bench"
+BUCKET = "bench"
+
+# pyftpdlib, kendisine ait bir handler yoksa her komutu stderr'e loglar
+logging.getLogger("pyftpdlib").addHandler(logging.NullHandler())
+logging.getLogger("pyftpdlib").setLevel(logging.WARNING)
+logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+
+# --- SFTP -------------------------------------------------------------------
+
+class _SSHServer(paramiko.ServerInterface):
+    def check_auth_password(self, username, password):
+        if username == USERNAME and password == PASSWORD:
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+
+class _Handle(SFTPHandle):
+    def stat(self):
+        try:
+            return SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+
+    def chattr(self, attr):
+        return SFTP_OK
+
+
+class _LocalSFTP(SFTPServerInterface):
+    """SFTP namespace backed by a local directory (root is set per server)."""
+
+    root = "/"
+
+    def _local(self, path: str) -> str:
+        return os.path.join(self.root, self.canonicalize(path).lstrip("/"))
+
+    def canonicalize(self, path):
+        return os.path.normpath("/" + (path or "/")).replace("//", "/")
+
+    def list_folder(self, path):
+        local = self._local(path)
+        try:
+            out = []
+            with os.scandir(local) as it:
+                for entry in it:
+                    attr = SFTPAttributes.from_stat(entry.stat())
+                    attr.filename = entry.name
+                    out.append(attr)
+            return out
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+
+    def stat(self, path):
+        try:
+            return SFTPAttributes.from_stat(os.stat(self._local(path)))
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+
+    lstat = stat
+
+    def open(self, path, flags, attr):
+        local = self._local(path)
+        try:
+            fd = os.open(local, flags | getattr(os, "O_BINARY", 0), 0o644)
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+        if flags & os.O_WRONLY:
+            mode = "ab" if flags & os.O_APPEND else "wb"
+        elif flags & os.O_RDWR:
+            mode = "a+b" if flags & os.O_APPEND else "r+b"
+        else:
+            mode = "rb"
+        f = os.fdopen(fd, mode)
+        handle = _Handle(flags)
+        handle.filename = local
+        handle.readfile = f
+        handle.writefile = f
+        return handle
+
+    def remove(self, path):
+        try:
+            os.remove(self._local(path))
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+        return SFTP_OK
+
+    def rename(self, oldpath, newpath):
+        try:
+            os.replace(self._local(oldpath), self._local(newpath))
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+        return SFTP_OK
+
+    posix_rename = rename
+
+    def mkdir(self, path, attr):
+        try:
+            os.mkdir(self._local(path))
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+        return SFTP_OK
+
+    def rmdir(self, path):
+        try:
+            os.rmdir(self._local(path))
+        except OSError as e:
+            return SFTPServer.convert_errno(e.errno)
+        return SFTP_OK
+
+    def chattr(self, path, attr):
+        return SFTP_OK
+
+
+class SFTPStandIn:
+    def __init__(self, root: str):
+        self.root = root
+        self._key = paramiko.RSAKey.generate(2048)
+        self._sock = socket.socket()
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(64)
+        self.port = self._sock.getsockname()[1]
+        self._transports: list[paramiko.Transport] = []
+        # Her sunucu kendi kökünü kullansın diye alt sınıf
+        self._handler = type("SFTPHandler", (_LocalSFTP,), {"root": root})
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            # Gerçek sshd gibi; yoksa her eşzamanlı istek gecikmeli ACK'e (~40 ms) takılır
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            transport = paramiko.Transport(conn)
+            transport.add_server_key(self._key)
+            transport.set_subsystem_handler("sftp", SFTPServer, self._handler)
+            transport.start_server(server=_SSHServer())
+            self._transports.append(transport)
+
+    def stop(self):
+        self._sock.close()
+        for transport in self._transports:
+            transport.close()
+
+
+# --- FTP / FTPS -------------------------------------------------------------
+
+def _self_signed_cert(directory: str) -> str:
+    """PEM file with a throwaway key and certificate for 127.0.0.1."""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.x509.oid import NameOID
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    path = os.path.join(directory, "bench-cert.pem")
+    with open(path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.TraditionalOpenSSL,
+            serialization.NoEncryption(),
+        ))
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    return path
+
+
+class FTPStandIn:
+    def __init__(self, root: str, tls: bool = False, cert_dir: Optional[str] = None):
+        from pyftpdlib.authorizers import DummyAuthorizer
+        from pyftpdlib.handlers import FTPHandler
+        from pyftpdlib.servers import ThreadedFTPServer
+
+        self.root = root
+        authorizer = DummyAuthorizer()
+        authorizer.add_user(USERNAME, PASSWORD, root, perm="elradfmwMT")
+        if tls:
+            from pyftpdlib.handlers import TLS_FTPHandler
+            handler = type("BenchTLSHandler", (TLS_FTPHandler,), {})
+            handler.certfile = _self_signed_cert(cert_dir or root)
+            handler.tls_control_required = True
+            handler.tls_data_required = True
+        else:
+            handler = type("BenchHandler", (FTPHandler,), {})
+        handler.authorizer = authorizer
+        handler.banner = "bench"
+        self._server = ThreadedFTPServer(("127.0.0.1", 0), handler)
+        self._server.max_cons = 512
+        self.port = self._server.address[1]
+        threading.Thread(target=self._server.serve_forever, kwargs={"handle_exit": False}, daemon=True).start()
+
+    def stop(self):
+        self._server.close_all()
+
+
+# --- S3 ---------------------------------------------------------------------
+
+class S3StandIn:
+    def __init__(self):
+        from moto.server import ThreadedMotoServer
+
+        self._server = ThreadedMotoServer(ip_address="127.0.0.1", port=0, verbose=False)
+        self._server.start()
+        host, port = self._server.get_host_and_port()
+        self.endpoint_url = f"http://{host}:{port}"
+
+    def client(self):
+        import boto3
+
+        return boto3.client(
+            "s3",
+            endpoint_url=self.endpoint_url,
+            aws_access_key_id=USERNAME,
+            aws_secret_access_key=PASSWORD,
+            region_name="us-east-1",
+        )
+
+    def stop(self):
+        self._server.stop()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Başlangıç içe aktarma bütçesi kontrolü.
+
+Her hedef taze bir yorumlayıcıda `python -X importtime` ile içe aktarılır;
+hangi modüllerin yüklendiği ve toplam süre ölçülür. Bir hedef yasaklı bir
+modülü yüklerse ya da süre bütçesini aşarsa çıkış kodu 1 olur:
+
+    core      connectors, transfer, config   boto3/botocore/paramiko/cryptography/tkinter yok
+    ftp       connectors.FTPConnector         aynı, FTP için başka arka uç yüklenmez
+    cli       cli (ducktransfer)              tkinter/ttkbootstrap ve arka uçlar yok
+
+Kullanım (proje kökünden):
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget-ms 80 --repeat 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+from . import report
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BACKENDS = ("boto3", "botocore", "s3transfer", "paramiko", "cryptography", "nacl", "bcrypt")
+TK = ("tkinter", "_tkinter", "ttkbootstrap", "PIL")
+
+TARGETS = {
+    "core": ("import connectors, transfer, config.connections", BACKENDS + TK),
+    "ftp": ("from connectors import FTPConnector", BACKENDS + TK),
+    "cli": ("import cli", BACKENDS + TK),
+}
+
+
+def import_profile(statement: str) -> tuple[float, set[str]]:
+    """(total cumulative import time in ms, top-level package names loaded) for one fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else statement)
+
+    total_us, loaded = 0, set()
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, raw = line[len("import time:"):].split("|")
+        name = raw.strip()
+        loaded.add(name.split(".")[0])
+        # İç içe importlar iki boşlukla girintilenir; sadece en üst düzeyi topla
+        if not raw[1:].startswith(" "):
+            total_us += int(cumulative)
+    return total_us / 1000, loaded
+
+
+def check(budget_ms: float, repeat: int) -> tuple[dict, list[str]]:
+    results, problems = {}, []
+    for target, (statement, forbidden) in TARGETS.items():
+        timings, loaded = [], set()
+        for _ in range(repeat):
+            ms, loaded = import_profile(statement)
+            timings.append(ms)
+        ms = min(timings)
+        results[target] = {"import_ms": ms}
+        bad = sorted(loaded & set(forbidden))
+        if bad:
+            problems.append(f"{target}: yasaklı modül yüklendi: {', '.join(bad)}")
+        if ms > budget_ms:
+            problems.append(f"{target}: {ms:.1f} ms > bütçe {budget_ms:.0f} ms")
+    return results, problems
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="DuckTransfer başlangıç içe aktarma bütçesi")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="hedef başına izin verilen süre")
+    parser.add_argument("--repeat", type=int, default=3, help="ölçüm sayısı (en iyisi alınır)")
+    args = parser.parse_args(argv)
+
+    results, problems = check(args.budget_ms, max(1, args.repeat))
+    report.print_table(results)
+    if problems:
+        print(f"\n✗ {len(problems)} sorun:")
+        for problem in problems:
+            print(f"  {problem}")
+        return 1
+    print("\n✓ Bütçe içinde, ağır arka uçlar yüklenmiyor.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,8 @@ from pathlib import Path
 
 PROJECT_NAME = "DuckTransfer"
 ENTRY_POINT = "main.py"
+CLI_NAME = "ducktransfer"
+CLI_ENTRY_POINT = "cli.py"
 SCRIPT_DIR = Path(__file__).parent.resolve()
 ASSETS_DIR = SCRIPT_DIR / "assets"
 
@@ -87,15 +89,33 @@ def build():
         "--hidden-import", "boto3",
         "--hidden-import", "paramiko",
         "--hidden-import", "connectors",
+        "--hidden-import", "connectors.pool",
+        "--hidden-import", "connectors.segments",
         "--hidden-import", "connectors.ftp_connector",
         "--hidden-import", "connectors.sftp_connector",
         "--hidden-import", "connectors.s3_connector",
+        "--hidden-import", "connectors.state_store",
+        "--hidden-import", "connectors.multipart_state",
+        "--hidden-import", "connectors.resume",
+        "--hidden-import", "connectors.listing_cache",
+        "--hidden-import", "connectors.metrics",
+        "--hidden-import", "connectors.checksum",
+        "--hidden-import", "connectors.buffers",
+        "--hidden-import", "connectors.tree_delete",
+        "--hidden-import", "connectors.factory",
         "--hidden-import", "config",
         "--hidden-import", "config.connections",
         "--hidden-import", "ui",
         "--hidden-import", "ui.panels",
         "--hidden-import", "ui.connection_dialog",
-        "--hidden-import", "ui.progress_dialog",
+        "--hidden-import", "ui.queue_panel",
+        "--hidden-import", "ui.sync_dialog",
+        "--hidden-import", "transfer",
+        "--hidden-import", "transfer.transfer_queue",
+        "--hidden-import", "transfer.walker",
+        "--hidden-import", "transfer.sync",
+        "--hidden-import", "transfer.progress",
+        "--hidden-import", "transfer.autotune",
         "--collect-all", "ttkbootstrap",
         ENTRY_POINT,
     ])
@@ -123,5 +143,51 @@ def build():
         print("\nÇalıştırmak için: ./dist/DuckTransfer")
 
 
+def build_cli():
+    """Arayüzsüz `ducktransfer` komutu: konsol uygulaması, Tk pakete girmez."""
+    system, machine = get_platform_info()
+    print(f"Platform: {system} ({machine})")
+    print(f"Komut: {CLI_NAME}")
+    print("-" * 40)
+
+    os.chdir(SCRIPT_DIR)
+    ensure_pyinstaller()
+
+    args = [
+        sys.executable, "-m", "PyInstaller",
+        "--name", CLI_NAME,
+        "--noconfirm",
+        "--noupx",
+        "--onefile",
+        "--console",
+        "--exclude-module", "tkinter",
+        "--exclude-module", "ttkbootstrap",
+        "--exclude-module", "ui",
+        "--hidden-import", "boto3",
+        "--hidden-import", "paramiko",
+        "--hidden-import", "connectors",
+        "--hidden-import", "connectors.factory",
+        # Bağlayıcılar importlib ile yükleniyor; PyInstaller onları kendisi göremez
+        "--hidden-import", "connectors.ftp_connector",
+        "--hidden-import", "connectors.sftp_connector",
+        "--hidden-import", "connectors.s3_connector",
+        "--hidden-import", "config.connections",
+        "--hidden-import", "transfer",
+        CLI_ENTRY_POINT,
+    ]
+
+    print("Derleme başlıyor...")
+    result = subprocess.run(args)
+    if result.returncode != 0:
+        print("Derleme başarısız!")
+        sys.exit(1)
+
+    exe = f"{CLI_NAME}.exe" if system == "win32" else CLI_NAME
+    print(f"\n✓ Derleme tamamlandı: {SCRIPT_DIR / 'dist' / exe}")
+
+
 if __name__ == "__main__":
-    build()
+    if "--cli" in sys.argv[1:]:
+        build_cli()
+    else:
+        build()
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+DuckTransfer komut satırı arayüzü.
+
+Arayüzü açmadan kayıtlı bağlantılarla (connections.json) dosya aktarır;
+ttkbootstrap ve tkinter hiç yüklenmez, başsız sunucularda ve zamanlanmış
+görevlerde kullanılabilir.
+
+    ducktransfer connections
+    ducktransfer -c sunucum ls /var/log -r
+    ducktransfer -c sunucum get /var/log/app.log ./
+    ducktransfer -c sunucum get -r /var/log ./yedek -j 8
+    ducktransfer -c sunucum put rapor.csv /gelen/
+    ducktransfer -c sunucum mirror ./site /var/www --delete
+    ducktransfer -c yedek rm -r eski/2023/ -j 16
+    ducktransfer -c yedek mirror ./arsiv arsiv/ --direction download --json
+
+Uzak hedef "/" ile bitiyorsa "bu klasörün içine" demektir. --json ile her
+olay stdout'a tek satırlık bir JSON nesnesi olarak yazılır.
+
+Çıkış kodları: 0 başarılı, 1 en az bir aktarım ya da silme başarısız, 2 hatalı kullanım,
+3 bağlantı kurulamadı, 130 kullanıcı tarafından kesildi.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Optional
+
+from config.connections import load_connections
+from connectors import LIMITER, METRICS, DeleteResult, create_connector
+from connectors.tree_delete import DELETE_WORKERS
+from connectors.base import BaseConnector, RemoteFile
+from transfer import (
+    JobState, SyncMode, SyncOp, SyncPlanner, TransferJob, TransferQueue, TransferStats, TreeScan,
+    autotune_limits, join_remote, walk_remote,
+)
+
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_CONNECTION = 3
+EXIT_INTERRUPTED = 130
+
+
+class UsageError(Exception):
+    """Bad arguments that argparse cannot detect on its own."""
+
+
+class Output:
+    """Writes events either as JSON lines or as short human-readable lines."""
+
+    def __init__(self, as_json: bool, quiet: bool = False):
+        self.as_json = as_json
+        self.quiet = quiet
+        self._lock = threading.Lock()
+
+    def event(self, kind: str, text: Optional[str] = None, always: bool = False, **fields) -> None:
+        """always=True lines are printed even with --quiet (failures, the summary)."""
+        with self._lock:
+            if self.as_json:
+                sys.stdout.write(json.dumps({"event": kind, **fields}, ensure_ascii=False) + "\n")
+                sys.stdout.flush()
+            elif text is not None and (always or not self.quiet):
+                print(text, flush=True)
+
+    def error(self, message: str) -> None:
+        with self._lock:
+            if self.as_json:
+                sys.stdout.write(json.dumps({"event": "error", "message": message}, ensure_ascii=False) + "\n")
+                sys.stdout.flush()
+            else:
+                print(f"ducktransfer: {message}", file=sys.stderr, flush=True)
+
+
+def _job_fields(job: TransferJob) -> dict:
+    return {
+        "id": job.id,
+        "direction": job.direction,
+        "source": job.source,
+        "destination": job.destination,
+        "state": job.state.value,
+        "size": job.size,
+        "transferred": job.transferred,
+    }
+
+
+def _scan_fields(scan: TreeScan) -> dict:
+    return {
+        "direction": scan.direction,
+        "source": scan.source,
+        "destination": scan.destination,
+        "state": scan.state.value,
+        "files": scan.files,
+        "directories": scan.directories,
+        "deleted": scan.deleted,
+        "skipped": scan.skipped,
+        "failed": scan.failed,
+        "error": scan.error,
+    }
+
+
+def _entry_fields(rel: str, entry: RemoteFile) -> dict:
+    return {
+        "name": rel,
+        "path": entry.path,
+        "size": entry.size,
+        "is_directory": entry.is_directory,
+        "mtime": entry.mtime,
+        "etag": entry.etag,
+    }
+
+
+def _find_profile(name: str) -> dict:
+    for config in load_connections():
+        if config.get("name") == name:
+            return config
+    raise UsageError(f"Kayıtlı bağlantı bulunamadı: {name}")
+
+
+def _remote(connector: BaseConnector, path: str) -> str:
+    # S3 anahtarları "/" ile başlamaz
+    return path if connector.needs_directories else path.lstrip("/")
+
+
+def _is_remote_dir(connector: BaseConnector, path: str, missing: bool) -> bool:
+    """
+    Whether path names a directory. FTP SIZE and S3 HEAD cannot see
+    directories, so a path that stat does not find counts as missing.
+    """
+    if path.endswith("/") or not path.strip("/"):
+        return True
+    info = connector.stat(path)
+    return missing if info is None else info.is_directory
+
+
+class Session:
+    """One connection and its transfer queue for the lifetime of a command."""
+
+    def __init__(self, args, out: Output):
+        self.out = out
+        self.config = _find_profile(args.connection)
+        if args.verify:
+            self.config = dict(self.config, verify_checksums=True)
+        if args.autotune:
+            self.config = dict(self.config, autotune=True)
+        if args.limit:
+            LIMITER.set_rate(args.limit * 1024)
+        workers = args.parallel or self.config.get("transfer_workers", 3)
+        self.connector = create_connector(self.config, workers=workers)
+        self.queue = TransferQueue(
+            self.connector,
+            max_workers=workers,
+            on_update=self._on_update,
+            on_scan_update=self._on_scan_update,
+            on_progress=self._on_progress if out.as_json else None,
+            progress_interval=args.progress_interval,
+            autotune=autotune_limits(self.config, workers),
+        )
+        self.resume = not args.no_resume
+        self.scans: list[TreeScan] = []
+        self.started = time.monotonic()
+
+    def close(self) -> None:
+        self.queue.shutdown()
+        self.connector.disconnect()
+        try:
+            METRICS.write_files()
+        except OSError:
+            pass
+
+    def _on_update(self, job: TransferJob) -> None:
+        if not job.finished:
+            if job.state == JobState.RUNNING:
+                self.out.event("job", None, **_job_fields(job))
+            return
+        fields = _job_fields(job)
+        if job.state == JobState.DONE:
+            self.out.event("job", f"✓ {job.source} → {job.destination}", **fields)
+        else:
+            self.out.event(
+                "job", f"✗ {job.source}: {job.error or job.state.value}", always=True, error=job.error, **fields
+            )
+
+    def _on_scan_update(self, scan: TreeScan) -> None:
+        if scan.state == JobState.FAILED:
+            self.out.event("scan", f"✗ {scan.source}: {scan.error}", always=True, **_scan_fields(scan))
+        elif scan.finished and scan.failed:
+            self.out.event(
+                "scan", f"✗ {scan.source}: {scan.failed} adım yapılamadı, son hata: {scan.error}",
+                always=True, **_scan_fields(scan),
+            )
+        else:
+            self.out.event("scan", None, **_scan_fields(scan))
+
+    def _on_progress(self, jobs: list[TransferJob], stats: TransferStats) -> None:
+        for job in jobs:
+            self.out.event("progress", None, rate=round(job.rate, 1), **_job_fields(job))
+        self.out.event(
+            "stats", None,
+            active=stats.active,
+            bytes_per_second=round(stats.bytes_per_second, 1),
+            remaining_bytes=stats.remaining_bytes,
+            eta=round(stats.eta, 1) if stats.eta is not None else None,
+        )
+
+    def wait(self) -> int:
+        """Block until every queued job and tree walk has finished; return the exit code."""
+        while self.queue.active_count() or self.queue.scanning_count():
+            time.sleep(0.1)
+        # Son işin bildirimi worker'da durum değiştikten sonra gelir; özetten önce bitsin
+        self.queue.shutdown(wait=True)
+        counts = self.queue.counts()
+        done = counts[JobState.DONE]
+        failed = counts[JobState.FAILED] + counts[JobState.CANCELLED]
+        transferred = self.queue.done_bytes()
+        seconds = time.monotonic() - self.started
+        self.out.event(
+            "summary",
+            f"{done} dosya aktarıldı, {failed} başarısız ({transferred} bayt, {seconds:.1f} s)",
+            always=True,
+            done=done,
+            failed=counts[JobState.FAILED],
+            cancelled=counts[JobState.CANCELLED],
+            bytes=transferred,
+            seconds=round(seconds, 3),
+        )
+        failed_scans = any(scan.state == JobState.FAILED or scan.failed for scan in self.scans)
+        return EXIT_FAILED if failed or failed_scans else EXIT_OK
+
+    def submit(self, direction: str, source: str, destination: str, size: int = 0) -> None:
+        self.queue.submit(TransferJob(direction, source, destination, size=size, resume=self.resume))
+
+    def submit_tree(self, direction: str, source: str, destination: str) -> None:
+        self.scans.append(self.queue.submit_tree(direction, source, destination))
+
+    def submit_sync(self, planner: SyncPlanner, actions) -> None:
+        self.scans.append(self.queue.submit_sync(planner, actions))
+
+
+def cmd_connections(args, out: Output) -> int:
+    for config in load_connections():
+        target = config.get("host") or config.get("bucket", "")
+        out.event(
+            "connection", f"{config.get('name', '')}\t{config.get('protocol', 'ftp')}\t{target}",
+            name=config.get("name"), protocol=config.get("protocol", "ftp"), target=target,
+        )
+    return EXIT_OK
+
+
+def cmd_ls(session: Session, args) -> int:
+    connector = session.connector
+    path = _remote(connector, args.path)
+    if args.recursive:
+        entries = walk_remote(connector, path)
+    else:
+        entries = ((e.name.strip("/"), e) for e in connector.list_directory(path))
+    for rel, entry in entries:
+        kind = "d" if entry.is_directory else "-"
+        session.out.event(
+            "entry", f"{kind} {entry.size:>14} {entry.modified or '-':<19} {rel}", **_entry_fields(rel, entry)
+        )
+    return EXIT_OK
+
+
+def cmd_get(session: Session, args) -> int:
+    connector = session.connector
+    local = args.local
+    into = len(args.remote) > 1 or os.path.isdir(local) or local.endswith(os.sep)
+    if len(args.remote) > 1 and not os.path.isdir(local):
+        raise UsageError(f"Birden fazla kaynak için hedef var olan bir klasör olmalı: {local}")
+
+    for remote in args.remote:
+        remote = _remote(connector, remote)
+        name = remote.rstrip("/").split("/")[-1]
+        target = os.path.join(local, name) if into else local
+        if _is_remote_dir(connector, remote, missing=True):
+            if not args.recursive:
+                raise UsageError(f"{remote} bulunamadı ya da bir klasör; klasör indirmek için -r kullanın")
+            session.submit_tree("download", remote, target)
+        else:
+            session.submit("download", remote, target)
+    return session.wait()
+
+
+def cmd_put(session: Session, args) -> int:
+    connector = session.connector
+    remote = _remote(connector, args.remote)
+    into = len(args.local) > 1 or _is_remote_dir(connector, remote, missing=False)
+
+    for local in args.local:
+        if not os.path.exists(local):
+            raise UsageError(f"Yerel dosya yok: {local}")
+        name = os.path.basename(os.path.abspath(local))
+        target = join_remote(remote, name) if into else remote
+        if os.path.isdir(local):
+            if not args.recursive:
+                raise UsageError(f"{local} bir klasör; klasör yüklemek için -r kullanın")
+            session.submit_tree("upload", local, target)
+        else:
+            session.submit("upload", local, target, size=os.path.getsize(local))
+    return session.wait()
+
+
+def cmd_mirror(session: Session, args) -> int:
+    connector = session.connector
+    remote = _remote(connector, args.remote)
+    if not connector.needs_directories:
+        remote = remote.strip("/")
+    planner = SyncPlanner(
+        connector, os.path.abspath(args.local), remote,
+        mode=SyncMode(args.direction), delete=args.delete, use_etag=not args.no_etag,
+    )
+    if args.dry_run:
+        for action in planner.actions():
+            session.out.event(
+                "action", f"{action.op.value:<14} {action.rel or '.'}  ({action.reason})",
+                op=action.op.value, rel=action.rel, local_path=action.local_path,
+                remote_path=action.remote_path, size=action.size, reason=action.reason,
+            )
+        session.out.event("plan", f"{planner.unchanged} dosya değişmemiş", unchanged=planner.unchanged)
+        return EXIT_OK
+
+    conflicts = []
+
+    def actions():
+        for action in planner.actions():
+            if action.op == SyncOp.CONFLICT:
+                conflicts.append(action)
+                session.out.event(
+                    "conflict", f"! {action.rel}: {action.reason}", always=True,
+                    rel=action.rel, local_path=action.local_path, remote_path=action.remote_path,
+                    reason=action.reason,
+                )
+            yield action
+
+    session.submit_sync(planner, actions())
+    code = session.wait()
+    return code if code != EXIT_OK or not conflicts else EXIT_FAILED
+
+
+def cmd_rm(session: Session, args) -> int:
+    connector = session.connector
+    started = time.monotonic()
+    total = DeleteResult()
+
+    for remote in args.remote:
+        remote = _remote(connector, remote)
+        if not remote.strip("/"):
+            raise UsageError("Kök klasör silinemez")
+        # FTP ve S3 klasörü stat ile göremez; -r verildiyse bulunamayan yol klasör sayılır
+        if not _is_remote_dir(connector, remote, missing=args.recursive):
+            if connector.delete(remote):
+                total.deleted += 1
+                session.out.event("deleted", f"✓ {remote}", path=remote)
+            else:
+                total.failed += 1
+                session.out.event("failed", f"✗ {remote}", always=True, path=remote)
+            continue
+        if not args.recursive:
+            raise UsageError(f"{remote} bir klasör; klasör silmek için -r kullanın")
+
+        def progress(deleted, found, remote=remote):
+            session.out.event("progress", None, path=remote, deleted=deleted, found=found)
+
+        result = connector.delete_tree(remote, progress, workers=args.parallel or DELETE_WORKERS)
+        total.deleted += result.deleted
+        total.failed += result.failed
+        for message in result.errors:
+            session.out.event("failed", f"✗ {message}", always=True, path=remote, error=message)
+        if result.failed > len(result.errors):
+            session.out.event("failed", f"✗ … {result.failed - len(result.errors)} hata daha", always=True, path=remote)
+        mark = "✓" if result.ok else "✗"
+        session.out.event(
+            "deleted", f"{mark} {remote} ({result.deleted} öğe silindi, {result.failed} hata)",
+            always=not result.ok, path=remote, deleted=result.deleted, failed=result.failed,
+        )
+
+    seconds = time.monotonic() - started
+    session.out.event(
+        "summary",
+        f"{total.deleted} öğe silindi, {total.failed} başarısız ({seconds:.1f} s)",
+        always=True,
+        deleted=total.deleted,
+        failed=total.failed,
+        seconds=round(seconds, 3),
+    )
+    return EXIT_OK if total.ok else EXIT_FAILED
+
+
+REMOTE_COMMANDS = {"ls": cmd_ls, "get": cmd_get, "put": cmd_put, "mirror": cmd_mirror, "rm": cmd_rm}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="ducktransfer",
+        description="DuckTransfer komut satırı: kayıtlı bağlantılarla FTP, SFTP ve S3 aktarımı",
+    )
+    parser.add_argument("-c", "--connection", help="connections.json'daki bağlantı adı")
+    parser.add_argument("--json", action="store_true", help="olayları satır başına bir JSON nesnesi olarak yaz")
+    parser.add_argument("-q", "--quiet", action="store_true", help="sadece hataları ve özeti yaz")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("connections", help="kayıtlı bağlantıları listele")
+
+    transfer = argparse.ArgumentParser(add_help=False)
+    transfer.add_argument("-j", "--parallel", type=int, help="eşzamanlı aktarım sayısı (varsayılan: bağlantı ayarı)")
+    transfer.add_argument("--no-resume", action="store_true", help="yarım kalan aktarımları baştan başlat")
+    transfer.add_argument("--verify", action="store_true", help="aktarımları sağlama toplamıyla doğrula")
+    transfer.add_argument("--limit", type=float, default=0, metavar="KB/S", help="toplam hız sınırı (0: sınırsız)")
+    transfer.add_argument("--autotune", action="store_true", help="eşzamanlılığı ve segmentleri ölçerek ayarla")
+    transfer.add_argument("--progress-interval", type=float, default=0.5, help="JSON ilerleme olayları arası saniye")
+
+    ls = sub.add_parser("ls", help="uzak klasörü listele")
+    ls.add_argument("path", nargs="?", default="/")
+    ls.add_argument("-r", "--recursive", action="store_true", help="alt klasörlerle birlikte")
+    ls.set_defaults(parallel=None, no_resume=False, verify=False, limit=0, autotune=False, progress_interval=0.5)
+
+    get = sub.add_parser("get", parents=[transfer], help="indir")
+    get.add_argument("remote", nargs="+")
+    get.add_argument("local")
+    get.add_argument("-r", "--recursive", action="store_true", help="klasörleri de indir")
+
+    put = sub.add_parser("put", parents=[transfer], help="yükle")
+    put.add_argument("local", nargs="+")
+    put.add_argument("remote")
+    put.add_argument("-r", "--recursive", action="store_true", help="klasörleri de yükle")
+
+    rm = sub.add_parser("rm", help="uzak dosya ya da klasör sil")
+    rm.add_argument("remote", nargs="+")
+    rm.add_argument("-r", "--recursive", action="store_true", help="klasörleri içindekilerle birlikte sil")
+    rm.add_argument("-j", "--parallel", type=int, help=f"eşzamanlı silme sayısı (varsayılan: {DELETE_WORKERS})")
+    rm.set_defaults(no_resume=False, verify=False, limit=0, autotune=False, progress_interval=0.5)
+
+    mirror = sub.add_parser("mirror", parents=[transfer], help="yerel ve uzak klasörü eşitle")
+    mirror.add_argument("local")
+    mirror.add_argument("remote")
+    mirror.add_argument(
+        "--direction", choices=[m.value for m in SyncMode], default=SyncMode.UPLOAD.value,
+        help="upload: yerel → uzak, download: uzak → yerel, both: daha yeni olan kazanır",
+    )
+    mirror.add_argument("--delete", action="store_true", help="kaynakta olmayanları hedeften sil")
+    mirror.add_argument("--no-etag", action="store_true", help="S3 ETag ile içerik karşılaştırma yapma")
+    mirror.add_argument("-n", "--dry-run", action="store_true", help="sadece planı göster")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    out = Output(args.json, args.quiet)
+
+    if args.command == "connections":
+        return cmd_connections(args, out)
+    if not args.connection:
+        parser.error(f"{args.command} için -c/--connection gerekli")
+
+    try:
+        session = Session(args, out)
+    except UsageError as e:
+        out.error(str(e))
+        return EXIT_USAGE
+    except Exception as e:
+        out.error(str(e))
+        return EXIT_CONNECTION
+
+    try:
+        return REMOTE_COMMANDS[args.command](session, args)
+    except UsageError as e:
+        session.queue.cancel_all()
+        out.error(str(e))
+        return EXIT_USAGE
+    except KeyboardInterrupt:
+        session.queue.cancel_all()
+        out.error("kesildi")
+        return EXIT_INTERRUPTED
+    except Exception as e:
+        session.queue.cancel_all()
+        out.error(str(e))
+        return EXIT_FAILED
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,46 @@
-"""Storage connectors for FTP, SFTP, and S3."""
+"""
+Storage connectors for FTP, SFTP, and S3.
+
+Backends are imported on first use, so boto3 or paramiko are only loaded
+when a connection actually needs them: `from connectors import S3Connector`
+and create_connector() for an S3 profile load boto3, nothing else does.
+"""
+
+import importlib
+import importlib.util
 
 from .base import BaseConnector, RemoteFile
-from .ftp_connector import FTPConnector
-from .s3_connector import S3Connector
+from .metrics import METRICS, MetricsRegistry
+from .ratelimit import BULK, INTERACTIVE, LIMITER, RateLimiter
+from .tree_delete import DeleteResult
+from .factory import BACKENDS, connector_class, create_connector
+
+# paramiko'yu yüklemeden kurulu mu diye bak
+HAS_SFTP = importlib.util.find_spec("paramiko") is not None
+
+_LAZY = {cls: module for module, cls in BACKENDS.values()}
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(module, __name__), name)
+    except ImportError:
+        if name != "SFTPConnector":
+            raise
+        value = None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
 
-try:
-    from .sftp_connector import SFTPConnector
-    HAS_SFTP = True
-except ImportError:
-    SFTPConnector = None
-    HAS_SFTP = False
 
-__all__ = ["BaseConnector", "RemoteFile", "FTPConnector", "SFTPConnector", "S3Connector", "HAS_SFTP"]
+__all__ = [
+    "BaseConnector", "RemoteFile", "FTPConnector", "SFTPConnector", "S3Connector", "HAS_SFTP",
+    "METRICS", "MetricsRegistry", "BACKENDS", "connector_class", "create_connector",
+    "BULK", "INTERACTIVE", "LIMITER", "RateLimiter", "DeleteResult",
+]
@@ -1,23 +1,64 @@
 """Base connector interface for remote storage backends."""
 
+import posixpath
+import threading
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional
+
+from .buffers import BufferPool
+from .checksum import ChecksumMismatch, StreamHasher, hash_file
+from .listing_cache import ListingCache
+from .metrics import INSTRUMENTED, METRICS, MetricsRegistry, _labels, instrument
+from .ratelimit import LIMITER, RateLimiter
+from .tree_delete import DELETE_WORKERS, DeleteResult, TreeDeleter
 
 
 @dataclass
 class RemoteFile:
-    """Represents a file or directory on remote storage."""
+    """
+    Represents a file or directory on remote storage.
+
+    modified is for display; mtime (epoch seconds) and etag are kept for
+    change detection when the backend provides them.
+    """
     name: str
     path: str
     size: int
     is_directory: bool
     modified: Optional[str] = None
+    mtime: Optional[float] = None
+    etag: Optional[str] = None
+
+
+def sort_listing(items: Iterable[RemoteFile]) -> list[RemoteFile]:
+    """Directories first, then case-insensitive by name."""
+    return sorted(items, key=lambda x: (not x.is_directory, x.name.lower()))
 
 
 class BaseConnector(ABC):
     """Abstract base class for FTP, S3, and other storage connectors."""
 
+    # False for object stores where directories only exist as key prefixes
+    needs_directories = True
+    _listing_cache: Optional[ListingCache] = None
+    metrics: MetricsRegistry = METRICS
+    rate_limiter: RateLimiter = LIMITER
+    # Veri döngülerinin tampon havuzu; set_block_size ile bağlantıya özel olur
+    buffers: BufferPool = BufferPool()
+    # connect(verify_checksums=True) ile açılır
+    verify_checksums = False
+    # Sağlama toplamı tutmayan bir transfer baştan kaç kez daha denensin
+    CHECKSUM_RETRIES = 1
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Her bağlayıcının işlemleri süre, bayt ve hata sayısıyla kaydedilir
+        for name in INSTRUMENTED:
+            func = cls.__dict__.get(name)
+            if func is not None and not getattr(func, "__isabstractmethod__", False):
+                setattr(cls, name, instrument(name, func))
+
     @abstractmethod
     def connect(self, **kwargs) -> bool:
         """Establish connection. Returns True on success."""
@@ -38,14 +79,37 @@ class BaseConnector(ABC):
         """List files and directories at the given path."""
         pass
 
+    def iter_directory(self, path: str = "/", batch_size: int = 500) -> Iterator[list[RemoteFile]]:
+        """
+        Yield the entries of a directory in unsorted batches as they arrive,
+        so huge directories can be shown before the listing is complete.
+        Closing the iterator early abandons the listing.
+        """
+        yield self.list_directory(path)
+
     @abstractmethod
-    def download_file(self, remote_path: str, local_path: str, progress_callback=None) -> bool:
-        """Download a file from remote to local."""
+    def stat(self, path: str) -> Optional[RemoteFile]:
+        """Return metadata for a single remote file, or None if it does not exist."""
         pass
 
     @abstractmethod
-    def upload_file(self, local_path: str, remote_path: str, progress_callback=None) -> bool:
-        """Upload a file from local to remote."""
+    def download_file(self, remote_path: str, local_path: str, progress_callback=None, resume: bool = False) -> bool:
+        """
+        Download a file from remote to local.
+
+        With resume=True an interrupted earlier download of the same file is
+        continued from where it stopped, provided the remote file is unchanged.
+        """
+        pass
+
+    @abstractmethod
+    def upload_file(self, local_path: str, remote_path: str, progress_callback=None, resume: bool = False) -> bool:
+        """
+        Upload a file from local to remote.
+
+        With resume=True an interrupted earlier upload of the same local file
+        is continued, provided the partial remote file is unchanged.
+        """
         pass
 
     @abstractmethod
@@ -62,3 +126,202 @@ class BaseConnector(ABC):
     def get_current_path(self) -> str:
         """Get current working directory/path."""
         pass
+
+    def delete_tree(
+        self,
+        path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        workers: int = DELETE_WORKERS,
+        abort: Optional[threading.Event] = None,
+    ) -> DeleteResult:
+        """
+        Delete path and everything below it. The tree is listed as a stream
+        and removed by `workers` parallel calls, directories bottom-up;
+        progress_callback(deleted, found) is called along the way. Setting
+        abort stops after the removals already in flight.
+        """
+        if self._listing_key(path) == "/":
+            raise ValueError("Kök klasör silinemez")
+        return TreeDeleter(self, workers, progress_callback, abort).run(path)
+
+    def _remove(self, path: str, is_directory: bool) -> None:
+        """Remove one file or empty directory for delete_tree; raises on failure."""
+        if not self.delete(path):
+            raise IOError(f"Silinemedi: {path}")
+
+    def set_mtime(self, path: str, mtime: float) -> bool:
+        """Set a remote file's modification time (epoch seconds); False where the backend cannot."""
+        return False
+
+    def set_rate_limit(self, rate: float) -> None:
+        """Cap this connection at rate bytes per second (0 = no cap), on top of the global cap."""
+        self.rate_limiter.set_connection_rate(self._endpoint(), rate)
+
+    def set_block_size(self, size: int) -> None:
+        """Block size in bytes for this connection's transfer loops, clamped to 256 KB–8 MB."""
+        self.buffers = BufferPool(size)
+
+    def parallelism(self) -> tuple[int, int]:
+        """(streams one large file is moved over, most bytes per range; 0 = file split evenly)."""
+        return 1, 0
+
+    def set_parallelism(self, segments: int, segment_size: int = 0) -> None:
+        """Change parallelism() for transfers started from now on; used by the autotuner."""
+
+    def _throttle(self, n: int) -> None:
+        """
+        Called by the data loops before moving n bytes; blocks while a cap is
+        exceeded. The bytes are counted as they move, unlike
+        ducktransfer_bytes_total which only grows when a transfer finishes.
+        """
+        self.rate_limiter.acquire(n, self._endpoint())
+        protocol, host = _labels(self)
+        self.metrics.inc("ducktransfer_stream_bytes_total", {"protocol": protocol, "host": host}, n)
+
+    def _count_throttled(self) -> None:
+        """The server refused a connection or asked us to slow down (FTP 421, S3 SlowDown/503)."""
+        protocol, host = _labels(self)
+        self.metrics.inc("ducktransfer_throttled_total", {"protocol": protocol, "host": host})
+
+    def remote_checksum(self, path: str) -> Optional[tuple[str, str]]:
+        """
+        (algorithm, hex digest) of a remote file as computed by the server,
+        or None when the server cannot tell.
+        """
+        return None
+
+    def checksum_algorithm(self) -> Optional[str]:
+        """The algorithm remote_checksum answers with, so transfers know what to hash inline."""
+        return None
+
+    def _new_hasher(self) -> Optional[StreamHasher]:
+        algorithm = self.checksum_algorithm() if self.verify_checksums else None
+        return StreamHasher([algorithm]) if algorithm else None
+
+    def _verify_remote(self, remote_path: str, local_path: str, hasher: Optional[StreamHasher]) -> None:
+        """
+        Compare a finished transfer with remote_checksum. The inline hasher is
+        used when it saw every byte in order; otherwise the local file is read.
+        """
+        if not self.verify_checksums:
+            return
+        remote = self.remote_checksum(remote_path)
+        if remote is None:
+            self._count_checksum("unavailable")
+            return
+        algorithm, expected = remote
+        if hasher is None or hasher.broken or algorithm not in hasher.algorithms:
+            hasher = hash_file(local_path, [algorithm])
+        self._check_digest(remote_path, expected, hasher.hexdigest(algorithm))
+
+    def _check_digest(self, path: str, expected: str, actual: str) -> None:
+        if expected.lower() != actual.lower():
+            self._count_checksum("mismatch")
+            raise ChecksumMismatch(f"Sağlama toplamı tutmuyor: {path} ({actual} != {expected})")
+        self._count_checksum("ok")
+
+    def _count_checksum(self, result: str) -> None:
+        protocol, host = _labels(self)
+        self.metrics.inc("ducktransfer_checksum_total", {"protocol": protocol, "host": host, "result": result})
+
+    def _retry_on_mismatch(self, transfer: Callable[[bool], bool], resume: bool) -> bool:
+        """
+        Run transfer(resume); when it ends in ChecksumMismatch the file is sent
+        again from scratch, up to CHECKSUM_RETRIES more times.
+        """
+        for attempt in range(self.CHECKSUM_RETRIES + 1):
+            try:
+                return transfer(resume and attempt == 0)
+            except ChecksumMismatch:
+                if attempt == self.CHECKSUM_RETRIES:
+                    raise
+        return False
+
+    def enable_listing_cache(self, max_entries: int = 256, ttl: float = 30.0, max_stale: float = 300.0) -> None:
+        """Cache list_directory results for list_directory_cached."""
+        self._listing_cache = ListingCache(max_entries, ttl, max_stale)
+
+    def list_directory_cached(
+        self,
+        path: str = "/",
+        on_refresh: Optional[Callable[[list[RemoteFile]], None]] = None,
+        force: bool = False,
+    ) -> list[RemoteFile]:
+        """
+        list_directory through the listing cache. A stale entry is returned
+        immediately and refreshed on a background thread; on_refresh receives
+        the new listing when it differs from the one returned.
+        """
+        if not force:
+            items = self.cached_listing(path, on_refresh)
+            if items is not None:
+                return items
+        if self._listing_cache is None:
+            return self.list_directory(path)
+
+        key = self._listing_key(path)
+        generation = self._listing_cache.generation(key)
+        items = self.list_directory(path)
+        self._listing_cache.put(key, items, generation)
+        return list(items)
+
+    def cached_listing(
+        self,
+        path: str,
+        on_refresh: Optional[Callable[[list[RemoteFile]], None]] = None,
+    ) -> Optional[list[RemoteFile]]:
+        """The cached listing of path, or None on a miss. Stale hits are refreshed as in list_directory_cached."""
+        cache = self._listing_cache
+        if cache is None:
+            return None
+        key = self._listing_key(path)
+        items, fresh = cache.get(key)
+        if items is None:
+            return None
+        if not fresh and cache.begin_refresh(key):
+            threading.Thread(
+                target=self._revalidate_listing, args=(path, key, items, on_refresh), daemon=True
+            ).start()
+        return list(items)
+
+    def iter_directory_cached(self, path: str = "/", batch_size: int = 500) -> Iterator[list[RemoteFile]]:
+        """iter_directory that stores the listing in the cache once it has been read to the end."""
+        if self._listing_cache is None:
+            yield from self.iter_directory(path, batch_size)
+            return
+        key = self._listing_key(path)
+        generation = self._listing_cache.generation(key)
+        items = []
+        for batch in self.iter_directory(path, batch_size):
+            items.extend(batch)
+            yield batch
+        self._listing_cache.put(key, sort_listing(items), generation)
+
+    def _revalidate_listing(self, path, key, old_items, on_refresh) -> None:
+        cache = self._listing_cache
+        try:
+            generation = cache.generation(key)
+            items = self.list_directory(path)
+            if cache.put(key, items, generation) and on_refresh and items != old_items:
+                on_refresh(list(items))
+        except Exception:
+            pass
+        finally:
+            cache.end_refresh(key)
+
+    def invalidate_listing(self, path: str) -> None:
+        """Forget the cached listings that a change to path makes wrong: its parent, and path itself if it was a directory."""
+        if self._listing_cache is None:
+            return
+        key = self._listing_key(path)
+        self._listing_cache.invalidate(key)
+        for parent in self._parent_keys(path):
+            self._listing_cache.invalidate(parent)
+
+    def _listing_key(self, path: str) -> str:
+        """Canonical form of a directory path, used as the cache key."""
+        return posixpath.normpath(path or "/")
+
+    def _parent_keys(self, path: str) -> list[str]:
+        """Cache keys of listings that show path as an entry."""
+        return [posixpath.dirname(self._listing_key(path)) or "/"]
@@ -0,0 +1,57 @@
+"""Reusable I/O buffers for the connectors' data loops."""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+KB = 1024
+MB = 1024 * KB
+
+MIN_BLOCK_SIZE = 256 * KB
+MAX_BLOCK_SIZE = 8 * MB
+DEFAULT_BLOCK_SIZE = 1 * MB
+# Boşta bekleyen tamponlar toplam bu kadar belleği geçmesin
+MAX_IDLE_BYTES = 64 * MB
+
+
+def clamp_block_size(size: int) -> int:
+    return max(MIN_BLOCK_SIZE, min(MAX_BLOCK_SIZE, int(size)))
+
+
+class BufferPool:
+    """
+    Fixed-size bytearrays lent out as memoryviews.
+
+    A data loop leases one buffer for the whole transfer and reads into it
+    with readinto/recv_into, so no bytes object is created per block and
+    slices of the view go to the file or socket without being copied.
+    Returned buffers are kept for the next transfer, up to MAX_IDLE_BYTES.
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.block_size = clamp_block_size(block_size)
+        self._max_idle = max(1, MAX_IDLE_BYTES // self.block_size)
+        self._idle: list[bytearray] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def lease(self) -> Iterator[memoryview]:
+        with self._lock:
+            buf = self._idle.pop() if self._idle else None
+        if buf is None:
+            buf = bytearray(self.block_size)
+        view = memoryview(buf)
+        try:
+            yield view
+        finally:
+            view.release()
+            with self._lock:
+                if len(self._idle) < self._max_idle:
+                    self._idle.append(buf)
+
+
+def write_all(f, data) -> None:
+    """f.write for unbuffered files, which may take fewer bytes than given."""
+    view = memoryview(data)
+    while view:
+        view = view[f.write(view):]
@@ -0,0 +1,156 @@
+"""Checksums computed on the bytes of a transfer while they pass through."""
+
+import base64
+import hashlib
+import zlib
+from typing import Iterable, Optional
+
+try:
+    # botocore CRC32C için aynı isteğe bağlı paketi kullanıyor
+    from awscrt import checksums as _crt
+except ImportError:
+    _crt = None
+
+
+class ChecksumMismatch(IOError):
+    """The copy on one side does not hash to what the other side reports."""
+
+
+class _CRC:
+    """hashlib-like wrapper around an incremental crc(data, previous) function."""
+
+    def __init__(self, func):
+        self._func = func
+        self._value = 0
+
+    def update(self, data) -> None:
+        self._value = self._func(data, self._value)
+
+    def digest(self) -> bytes:
+        return self._value.to_bytes(4, "big")
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+
+def available(algorithm: str) -> bool:
+    if algorithm == "crc32c":
+        return _crt is not None
+    return algorithm == "crc32" or algorithm in hashlib.algorithms_available
+
+
+def new_hash(algorithm: str):
+    if algorithm == "crc32":
+        return _CRC(zlib.crc32)
+    if algorithm == "crc32c":
+        if _crt is None:
+            raise ValueError("crc32c için awscrt gerekli")
+        return _CRC(_crt.crc32c)
+    return hashlib.new(algorithm)
+
+
+class StreamHasher:
+    """
+    Feeds the bytes of a transfer into one or more hashes as they pass.
+
+    Bytes must arrive in file order starting at `start`; seed() hashes a
+    prefix that is already on disk (a resumed transfer). A hasher that saw
+    a gap is marked broken and the caller falls back to hash_file().
+    """
+
+    def __init__(self, algorithms: Iterable[str], start: int = 0):
+        self._hashes = {a: new_hash(a) for a in algorithms}
+        self.position = start
+        self.broken = False
+
+    @property
+    def algorithms(self) -> tuple[str, ...]:
+        return tuple(self._hashes)
+
+    def update(self, data) -> None:
+        for h in self._hashes.values():
+            h.update(data)
+        self.position += len(data)
+
+    def update_at(self, offset: int, data) -> None:
+        """update() for callers that know the offset; out-of-order data breaks the hasher."""
+        if offset != self.position:
+            self.broken = True
+        if not self.broken:
+            self.update(data)
+
+    def seed(self, path: str, length: int, block_size: int = 1024 * 1024) -> None:
+        """Hash the first length bytes of a local file, before the streamed bytes."""
+        with open(path, "rb") as f:
+            remaining = length
+            while remaining > 0:
+                data = f.read(min(block_size, remaining))
+                if not data:
+                    self.broken = True
+                    return
+                self.update(data)
+                remaining -= len(data)
+
+    def digest(self, algorithm: str) -> bytes:
+        return self._hashes[algorithm].digest()
+
+    def hexdigest(self, algorithm: str) -> str:
+        return self._hashes[algorithm].hexdigest()
+
+
+class PartMD5:
+    """
+    MD5 of every part_size block of an in-order byte stream; an S3 multipart
+    ETag is built from exactly these digests.
+    """
+
+    def __init__(self, part_size: int):
+        self.part_size = part_size
+        self.digests: list[bytes] = []
+        self._current = hashlib.md5()
+        self._filled = 0
+
+    def update(self, data) -> None:
+        view = memoryview(data)
+        while view:
+            take = min(len(view), self.part_size - self._filled)
+            self._current.update(view[:take])
+            self._filled += take
+            view = view[take:]
+            if self._filled == self.part_size:
+                self.digests.append(self._current.digest())
+                self._current, self._filled = hashlib.md5(), 0
+
+    def finish(self) -> list[bytes]:
+        if self._filled:
+            self.digests.append(self._current.digest())
+            self._current, self._filled = hashlib.md5(), 0
+        return self.digests
+
+
+def hash_file(path: str, algorithms: Iterable[str], start: int = 0, length: Optional[int] = None,
+              block_size: int = 1024 * 1024) -> StreamHasher:
+    """Hash a local file (or the length bytes at start) the slow way, for when streaming was not possible."""
+    hasher = StreamHasher(algorithms, start)
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining is None or remaining > 0:
+            data = f.read(block_size if remaining is None else min(block_size, remaining))
+            if not data:
+                break
+            hasher.update(data)
+            if remaining is not None:
+                remaining -= len(data)
+    return hasher
+
+
+def b64(digest: bytes) -> str:
+    """S3 Checksum* headers and Content-MD5 carry the raw digest in base64."""
+    return base64.b64encode(digest).decode("ascii")
+
+
+def multipart_etag(part_md5s: Iterable[bytes]) -> str:
+    """ETag S3 gives a multipart object: MD5 of the part MD5s, then -<part count>."""
+    digests = list(part_md5s)
+    return f"{hashlib.md5(b''.join(digests)).hexdigest()}-{len(digests)}"
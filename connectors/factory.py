@@ -0,0 +1,92 @@
+"""Build a connected connector from a saved connection profile."""
+
+import importlib
+from typing import Optional
+
+from .base import BaseConnector
+
+MB = 1024 * 1024
+
+# Protokol → (modül, sınıf); modül ancak o protokol ilk kullanıldığında yüklenir
+BACKENDS = {
+    "ftp": (".ftp_connector", "FTPConnector"),
+    "ftp_ssl": (".ftp_connector", "FTPConnector"),
+    "sftp": (".sftp_connector", "SFTPConnector"),
+    "s3": (".s3_connector", "S3Connector"),
+}
+
+
+def connector_class(protocol: str) -> type:
+    """Import the backend for protocol and return its connector class."""
+    try:
+        module, name = BACKENDS[protocol]
+    except KeyError:
+        raise ConnectionError(f"Desteklenmeyen protokol: {protocol}") from None
+    return getattr(importlib.import_module(module, __package__), name)
+
+
+def create_connector(config: dict, workers: Optional[int] = None) -> BaseConnector:
+    """
+    Connect the backend named by config["protocol"] using the keys stored in
+    connections.json. workers overrides config["transfer_workers"] when
+    sizing session pools; one extra session is kept for browsing.
+    """
+    proto = config.get("protocol", "ftp")
+    if workers is None:
+        workers = config.get("transfer_workers", 3)
+    if config.get("autotune", False):
+        # Ayarlayıcı iş sayısını bu sınıra kadar artırabilir
+        workers = max(workers, config.get("autotune_max_workers", 8))
+    pool_size = workers + 1
+    verify = config.get("verify_checksums", False)
+    if proto in ("ftp", "ftp_ssl"):
+        connector = connector_class(proto)()
+        connector.connect(
+            host=config["host"],
+            port=config.get("port", 21),
+            username=config.get("username", ""),
+            password=config.get("password", ""),
+            use_ssl=(proto == "ftp_ssl"),
+            pool_size=pool_size + config.get("ftp_segments", 4),
+            segments=config.get("ftp_segments", 4),
+            verify_checksums=verify,
+            compression=config.get("compression", False),
+        )
+    elif proto == "sftp":
+        try:
+            connector = connector_class(proto)()
+        except ImportError:
+            raise ConnectionError("SFTP için paramiko kurulu değil (pip install paramiko)") from None
+        connector.connect(
+            host=config["host"],
+            port=config.get("port", 22),
+            username=config.get("username", ""),
+            password=config.get("password", ""),
+            # OpenSSH varsayılan MaxSessions değeri 10
+            channels=min(10, pool_size + config.get("sftp_segments", 4)),
+            prefetch_depth=config.get("sftp_prefetch_depth", 0),
+            segments=config.get("sftp_segments", 4),
+            confirm_uploads=config.get("sftp_confirm_uploads", True),
+            verify_checksums=verify,
+            compression=config.get("compression", False),
+        )
+    elif proto == "s3":
+        connector = connector_class(proto)()
+        connector.connect(
+            access_key=config.get("access_key", ""),
+            secret_key=config.get("secret_key", ""),
+            region=config.get("region", "us-east-1"),
+            bucket=config["bucket"],
+            max_pool_connections=max(10, pool_size * config.get("s3_max_concurrency", 8)),
+            part_size=config.get("s3_part_size_mb", 8) * MB,
+            multipart_threshold=config.get("s3_threshold_mb", 16) * MB,
+            max_concurrency=config.get("s3_max_concurrency", 8),
+            endpoint_url=config.get("s3_endpoint_url", ""),
+            verify_checksums=verify,
+        )
+    else:
+        raise ConnectionError(f"Desteklenmeyen protokol: {proto}")
+    connector.set_rate_limit(config.get("rate_limit_kbps", 0) * 1024)
+    if "io_block_kb" in config:
+        connector.set_block_size(config["io_block_kb"] * 1024)
+    return connector
@@ -1,18 +1,76 @@
 """FTP connector implementation."""
 
+import calendar
 import ftplib
 import os
-from typing import Optional, Callable
+import posixpath
+import threading
+import time
+import zlib
+from typing import Callable, Iterator, Optional
 
-from .base import BaseConnector, RemoteFile
+from .base import BaseConnector, RemoteFile, sort_listing
+from .buffers import write_all
+from .checksum import StreamHasher, new_hash
+from .pool import SessionPool
+from .resume import DEFAULT_RESUME_DIR, ResumeStore, TransferResume, local_fingerprint, remote_fingerprint
+from .segments import RangeTracker, SharedProgress, run_parallel, split_ranges
+
+MB = 1024 * 1024
+
+# HASH (draft-bryan-ftpext-hash) adı → hashlib adı, tercih sırasıyla
+HASH_ALGORITHMS = {"SHA-256": "sha256", "SHA-512": "sha512", "SHA-1": "sha1", "MD5": "md5", "CRC32": "crc32"}
+# HASH yoksa eski X* komutları
+X_HASH_COMMANDS = {"XSHA256": "sha256", "XSHA512": "sha512", "XSHA1": "sha1", "XMD5": "md5", "XCRC": "crc32"}
+
+
+class _SessionSpoiled(Exception):
+    """Raised inside a pool lease when the control connection may still hold unread replies; the session is closed."""
 
 
 class FTPConnector(BaseConnector):
-    """FTP protocol connector. use_ssl=True for FTP-SSL (Explicit AUTH TLS)."""
+    """
+    FTP protocol connector. use_ssl=True for FTP-SSL (Explicit AUTH TLS).
+
+    Every operation leases its own logged-in session from a pool, so the
+    connector can be shared between the UI thread and transfer workers.
+    All paths sent to the server are absolute; sessions never rely on cwd.
+
+    Files larger than segment_threshold are downloaded over `segments`
+    sessions at once, each sending REST <offset> + RETR and stopping at its
+    byte boundary, since many servers throttle per connection. A session
+    whose RETR was cut short is closed instead of going back to the pool.
+
+    With compression the data channel is switched to MODE Z (deflate) for
+    file transfers; listings stay in MODE S. Servers that refuse MODE Z are
+    used uncompressed, and compressed downloads are never segmented since a
+    deflate stream cannot be split at file offsets.
+
+    With verify_checksums the server's digest (HASH or XSHA256/XSHA1/XMD5,
+    whichever FEAT announces) is compared with one computed while the bytes
+    streamed past; servers without any of them are left unverified.
+
+    Data channels are read with recv_into and files with readinto, one
+    pooled block (set_block_size) at a time, instead of ftplib's 8 KB
+    retrbinary/storbinary chunks.
+    """
 
     def __init__(self):
-        self._ftp: Optional[ftplib.FTP] = None
+        self._pool: Optional[SessionPool] = None
+        self._login: dict = {}
         self._current_path = "/"
+        self._segment_threshold = 64 * MB
+        self._segments = 4
+        # Bir aralığın en fazla boyutu; 0 ise dosya segmentlere eşit bölünür
+        self._segment_size = 0
+        self._resume = ResumeStore()
+        # (komut, HASH algoritma adı, hashlib adı); sunucu desteklemiyorsa None
+        self._hash_command: Optional[tuple[str, Optional[str], str]] = None
+        self._compression = False
+        # Sunucu MODE Z'yi kabul etti mi
+        self._mode_z = False
+        # MFMT reddedilene kadar denenir
+        self._mfmt = True
 
     def connect(
         self,
@@ -21,36 +79,188 @@ class FTPConnector(BaseConnector):
         username: str = "",
         password: str = "",
         use_ssl: bool = False,
+        pool_size: int = 4,
+        idle_timeout: float = 120.0,
+        segment_threshold: int = 64 * MB,
+        segments: int = 4,
+        resume_dir: str = DEFAULT_RESUME_DIR,
+        verify_checksums: bool = False,
+        compression: bool = False,
         **kwargs
     ) -> bool:
+        self.verify_checksums = verify_checksums
+        self._hash_command = None
+        self._compression = compression
+        self._mode_z = False
+        self._mfmt = True
+        self._segment_threshold = int(segment_threshold)
+        self._segments = max(1, int(segments))
+        self._segment_size = 0
+        self._resume = ResumeStore(resume_dir)
+        self._login = {
+            "host": host,
+            "port": port,
+            "username": username or "anonymous",
+            "password": password or "anonymous@",
+            "use_ssl": use_ssl,
+        }
         try:
-            if use_ssl:
-                self._ftp = ftplib.FTP_TLS()
-                self._ftp.connect(host, port, timeout=30)
-                self._ftp.auth()
-                self._ftp.login(username or "anonymous", password or "anonymous@")
-                self._ftp.prot_p()
-            else:
-                self._ftp = ftplib.FTP()
-                self._ftp.connect(host, port, timeout=30)
-                self._ftp.login(username or "anonymous", password or "anonymous@")
-            self._ftp.encoding = "utf-8"
-            self._current_path = self._ftp.pwd()
+            pool = SessionPool(
+                self._open_session,
+                max_size=pool_size,
+                close=self._close_session,
+                validate=lambda ftp: ftp.voidcmd("NOOP"),
+                idle_timeout=idle_timeout,
+                recoverable=(ftplib.error_perm,),
+            )
+            with pool.lease() as ftp:
+                self._current_path = ftp.pwd()
+                if verify_checksums:
+                    self._hash_command = self._detect_hash(ftp)
+                if compression:
+                    self._mode_z = self._probe_mode_z(ftp)
+            self._pool = pool
             return True
         except Exception as e:
             raise ConnectionError(f"FTP bağlantı hatası: {str(e)}")
 
+    def _open_session(self) -> ftplib.FTP:
+        login = self._login
+        try:
+            if login["use_ssl"]:
+                ftp = ftplib.FTP_TLS()
+                ftp.connect(login["host"], login["port"], timeout=30)
+                ftp.auth()
+                ftp.login(login["username"], login["password"])
+                ftp.prot_p()
+            else:
+                ftp = ftplib.FTP()
+                ftp.connect(login["host"], login["port"], timeout=30)
+                ftp.login(login["username"], login["password"])
+        except ftplib.error_temp as e:
+            # 421: sunucu bu IP'den daha fazla bağlantı kabul etmiyor
+            if str(e).startswith("421"):
+                self._count_throttled()
+            raise
+        ftp.encoding = "utf-8"
+        ftp.transfer_mode = "S"
+        return ftp
+
+    @staticmethod
+    def _close_session(ftp: ftplib.FTP) -> None:
+        try:
+            ftp.quit()
+        except Exception:
+            ftp.close()
+
     def disconnect(self) -> None:
-        if self._ftp:
-            try:
-                self._ftp.quit()
-            except Exception:
-                pass
-            self._ftp = None
+        if self._pool:
+            self._pool.close()
+            self._pool = None
         self._current_path = "/"
 
     def is_connected(self) -> bool:
-        return self._ftp is not None
+        return self._pool is not None
+
+    @staticmethod
+    def _probe_mode_z(ftp: ftplib.FTP) -> bool:
+        try:
+            ftp.voidcmd("MODE Z")
+        except ftplib.error_perm:
+            # 502/504: sunucu sıkıştırmayı bilmiyor, MODE S ile devam
+            return False
+        ftp.transfer_mode = "Z"
+        return True
+
+    def _set_mode(self, ftp: ftplib.FTP, compressed: bool) -> bool:
+        """Put the session in MODE Z or MODE S if it is not already; returns whether data is deflated."""
+        mode = "Z" if compressed and self._mode_z else "S"
+        if getattr(ftp, "transfer_mode", "S") != mode:
+            try:
+                ftp.voidcmd(f"MODE {mode}")
+            except ftplib.error_perm:
+                if mode == "S":
+                    raise
+                self._mode_z = False
+                return False
+            ftp.transfer_mode = mode
+        return mode == "Z"
+
+    @staticmethod
+    def _detect_hash(ftp: ftplib.FTP) -> Optional[tuple[str, Optional[str], str]]:
+        """Pick the strongest checksum command FEAT announces."""
+        try:
+            features = [line.strip().upper() for line in ftp.sendcmd("FEAT").splitlines()[1:-1]]
+        except ftplib.all_errors:
+            return None
+        for feature in features:
+            if feature.startswith("HASH "):
+                # "HASH SHA-1;SHA-256*;MD5" — yıldız sunucunun seçili algoritması
+                offered = {name.rstrip("*") for name in feature[5:].split(";")}
+                for name, algorithm in HASH_ALGORITHMS.items():
+                    if name in offered:
+                        return "HASH", name, algorithm
+        for command, algorithm in X_HASH_COMMANDS.items():
+            if command in features:
+                return command, None, algorithm
+        return None
+
+    def checksum_algorithm(self) -> Optional[str]:
+        return self._hash_command[2] if self._hash_command else None
+
+    def remote_checksum(self, path: str) -> Optional[tuple[str, str]]:
+        if not self._pool or not self._hash_command:
+            return None
+        command, name, algorithm = self._hash_command
+        path = self._abspath(path)
+        try:
+            with self._pool.lease() as ftp:
+                # Sunucu büyük dosyada özeti hesaplarken 30 sn'lik zaman aşımı yetmeyebilir
+                ftp.sock.settimeout(600)
+                try:
+                    if command == "HASH":
+                        ftp.sendcmd(f"OPTS HASH {name}")
+                        reply = ftp.sendcmd(f"HASH {path}")
+                    else:
+                        reply = ftp.sendcmd(f"{command} {path}")
+                finally:
+                    ftp.sock.settimeout(30)
+        except ftplib.all_errors:
+            return None
+        # "213 SHA-256 0-1234 <hex> <ad>" ya da "250 <hex>"; uzunluğu tutan ilk onaltılık parça
+        length = new_hash(algorithm).digest_size * 2 if algorithm != "crc32" else 8
+        for token in reply[4:].split():
+            if len(token) == length and all(c in "0123456789abcdefABCDEF" for c in token):
+                return algorithm, token.lower()
+        return None
+
+    def _endpoint(self) -> str:
+        return f"ftp://{self._login.get('username')}@{self._login.get('host')}:{self._login.get('port')}"
+
+    def parallelism(self) -> tuple[int, int]:
+        return self._segments, self._segment_size
+
+    def set_parallelism(self, segments: int, segment_size: int = 0) -> None:
+        self._segments = max(1, int(segments))
+        self._segment_size = max(0, int(segment_size))
+
+    @staticmethod
+    def _parse_modify(modify: str) -> Optional[float]:
+        """MLSD/MDTM YYYYMMDDHHMMSS (UTC) -> epoch seconds."""
+        try:
+            return float(calendar.timegm(time.strptime(modify[:14], "%Y%m%d%H%M%S")))
+        except (ValueError, TypeError):
+            return None
+
+    def _abspath(self, path: str) -> str:
+        if not path:
+            return self._current_path
+        if not path.startswith("/"):
+            path = os.path.join(self._current_path, path)
+        return path.replace("\\", "/")
+
+    def _listing_key(self, path: str) -> str:
+        return posixpath.normpath(self._abspath(path))
 
     def _parse_mlsd(self, line: str) -> Optional[RemoteFile]:
         """Parse MLSD response line."""
@@ -81,138 +291,397 @@ class FTPConnector(BaseConnector):
             return None
 
     def list_directory(self, path: str = "/") -> list[RemoteFile]:
-        if not self._ftp:
-            return []
+        files = []
+        for batch in self.iter_directory(path, batch_size=4096):
+            files.extend(batch)
+        return sort_listing(files)
+
+    def iter_directory(self, path: str = "/", batch_size: int = 500) -> Iterator[list[RemoteFile]]:
+        """Stream MLSD lines straight off the data connection instead of buffering the whole reply."""
+        if not self._pool:
+            return
 
         try:
-            if path and path != self._current_path:
-                self._ftp.cwd(path)
-                self._current_path = path
+            path = self._abspath(path)
+            with self._pool.lease() as ftp:
+                self._set_mode(ftp, False)
+                ftp.sendcmd("TYPE A")
+                try:
+                    conn = ftp.transfercmd(f"MLSD {path}")
+                except ftplib.error_perm:
+                    yield self._nlst_entries(ftp, path)
+                    return
 
-            files = []
-            try:
-                for line in self._ftp.mlsd():
-                    if line[0] in (".", ".."):
-                        continue
-                    name, facts = line
-                    is_dir = facts.get("type", "").upper() == "DIR"
-                    size = int(facts.get("size", 0))
-                    modify = facts.get("modify", "")
-                    if len(modify) >= 14:
-                        mod_str = f"{modify[6:8]}.{modify[4:6]}.{modify[:4]} {modify[8:10]}:{modify[10:12]}:{modify[12:14]}"
-                    else:
-                        mod_str = None
-
-                    files.append(RemoteFile(
-                        name=name,
-                        path=os.path.join(self._current_path, name).replace("\\", "/"),
-                        size=size,
-                        is_directory=is_dir,
-                        modified=mod_str
-                    ))
-            except ftplib.error_perm:
-                for line in self._ftp.nlst():
-                    if line in (".", ".."):
-                        continue
-                    full_path = os.path.join(self._current_path, line).replace("\\", "/")
-                    try:
-                        self._ftp.cwd(line)
-                        self._ftp.cwd("..")
-                        is_dir = True
-                    except Exception:
-                        is_dir = False
-                    files.append(RemoteFile(
-                        name=line,
-                        path=full_path,
-                        size=0,
-                        is_directory=is_dir,
-                        modified=None
-                    ))
-
-            return sorted(files, key=lambda x: (not x.is_directory, x.name.lower()))
+                batch = []
+                with conn, conn.makefile("r", encoding=ftp.encoding) as fp:
+                    for line in fp:
+                        entry = self._mlsd_entry(path, line.rstrip("\r\n"))
+                        if entry is None:
+                            continue
+                        batch.append(entry)
+                        if len(batch) >= batch_size:
+                            yield batch
+                            batch = []
+                    if hasattr(conn, "unwrap"):
+                        conn.unwrap()
+                ftp.voidresp()
+                if batch:
+                    yield batch
         except Exception as e:
             raise RuntimeError(f"Dizin listelenemedi: {str(e)}")
 
+    def _mlsd_entry(self, path: str, line: str) -> Optional[RemoteFile]:
+        facts_str, _, name = line.partition(" ")
+        if not name or name in (".", ".."):
+            return None
+        facts = {}
+        for fact in facts_str.rstrip(";").split(";"):
+            key, _, value = fact.partition("=")
+            facts[key.lower()] = value
+        kind = facts.get("type", "").lower()
+        if kind in ("cdir", "pdir"):
+            return None
+        is_dir = kind == "dir"
+        modify = facts.get("modify", "")
+        if len(modify) >= 14:
+            mod_str = f"{modify[6:8]}.{modify[4:6]}.{modify[:4]} {modify[8:10]}:{modify[10:12]}:{modify[12:14]}"
+        else:
+            mod_str = None
+
+        return RemoteFile(
+            name=name,
+            path=os.path.join(path, name).replace("\\", "/"),
+            size=int(facts.get("size", 0) or 0),
+            is_directory=is_dir,
+            modified=mod_str,
+            mtime=self._parse_modify(modify) if mod_str else None
+        )
+
+    def _nlst_entries(self, ftp: ftplib.FTP, path: str) -> list[RemoteFile]:
+        """Fallback for servers without MLSD: names from NLST, directories found by trying CWD."""
+        files = []
+        for line in ftp.nlst(path):
+            name = line.rstrip("/").split("/")[-1]
+            if name in (".", "..", ""):
+                continue
+            full_path = os.path.join(path, name).replace("\\", "/")
+            try:
+                ftp.cwd(full_path)
+                is_dir = True
+            except ftplib.error_perm:
+                is_dir = False
+            files.append(RemoteFile(
+                name=name,
+                path=full_path,
+                size=0,
+                is_directory=is_dir,
+                modified=None
+            ))
+        return files
+
+    def stat(self, path: str) -> Optional[RemoteFile]:
+        if not self._pool:
+            return None
+        path = self._abspath(path)
+        with self._pool.lease() as ftp:
+            try:
+                ftp.voidcmd("TYPE I")
+                size = ftp.size(path)
+            except ftplib.error_perm:
+                return None
+            try:
+                mtime = self._parse_modify(ftp.sendcmd(f"MDTM {path}")[4:].strip())
+            except ftplib.error_perm:
+                mtime = None
+        return RemoteFile(
+            name=path.rstrip("/").split("/")[-1],
+            path=path,
+            size=size or 0,
+            is_directory=False,
+            mtime=mtime
+        )
+
+    def _stat_quietly(self, path: str) -> Optional[RemoteFile]:
+        try:
+            return self.stat(path)
+        except Exception:
+            return None
+
     def download_file(
         self,
         remote_path: str,
         local_path: str,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        resume: bool = False
     ) -> bool:
-        if not self._ftp:
+        if not self._pool:
             return False
+        remote_path = self._abspath(remote_path)
+        return self._retry_on_mismatch(
+            lambda resume: self._download(remote_path, local_path, progress_callback, resume), resume
+        )
+
+    def _download(self, remote_path: str, local_path: str, progress_callback, resume: bool) -> bool:
+        info = self.stat(remote_path)
+        size = info.size if info else 0
+        state = TransferResume(
+            self._resume,
+            self._resume.transfer_id("download", self._endpoint(), remote_path, local_path),
+            remote_fingerprint(info),
+            enabled=resume and os.path.exists(local_path),
+        )
+
+        ranges = state.saved_ranges
+        if ranges is None and size > self._segment_threshold and self._segments > 1 and not self._mode_z:
+            piece = -(-size // self._segments)
+            ranges = split_ranges(0, size, min(piece, self._segment_size or piece))
+            with open(local_path, "wb") as f:
+                f.truncate(size)
+        tracker = RangeTracker(ranges) if ranges is not None else None
+        offset = os.path.getsize(local_path) if state.resumable and tracker is None else 0
+        if offset > size:
+            offset = 0
+        # Segmentler sırasız gelir; onları bitince dosyadan özetleriz
+        hasher = self._new_hasher() if tracker is None else None
+        if hasher and offset:
+            hasher.seed(local_path, offset)
 
         try:
-            size = self._ftp.size(remote_path)
-        except Exception:
-            size = 0
+            state.begin(ranges)
+            if tracker is not None:
+                self._download_segments(remote_path, local_path, size, tracker, progress_callback)
+            else:
+                with self._pool.lease() as ftp:
+                    self._download_stream(ftp, remote_path, local_path, size, offset, progress_callback, hasher)
+        except BaseException:
+            state.fail(ranges=tracker.remaining() if tracker else None)
+            raise
+        state.done()
+        self._verify_remote(remote_path, local_path, hasher)
+        return True
 
-        downloaded = [0]
+    def _download_stream(
+        self, ftp: ftplib.FTP, remote_path: str, local_path: str, size: int, offset: int, progress_callback,
+        hasher: Optional[StreamHasher] = None
+    ) -> None:
+        """Sequential RETR, continuing with REST when offset > 0."""
+        downloaded = [offset]
 
         def callback(data: bytes):
             downloaded[0] += len(data)
             if progress_callback and size > 0:
                 progress_callback(downloaded[0], size)
 
-        with open(local_path, "wb") as f:
+        with open(local_path, "ab" if offset else "wb", buffering=0) as f:
             def write_and_cb(d):
-                f.write(d)
+                write_all(f, d)
+                if hasher:
+                    hasher.update(d)
                 if progress_callback:
                     callback(d)
-            self._ftp.retrbinary(f"RETR {remote_path}", write_and_cb)
-        return True
+            ftp.voidcmd("TYPE I")
+            inflate = zlib.decompressobj() if self._set_mode(ftp, self._compression) else None
+
+            # retrbinary her 8 KB için yeni bir bytes üretir; tek tamponla kendimiz okuyoruz
+            with ftp.transfercmd(f"RETR {remote_path}", offset or None) as conn, self.buffers.lease() as buf:
+                while True:
+                    n = conn.recv_into(buf)
+                    if not n:
+                        break
+                    # Hız sınırı hat üstündeki (sıkıştırılmış) baytlara uygulanır
+                    self._throttle(n)
+                    write_and_cb(inflate.decompress(buf[:n]) if inflate else buf[:n])
+                if hasattr(conn, "unwrap"):
+                    conn.unwrap()
+            ftp.voidresp()
+            if inflate:
+                write_and_cb(inflate.flush())
+
+    def _download_segments(
+        self, remote_path: str, local_path: str, size: int, tracker: RangeTracker, progress_callback
+    ) -> None:
+        """Fetch byte ranges on separate sessions, each into its region of the local file."""
+        ranges = [tuple(r) for r in tracker.remaining()]
+        missing = sum(end + 1 - start for start, end in ranges)
+        progress = SharedProgress(size, progress_callback, done=size - missing)
+
+        def fetch(rng: tuple[int, int], abort: threading.Event):
+            start, end = rng
+            remaining = end + 1 - start
+            try:
+                with self._pool.lease() as ftp, open(local_path, "r+b", buffering=0) as f, self.buffers.lease() as buf:
+                    f.seek(start)
+                    self._set_mode(ftp, False)
+                    ftp.voidcmd("TYPE I")
+                    conn = ftp.transfercmd(f"RETR {remote_path}", rest=start)
+                    try:
+                        while remaining > 0 and not abort.is_set():
+                            n = conn.recv_into(buf, min(len(buf), remaining))
+                            if not n:
+                                break
+                            self._throttle(n)
+                            write_all(f, buf[:n])
+                            remaining -= n
+                            tracker.advance(rng, n)
+                            progress.add(n)
+                    finally:
+                        conn.close()
+                    # RETR'ı dosya sonundan önce kestiysek sunucu 426, 226 ya da ikisini birden, bazen
+                    # geç bir 451 gönderir; kaç cevap geleceği belli olmadığından oturum havuza dönmez
+                    if end + 1 < size or remaining > 0 or abort.is_set():
+                        raise _SessionSpoiled()
+                    try:
+                        ftp.voidresp()
+                    except (ftplib.error_temp, ftplib.error_perm):
+                        raise _SessionSpoiled()
+            except _SessionSpoiled:
+                pass
+            if remaining > 0 and not abort.is_set():
+                raise IOError(f"Segment eksik indi: {start}-{end}")
+
+        run_parallel(fetch, ranges, self._segments)
 
     def upload_file(
         self,
         local_path: str,
         remote_path: str,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        resume: bool = False
     ) -> bool:
-        if not self._ftp:
+        if not self._pool:
             return False
+        remote_path = self._abspath(remote_path)
+        return self._retry_on_mismatch(
+            lambda resume: self._upload(local_path, remote_path, progress_callback, resume), resume
+        )
 
+    def _upload(self, local_path: str, remote_path: str, progress_callback, resume: bool) -> bool:
         size = os.path.getsize(local_path)
-        uploaded = [0]
+        state = TransferResume(
+            self._resume,
+            self._resume.transfer_id("upload", self._endpoint(), remote_path, local_path),
+            local_fingerprint(local_path),
+            enabled=resume,
+        )
+        offset = 0
+        if state.resumable and state.saved_target is not None:
+            current = self._stat_quietly(remote_path)
+            if current is not None and remote_fingerprint(current) == state.saved_target and current.size <= size:
+                offset = current.size
+
+        uploaded = [offset]
+        hasher = self._new_hasher()
+        if hasher and offset:
+            hasher.seed(local_path, offset)
 
         def callback(data: bytes):
             uploaded[0] += len(data)
+            if hasher:
+                hasher.update(data)
             if progress_callback:
                 progress_callback(uploaded[0], size)
 
-        with open(local_path, "rb") as f:
-            self._ftp.storbinary(
-                f"STOR {remote_path}",
-                f,
-                blocksize=8192,
-                callback=callback if progress_callback else None
-            )
+        try:
+            state.begin()
+            with open(local_path, "rb", buffering=0) as f, self._pool.lease() as ftp:
+                cb = callback if progress_callback or hasher else None
+                if offset:
+                    f.seek(offset)
+                    try:
+                        self._store(ftp, f"STOR {remote_path}", f, cb, rest=offset)
+                    except (ftplib.error_perm, ftplib.error_reply):
+                        # REST + STOR desteklenmiyorsa APPE ile sona ekle
+                        if hasher and hasher.position != offset:
+                            hasher.broken = True
+                        f.seek(offset)
+                        self._store(ftp, f"APPE {remote_path}", f, cb)
+                else:
+                    self._store(ftp, f"STOR {remote_path}", f, cb)
+        except BaseException:
+            state.fail(target=remote_fingerprint(self._stat_quietly(remote_path)))
+            raise
+        finally:
+            self.invalidate_listing(remote_path)
+        state.done()
+        self._verify_remote(remote_path, local_path, hasher)
         return True
 
+    def _store(self, ftp: ftplib.FTP, cmd: str, f, callback, rest: Optional[int] = None) -> str:
+        """
+        storbinary that reads pooled blocks with readinto, waits for the rate
+        limiter before every block and deflates the data channel when the
+        session is in MODE Z. callback gets a view that is reused afterwards.
+        """
+        deflate = zlib.compressobj() if self._set_mode(ftp, self._compression) else None
+        ftp.voidcmd("TYPE I")
+        with ftp.transfercmd(cmd, rest) as conn, self.buffers.lease() as buf:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                data = buf[:n]
+                wire = deflate.compress(data) if deflate else data
+                self._throttle(len(wire))
+                conn.sendall(wire)
+                if callback:
+                    callback(data)
+            if deflate:
+                conn.sendall(deflate.flush())
+            if hasattr(conn, "unwrap"):
+                conn.unwrap()
+        return ftp.voidresp()
+
     def delete(self, path: str) -> bool:
-        if not self._ftp:
+        if not self._pool:
             return False
+        path = self._abspath(path)
         try:
-            try:
-                self._ftp.delete(path)
-            except ftplib.error_perm:
-                self._ftp.rmd(path)
+            with self._pool.lease() as ftp:
+                try:
+                    ftp.delete(path)
+                except ftplib.error_perm:
+                    ftp.rmd(path)
+            self.invalidate_listing(path)
             return True
         except Exception:
             return False
 
+    def _remove(self, path: str, is_directory: bool) -> None:
+        if not self._pool:
+            raise RuntimeError("Bağlantı yok")
+        with self._pool.lease() as ftp:
+            if is_directory:
+                ftp.rmd(self._abspath(path))
+            else:
+                ftp.delete(self._abspath(path))
+
+    def set_mtime(self, path: str, mtime: float) -> bool:
+        if not self._pool or not self._mfmt:
+            return False
+        stamp = time.strftime("%Y%m%d%H%M%S", time.gmtime(mtime))
+        try:
+            with self._pool.lease() as ftp:
+                ftp.sendcmd(f"MFMT {stamp} {self._abspath(path)}")
+        except ftplib.error_perm as e:
+            # 500/502: sunucu MFMT bilmiyor, bir daha denenmez; 550 gibi dosya hataları geçicidir
+            if str(e)[:3] in ("500", "502"):
+                self._mfmt = False
+            return False
+        except ftplib.all_errors:
+            return False
+        self.invalidate_listing(path)
+        return True
+
     def create_directory(self, path: str) -> bool:
-        if not self._ftp:
+        if not self._pool:
             return False
         try:
-            self._ftp.mkd(path)
+            with self._pool.lease() as ftp:
+                ftp.mkd(self._abspath(path))
+            self.invalidate_listing(path)
             return True
         except Exception:
             return False
 
     def get_current_path(self) -> str:
-        if self._ftp:
-            try:
-                self._current_path = self._ftp.pwd()
-            except Exception:
-                pass
         return self._current_path
@@ -0,0 +1,79 @@
+"""In-memory cache of directory listings."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class ListingCache:
+    """
+    Bounded LRU of directory listings.
+
+    An entry younger than ttl is fresh. Between ttl and max_stale it is still
+    served, but the caller should refresh it in the background
+    (stale-while-revalidate); older entries are treated as missing. Every
+    invalidate() bumps a per-key generation so a refresh that was already in
+    flight cannot put back a listing from before the change.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 30.0, max_stale: float = 300.0):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl = ttl
+        self.max_stale = max(ttl, max_stale)
+        self._entries: "OrderedDict[Hashable, tuple[list, float]]" = OrderedDict()
+        self._generations: dict[Hashable, int] = {}
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> tuple[Optional[list], bool]:
+        """Return (items, fresh). items is None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            items, stamp = entry
+            age = time.monotonic() - stamp
+            if age > self.max_stale:
+                del self._entries[key]
+                return None, False
+            self._entries.move_to_end(key)
+            return items, age <= self.ttl
+
+    def generation(self, key: Hashable) -> int:
+        with self._lock:
+            return self._generations.get(key, 0)
+
+    def put(self, key: Hashable, items: list, generation: Optional[int] = None) -> bool:
+        """Store a listing unless the key was invalidated after generation was read."""
+        with self._lock:
+            if generation is not None and self._generations.get(key, 0) != generation:
+                return False
+            self._entries[key] = (items, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in self._entries:
+                self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.clear()
+
+    def begin_refresh(self, key: Hashable) -> bool:
+        """Claim the background refresh of key; False if one is already running."""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key: Hashable) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
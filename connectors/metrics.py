@@ -0,0 +1,265 @@
+"""Per-operation connector metrics with JSON and Prometheus text export."""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from .state_store import STATE_ROOT
+
+
+DEFAULT_METRICS_DIR = os.path.join(STATE_ROOT, "metrics")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+THROUGHPUT_BUCKETS = tuple(float(2 ** n) for n in range(14, 33, 2))  # 16 KB/s … 4 GB/s
+
+# BaseConnector'da otomatik olarak ölçülen metotlar
+INSTRUMENTED = (
+    "connect", "disconnect", "list_directory", "iter_directory", "stat",
+    "download_file", "upload_file", "delete", "create_directory",
+)
+TRANSFERS = ("download_file", "upload_file")
+
+
+class Histogram:
+    """Fixed-bucket histogram in the Prometheus sense (cumulative on export)."""
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets + (float("inf"),), self.counts):
+            running += n
+            cumulative["+Inf" if bound == float("inf") else repr(bound)] = running
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of counters and histograms labelled by operation,
+    protocol and host.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[tuple, float] = {}
+        self._histograms: dict[tuple, Histogram] = {}
+        self.started = time.time()
+
+    def inc(self, name: str, labels: dict, value: float = 1) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: dict, value: float, buckets: tuple = LATENCY_BUCKETS) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = Histogram(buckets)
+            hist.observe(value)
+
+    def record(
+        self,
+        op: str,
+        protocol: str,
+        host: str,
+        seconds: float,
+        error: Optional[BaseException] = None,
+        nbytes: int = 0,
+        first_byte: Optional[float] = None,
+        throughput: Optional[float] = None,
+    ) -> None:
+        """Record one finished connector operation."""
+        labels = {"op": op, "protocol": protocol, "host": host}
+        self.inc("ducktransfer_operations_total", {**labels, "status": "error" if error else "ok"})
+        self.observe("ducktransfer_operation_duration_seconds", labels, seconds)
+        if error is not None:
+            self.inc("ducktransfer_errors_total", {**labels, "error": type(error).__name__})
+        if nbytes:
+            self.inc("ducktransfer_bytes_total", labels, nbytes)
+        if first_byte is not None:
+            self.observe("ducktransfer_first_byte_seconds", labels, first_byte)
+        if throughput:
+            self.observe("ducktransfer_throughput_bytes_per_second", labels, throughput, THROUGHPUT_BUCKETS)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+            histograms = [
+                {"name": name, "labels": dict(labels), **hist.to_dict()}
+                for (name, labels), hist in sorted(self._histograms.items())
+            ]
+        return {"started": self.started, "time": time.time(), "counters": counters, "histograms": histograms}
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        snap = self.snapshot()
+        lines = []
+        typed = set()
+
+        def label_str(labels: dict) -> str:
+            if not labels:
+                return ""
+            parts = []
+            for k, v in labels.items():
+                v = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                parts.append(f'{k}="{v}"')
+            return "{" + ",".join(parts) + "}"
+
+        for c in snap["counters"]:
+            if c["name"] not in typed:
+                typed.add(c["name"])
+                lines.append(f"# TYPE {c['name']} counter")
+            lines.append(f"{c['name']}{label_str(c['labels'])} {c['value']:g}")
+        for h in snap["histograms"]:
+            if h["name"] not in typed:
+                typed.add(h["name"])
+                lines.append(f"# TYPE {h['name']} histogram")
+            for le, n in h["buckets"].items():
+                lines.append(f"{h['name']}_bucket{label_str({**h['labels'], 'le': le})} {n}")
+            lines.append(f"{h['name']}_sum{label_str(h['labels'])} {h['sum']:g}")
+            lines.append(f"{h['name']}_count{label_str(h['labels'])} {h['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_files(self, directory: str = DEFAULT_METRICS_DIR) -> None:
+        """Write metrics.json and metrics.prom (node_exporter textfile format) atomically."""
+        os.makedirs(directory, exist_ok=True)
+        for name, text in (("metrics.json", self.to_json()), ("metrics.prom", self.to_prometheus())):
+            path = os.path.join(directory, name)
+            with open(path + ".tmp", "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(path + ".tmp", path)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started = time.time()
+
+
+METRICS = MetricsRegistry()
+
+_local = threading.local()
+
+
+def _labels(connector) -> tuple[str, str]:
+    """(protocol, host) taken from the connector's endpoint, without credentials."""
+    try:
+        endpoint = connector._endpoint()
+    except Exception:
+        endpoint = ""
+    if "://" not in endpoint:
+        return type(connector).__name__.replace("Connector", "").lower(), ""
+    scheme, rest = endpoint.split("://", 1)
+    return scheme, rest.rsplit("@", 1)[-1]
+
+
+def instrument(op: str, func: Callable) -> Callable:
+    """
+    Wrap a connector method so every top-level call is recorded in
+    connector.metrics. Calls made from inside another instrumented call on
+    the same thread (list_directory → iter_directory, download_file → stat)
+    are not counted twice.
+    """
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def gen_wrapper(self, *args, **kwargs):
+            if getattr(_local, "depth", 0):
+                yield from func(self, *args, **kwargs)
+                return
+            start = time.monotonic()
+            first, error = None, None
+            it = func(self, *args, **kwargs)
+            try:
+                while True:
+                    # Sadece üretecin kendi adımları iç içe sayılır, tüketicinin kodu değil
+                    _local.depth = 1
+                    try:
+                        batch = next(it)
+                    except StopIteration:
+                        break
+                    finally:
+                        _local.depth = 0
+                    if first is None:
+                        first = time.monotonic() - start
+                    yield batch
+            except GeneratorExit:
+                raise
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                it.close()
+                protocol, host = _labels(self)
+                self.metrics.record(op, protocol, host, time.monotonic() - start, error, first_byte=first)
+        return gen_wrapper
+
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if getattr(_local, "depth", 0):
+            return func(self, *args, **kwargs)
+
+        start = time.monotonic()
+        progress = {"first": None, "first_at": None, "first_value": 0, "last": 0, "last_at": None}
+        bound = None
+        if op in TRANSFERS:
+            bound = inspect.signature(func).bind(self, *args, **kwargs)
+            user_callback = bound.arguments.get("progress_callback")
+
+            def callback(current, total):
+                now = time.monotonic()
+                if progress["first"] is None:
+                    progress["first"], progress["first_at"], progress["first_value"] = now - start, now, current
+                progress["last"], progress["last_at"] = current, now
+                if user_callback:
+                    user_callback(current, total)
+
+            bound.arguments["progress_callback"] = callback
+            args, kwargs = bound.args[1:], bound.kwargs
+
+        _local.depth = 1
+        error = None
+        try:
+            return func(self, *args, **kwargs)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            _local.depth = 0
+            protocol, host = _labels(self)
+            nbytes, throughput = 0, None
+            if progress["first_at"] is not None:
+                # Devam eden transferlerde ilk bildirilen konum zaten karşıda olan kısımdır
+                resumed = bound.arguments.get("resume", False)
+                nbytes = progress["last"] - (progress["first_value"] if resumed else 0)
+                span = progress["last_at"] - progress["first_at"]
+                if span > 0:
+                    throughput = (progress["last"] - progress["first_value"]) / span
+            self.metrics.record(
+                op, protocol, host, time.monotonic() - start, error,
+                nbytes=nbytes, first_byte=progress["first"], throughput=throughput,
+            )
+    return wrapper
@@ -0,0 +1,23 @@
+"""Persisted state of in-progress S3 multipart uploads."""
+
+import hashlib
+import os
+
+from .state_store import STATE_ROOT, JSONStateStore
+
+
+DEFAULT_STATE_DIR = os.path.join(STATE_ROOT, "multipart")
+
+
+class MultipartStateStore(JSONStateStore):
+    """Holds the UploadId and the ETag of every part that has been sent."""
+
+    def __init__(self, directory: str = DEFAULT_STATE_DIR):
+        super().__init__(directory)
+
+    @staticmethod
+    def state_id(bucket: str, key: str, local_path: str, part_size: int) -> str:
+        """Identify an upload by its target and the exact local file version."""
+        st = os.stat(local_path)
+        raw = f"{bucket}\0{key}\0{os.path.abspath(local_path)}\0{st.st_size}\0{st.st_mtime_ns}\0{part_size}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
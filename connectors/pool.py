@@ -0,0 +1,158 @@
+"""Thread-safe pool of reusable protocol sessions."""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+
+class SessionPool:
+    """
+    Leases logged-in sessions to one operation at a time.
+
+    Sessions idle for longer than idle_timeout are closed: on release while
+    the pool is busy (one is kept), and by a background reaper once it goes
+    quiet, so an unused pool does not hold its sockets open until the server
+    drops them. Sessions idle for longer than validate_after are checked with
+    validate() before being handed out again. A session is dropped when the
+    operation using it raises anything that is not listed in recoverable.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: int = 4,
+        close: Optional[Callable[[Any], None]] = None,
+        validate: Optional[Callable[[Any], None]] = None,
+        idle_timeout: float = 120.0,
+        validate_after: float = 15.0,
+        recoverable: tuple = (),
+    ):
+        self._factory = factory
+        self.max_size = max(1, int(max_size))
+        self._close = close
+        self._validate = validate
+        self.idle_timeout = idle_timeout
+        self.validate_after = validate_after
+        self.recoverable = recoverable
+        self._idle: list[tuple[Any, float]] = []
+        self._created = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stop = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        session = self._acquire()
+        try:
+            yield session
+        except self.recoverable:
+            self._release(session)
+            raise
+        except BaseException:
+            self._discard(session)
+            raise
+        else:
+            self._release(session)
+
+    def _acquire(self) -> Any:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise ConnectionError("Bağlantı kapatıldı")
+                if self._idle:
+                    session, since = self._idle.pop()
+                    break
+                if self._created < self.max_size:
+                    self._created += 1
+                    session, since = None, None
+                    break
+                self._cond.wait()
+
+        if session is not None and self._validate and time.monotonic() - since > self.validate_after:
+            try:
+                self._validate(session)
+            except Exception:
+                self._discard(session)
+                with self._cond:
+                    self._created += 1
+                session = None
+
+        if session is None:
+            try:
+                session = self._factory()
+            except BaseException:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+        return session
+
+    def _release(self, session: Any) -> None:
+        expired = []
+        with self._cond:
+            if self._closed:
+                expired.append(session)
+                self._created -= 1
+            else:
+                now = time.monotonic()
+                self._idle.append((session, now))
+                while len(self._idle) > 1 and now - self._idle[0][1] > self.idle_timeout:
+                    expired.append(self._idle.pop(0)[0])
+                    self._created -= 1
+            self._cond.notify()
+            reaper = None
+            if not self._closed and self._reaper is None:
+                reaper = self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+        if reaper is not None:
+            reaper.start()
+        for s in expired:
+            self._close_quietly(s)
+
+    def _reap_loop(self) -> None:
+        # Boşta oturum kalmayınca biter; sonraki iade yeniden başlatır
+        while not self._stop.wait(max(1.0, self.idle_timeout / 2)):
+            self.reap_idle()
+            with self._cond:
+                if self._closed or not self._idle:
+                    self._reaper = None
+                    return
+
+    def _discard(self, session: Any) -> None:
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+        self._close_quietly(session)
+
+    def _close_quietly(self, session: Any) -> None:
+        if self._close:
+            try:
+                self._close(session)
+            except Exception:
+                pass
+
+    def reap_idle(self) -> int:
+        """Close sessions idle for longer than idle_timeout. Returns how many were closed."""
+        now = time.monotonic()
+        with self._cond:
+            keep = [(s, t) for s, t in self._idle if now - t <= self.idle_timeout]
+            expired = [s for s, t in self._idle if now - t > self.idle_timeout]
+            self._idle = keep
+            self._created -= len(expired)
+            self._cond.notify_all()
+        for s in expired:
+            self._close_quietly(s)
+        return len(expired)
+
+    def close(self) -> None:
+        """Close idle sessions; leased ones are closed when they come back."""
+        self._stop.set()
+        with self._cond:
+            self._closed = True
+            idle = [s for s, _ in self._idle]
+            self._idle = []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for s in idle:
+            self._close_quietly(s)
@@ -0,0 +1,193 @@
+"""Shared bandwidth limiting for every connector's data loops."""
+
+import contextvars
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+# Öncelik sınıfları: tek tek başlatılan işler toplu (klasör, senkron) işlerden önce gider
+INTERACTIVE = "interactive"
+BULK = "bulk"
+PRIORITIES = (INTERACTIVE, BULK)
+# Her iki sınıf da beklerken bant genişliği bu oranda paylaşılır; toplu işler aç kalmaz
+WEIGHTS = {INTERACTIVE: 4.0, BULK: 1.0}
+
+# Çalışan aktarımın önceliği; TransferQueue her iş için ayarlar, run_parallel parçalara taşır
+PRIORITY: contextvars.ContextVar[str] = contextvars.ContextVar("ducktransfer_priority", default=BULK)
+
+QUANTUM = 64 * 1024
+# Bu kadar süre beklemeyen sınıf geri geldiğinde biriktirdiği payı kaybeder
+IDLE_RESET = 0.5
+
+
+class TokenBucket:
+    """
+    rate bytes per second with room for burst_seconds worth of tokens
+    (never less than one quantum). rate 0 means unlimited.
+    """
+
+    def __init__(self, rate: float = 0.0, burst_seconds: float = 0.25):
+        self.rate = max(0.0, float(rate))
+        self.burst_seconds = burst_seconds
+        self.tokens = self.capacity
+        self._stamp = time.monotonic()
+
+    @property
+    def capacity(self) -> float:
+        return max(self.rate * self.burst_seconds, QUANTUM)
+
+    def refill(self, now: float) -> None:
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def wait_time(self, n: int) -> float:
+        """Seconds until n tokens are available; 0 when they are (or the bucket is unlimited)."""
+        if self.rate <= 0 or self.tokens >= n:
+            return 0.0
+        return (n - self.tokens) / self.rate
+
+    def take(self, n: int) -> None:
+        if self.rate > 0:
+            self.tokens -= n
+
+    def set_rate(self, rate: float, now: float) -> None:
+        self.refill(now)
+        self.rate = max(0.0, float(rate))
+        self.tokens = min(self.tokens, self.capacity)
+
+
+class _Waiter:
+    __slots__ = ("n", "key", "priority")
+
+    def __init__(self, n: int, key: str, priority: str):
+        self.n = n
+        self.key = key
+        self.priority = priority
+
+
+class RateLimiter:
+    """
+    A global token bucket plus one bucket per connection key.
+
+    acquire(n) blocks until both the global bucket and the caller's
+    connection bucket allow n more bytes. Requests are cut into QUANTUM
+    sized pieces and every piece queues again behind the others, so jobs
+    sharing a cap take turns instead of the fastest thread winning. When
+    both priority classes are waiting, bytes are split by WEIGHTS (weighted
+    fair queuing on bytes served). A waiter held back only by its own
+    connection cap does not block other connections. Caps can be changed
+    at any time; waiting threads pick up the new rate immediately.
+    """
+
+    def __init__(self, rate: float = 0.0):
+        self._cond = threading.Condition()
+        self._global = TokenBucket(rate)
+        self._buckets: dict[str, TokenBucket] = {}
+        self._queues: dict[str, deque] = {p: deque() for p in PRIORITIES}
+        self._served = {p: 0.0 for p in PRIORITIES}
+        self._idle_since = {p: 0.0 for p in PRIORITIES}
+
+    @property
+    def rate(self) -> float:
+        return self._global.rate
+
+    def set_rate(self, rate: float) -> None:
+        """Global cap in bytes per second for all connections together; 0 removes it."""
+        with self._cond:
+            self._global.set_rate(rate, time.monotonic())
+            self._cond.notify_all()
+
+    def connection_rate(self, key: str) -> float:
+        bucket = self._buckets.get(key)
+        return bucket.rate if bucket else 0.0
+
+    def set_connection_rate(self, key: str, rate: float) -> None:
+        """Cap in bytes per second for one connection; 0 removes it."""
+        with self._cond:
+            if rate > 0:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    self._buckets[key] = TokenBucket(rate)
+                else:
+                    bucket.set_rate(rate, time.monotonic())
+            else:
+                self._buckets.pop(key, None)
+            self._cond.notify_all()
+
+    def limited(self, key: str = "") -> bool:
+        return self._global.rate > 0 or key in self._buckets
+
+    def acquire(self, n: int, key: str = "", priority: Optional[str] = None) -> None:
+        if n <= 0 or not self.limited(key):
+            return
+        if priority not in self._queues:
+            priority = PRIORITY.get()
+        while n > 0:
+            chunk = min(n, QUANTUM)
+            self._acquire(chunk, key, priority)
+            n -= chunk
+
+    def _acquire(self, n: int, key: str, priority: str) -> None:
+        with self._cond:
+            waiter = _Waiter(n, key, priority)
+            queue = self._queues[priority]
+            if not queue and time.monotonic() - self._idle_since[priority] > IDLE_RESET:
+                # Uzun süre boşta kalan sınıf biriktirdiği payla öne geçmesin
+                active = [self._served[p] for p, q in self._queues.items() if q]
+                if active:
+                    self._served[priority] = max(self._served[priority], min(active))
+            queue.append(waiter)
+            try:
+                while True:
+                    chosen, delay = self._pick(time.monotonic())
+                    if chosen is waiter:
+                        self._global.take(n)
+                        bucket = self._buckets.get(key)
+                        if bucket:
+                            bucket.take(n)
+                        queue.remove(waiter)
+                        if not queue:
+                            self._idle_since[priority] = time.monotonic()
+                        self._served[priority] += n / WEIGHTS[priority]
+                        self._cond.notify_all()
+                        return
+                    if chosen is not None:
+                        # Sıra başka bir bekleyende; onu uyandır, o alınca bizi uyandırır
+                        self._cond.notify_all()
+                        delay = 0.05
+                    self._cond.wait(delay)
+            except BaseException:
+                if waiter in queue:
+                    queue.remove(waiter)
+                    if not queue:
+                        self._idle_since[priority] = time.monotonic()
+                self._cond.notify_all()
+                raise
+
+    def _pick(self, now: float) -> tuple[Optional[_Waiter], Optional[float]]:
+        """
+        The waiter to serve next, or (None, seconds to sleep). Classes are
+        visited by least weighted bytes served, waiters in arrival order.
+        """
+        self._global.refill(now)
+        for bucket in self._buckets.values():
+            bucket.refill(now)
+        delay = None
+        for priority in sorted((p for p in PRIORITIES if self._queues[p]), key=self._served.get):
+            for waiter in self._queues[priority]:
+                bucket = self._buckets.get(waiter.key)
+                wait = bucket.wait_time(waiter.n) if bucket else 0.0
+                if wait > 0:
+                    delay = wait if delay is None else min(delay, wait)
+                    continue
+                wait = self._global.wait_time(waiter.n)
+                if wait > 0:
+                    # Genel kova sıradakine ayrılır; küçük istekler araya girip onu aç bırakmasın
+                    return None, wait if delay is None else min(delay, wait)
+                return waiter, 0.0
+        return None, delay
+
+
+LIMITER = RateLimiter()
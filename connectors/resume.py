@@ -0,0 +1,87 @@
+"""Bookkeeping for resuming interrupted downloads and uploads."""
+
+import hashlib
+import os
+from typing import Optional
+
+from .base import RemoteFile
+from .state_store import STATE_ROOT, JSONStateStore
+
+
+DEFAULT_RESUME_DIR = os.path.join(STATE_ROOT, "resume")
+
+
+def remote_fingerprint(f: Optional[RemoteFile]) -> Optional[list]:
+    """What must stay the same on the server for a partial transfer to be continued."""
+    if f is None:
+        return None
+    return [f.size, f.mtime, f.etag]
+
+
+def local_fingerprint(path: str) -> list:
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+class ResumeStore(JSONStateStore):
+    """
+    Remembers each unfinished transfer: the fingerprint of the source it was
+    reading and, for segmented transfers, the byte ranges still missing.
+    Entries are removed as soon as the transfer completes.
+    """
+
+    def __init__(self, directory: str = DEFAULT_RESUME_DIR):
+        super().__init__(directory)
+
+    @staticmethod
+    def transfer_id(direction: str, endpoint: str, remote_path: str, local_path: str) -> str:
+        raw = f"{direction}\0{endpoint}\0{remote_path}\0{os.path.abspath(local_path)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class TransferResume:
+    """
+    Resume record of one transfer.
+
+    source is the fingerprint of what is being read; a saved record only
+    counts when it was made for the same source. ranges, when set, lists the
+    byte ranges of a segmented transfer that are still missing; target is
+    the fingerprint of the partial destination taken right after a failure.
+    """
+
+    def __init__(self, store: ResumeStore, transfer_id: str, source, enabled: bool = True):
+        self._store = store
+        self._id = transfer_id
+        self.source = source
+        record = store.load(transfer_id) if enabled and source is not None else None
+        self.record = record if record and record.get("source") == source else None
+
+    @property
+    def resumable(self) -> bool:
+        return self.record is not None
+
+    @property
+    def saved_ranges(self) -> Optional[list[tuple[int, int]]]:
+        if self.record and self.record.get("ranges") is not None:
+            return [tuple(r) for r in self.record["ranges"]]
+        return None
+
+    @property
+    def saved_target(self):
+        return self.record.get("target") if self.record else None
+
+    def begin(self, ranges=None) -> None:
+        self.record = {"source": self.source, "ranges": ranges, "target": None}
+        self._store.save(self._id, self.record)
+
+    def fail(self, ranges=None, target=None) -> None:
+        if self.record is None:
+            return
+        if ranges is not None:
+            self.record["ranges"] = ranges
+        self.record["target"] = target
+        self._store.save(self._id, self.record)
+
+    def done(self) -> None:
+        self._store.remove(self._id)
+        self.record = None
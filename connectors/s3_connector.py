@@ -1,22 +1,93 @@
 """Amazon S3 connector implementation."""
 
+import base64
+import hashlib
 import os
-from typing import Optional, Callable
+import threading
+import time
+from typing import Callable, Iterator, Optional
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
-from .base import BaseConnector, RemoteFile
+from .base import BaseConnector, RemoteFile, sort_listing
+from .buffers import write_all
+from .checksum import ChecksumMismatch, PartMD5, StreamHasher, available, b64, hash_file, multipart_etag
+from .multipart_state import DEFAULT_STATE_DIR, MultipartStateStore
+from .resume import DEFAULT_RESUME_DIR, ResumeStore, TransferResume, remote_fingerprint
+from .segments import RangeTracker, SharedProgress, run_parallel, split_ranges
+from .tree_delete import DELETE_WORKERS, DeleteResult, delete_batches
+
+MB = 1024 * 1024
+
+# HeadObject(ChecksumMode=ENABLED) alanları, tercih sırasıyla
+OBJECT_CHECKSUMS = (("ChecksumSHA256", "sha256"), ("ChecksumCRC32C", "crc32c"), ("ChecksumCRC32", "crc32"))
+# S3'ün Content-MD5 / x-amz-checksum tutmayan gövdeyi reddederken döndüğü kodlar
+DIGEST_ERRORS = ("BadDigest", "InvalidDigest", "XAmzContentSHA256Mismatch")
+# S3'ün (ve uyumlu servislerin) "yavaşla" yanıtları
+THROTTLE_CODES = ("SlowDown", "503", "ServiceUnavailable", "Throttling", "RequestLimitExceeded", "TooManyRequests")
+
+
+class _ThrottledReader:
+    """
+    Read-only file wrapper for put_object bodies: every read goes through
+    on_read(n) before it is returned, so the rate cap and progress follow
+    the bytes as botocore sends them. seek/tell pass through so botocore
+    can size the body and rewind it for a retry.
+    """
+
+    def __init__(self, f, on_read: Callable[[int], None]):
+        self._f = f
+        self._on_read = on_read
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        if data:
+            self._on_read(len(data))
+        return data
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        return self._f.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._f.tell()
 
 
 class S3Connector(BaseConnector):
-    """Amazon S3 connector."""
+    """
+    Amazon S3 connector.
+
+    A single boto3 client is shared by all threads; its urllib3 pool is sized
+    with max_pool_connections so concurrent jobs each get their own socket.
+    Objects larger than multipart_threshold are transferred in part_size
+    pieces, up to max_concurrency at a time. Multipart uploads record every
+    finished part under state_dir so a retried upload only sends what is
+    missing. endpoint_url points the client at an S3-compatible service
+    (MinIO, Ceph RGW, a local test server) instead of AWS.
+
+    With verify_checksums uploads carry Content-MD5 (and SHA-256 for single
+    PUTs) so S3 rejects a damaged body, and the returned ETags are checked.
+    Downloads are compared with the object's full checksum or its ETag; for
+    a multipart ETag ranges are aligned to the original part size so each
+    range's MD5 can be computed as it streams in.
+    """
+
+    needs_directories = False
 
     def __init__(self):
         self._s3 = None
         self._bucket: Optional[str] = None
         self._current_path = ""
         self._region = "us-east-1"
+        self._part_size = 8 * MB
+        self._multipart_threshold = 16 * MB
+        self._max_concurrency = 8
+        # İndirme aralığı boyutu; 0 ise parça boyutu
+        self._range_size = 0
+        self._state = MultipartStateStore()
+        self._resume = ResumeStore()
 
     def connect(
         self,
@@ -24,18 +95,41 @@ class S3Connector(BaseConnector):
         secret_key: str = "",
         region: str = "us-east-1",
         bucket: str = "",
+        max_pool_connections: int = 10,
+        part_size: int = 8 * MB,
+        multipart_threshold: int = 16 * MB,
+        max_concurrency: int = 8,
+        state_dir: str = DEFAULT_STATE_DIR,
+        resume_dir: str = DEFAULT_RESUME_DIR,
+        endpoint_url: str = "",
+        verify_checksums: bool = False,
         **kwargs
     ) -> bool:
+        self.verify_checksums = verify_checksums
+        # S3 parçaları en az 5 MB olmalı
+        self._part_size = max(5 * MB, int(part_size))
+        self._multipart_threshold = max(self._part_size, int(multipart_threshold))
+        self._max_concurrency = max(1, int(max_concurrency))
+        self._range_size = 0
+        self._state = MultipartStateStore(state_dir)
+        self._resume = ResumeStore(resume_dir)
         try:
+            config = Config(
+                max_pool_connections=max(1, int(max_pool_connections)),
+                tcp_keepalive=True,
+                retries={"max_attempts": 5, "mode": "adaptive"},
+            )
             if access_key and secret_key:
-                self._s3 = boto3.client(
-                    "s3",
+                session = boto3.session.Session(
                     aws_access_key_id=access_key,
                     aws_secret_access_key=secret_key,
                     region_name=region
                 )
             else:
-                self._s3 = boto3.client("s3", region_name=region)
+                session = boto3.session.Session(region_name=region)
+            self._s3 = session.client("s3", config=config, endpoint_url=endpoint_url or None)
+            self._s3.meta.events.register("after-call.s3", self._count_retries)
+            self._s3.meta.events.register("needs-retry.s3", self._count_slowdown)
 
             self._bucket = bucket
             self._region = region
@@ -51,6 +145,11 @@ class S3Connector(BaseConnector):
             raise ConnectionError(f"S3 bağlantı hatası: {str(e)}")
 
     def disconnect(self) -> None:
+        if self._s3:
+            try:
+                self._s3.close()
+            except Exception:
+                pass
         self._s3 = None
         self._bucket = None
         self._current_path = ""
@@ -58,22 +157,63 @@ class S3Connector(BaseConnector):
     def is_connected(self) -> bool:
         return self._s3 is not None and self._bucket is not None
 
+    def _endpoint(self) -> str:
+        return f"s3://{self._bucket}"
+
+    def _count_retries(self, parsed=None, **kwargs) -> None:
+        """botocore retries silently; surface them in the metrics."""
+        attempts = (parsed or {}).get("ResponseMetadata", {}).get("RetryAttempts", 0)
+        if attempts:
+            self.metrics.inc("ducktransfer_retries_total", {"protocol": "s3", "host": self._bucket or ""}, attempts)
+
+    def _count_slowdown(self, response=None, **kwargs) -> None:
+        """Count every SlowDown/503 answer, including the ones botocore retries away."""
+        if not response:
+            return
+        http, parsed = response
+        code = (parsed or {}).get("Error", {}).get("Code")
+        if code in THROTTLE_CODES or getattr(http, "status_code", None) == 503:
+            self._count_throttled()
+
+    def parallelism(self) -> tuple[int, int]:
+        return self._max_concurrency, self._range_size
+
+    def set_parallelism(self, segments: int, segment_size: int = 0) -> None:
+        # Yükleme parça boyutu değişmez: çok parçalı yüklemenin devam kaydı ona bağlı
+        self._max_concurrency = max(1, int(segments))
+        self._range_size = max(0, int(segment_size))
+
     def _normalize_path(self, path: str) -> str:
         path = path.strip("/")
         return path + "/" if path else ""
 
+    def _listing_key(self, path: str) -> str:
+        return self._normalize_path(path) if path else self._current_path
+
+    def _parent_keys(self, path: str) -> list[str]:
+        # Yeni bir anahtar üstteki her önekte yeni bir "klasör" olarak belirebilir
+        parts = path.strip("/").split("/")[:-1]
+        return ["/".join(parts[:i]) + "/" if i else "" for i in range(len(parts) + 1)]
+
     def list_directory(self, path: str = "/") -> list[RemoteFile]:
+        files = []
+        for batch in self.iter_directory(path):
+            files.extend(batch)
+        return sort_listing(files)
+
+    def iter_directory(self, path: str = "/", batch_size: int = 500) -> Iterator[list[RemoteFile]]:
+        """One batch per list_objects_v2 page (up to 1000 keys); batch_size is not used."""
         if not self._s3 or not self._bucket:
-            return []
+            return
 
         prefix = self._normalize_path(path) if path else self._current_path
 
         try:
             paginator = self._s3.get_paginator("list_objects_v2")
-            files = []
             seen_dirs = set()
 
             for page in paginator.paginate(Bucket=self._bucket, Prefix=prefix, Delimiter="/"):
+                files = []
                 for obj in page.get("CommonPrefixes", []):
                     dir_path = obj["Prefix"]
                     dir_name = dir_path.rstrip("/").split("/")[-1]
@@ -97,79 +237,552 @@ class S3Connector(BaseConnector):
                         path=key,
                         size=obj.get("Size", 0),
                         is_directory=False,
-                        modified=obj.get("LastModified", "").strftime("%Y-%m-%d %H:%M") if obj.get("LastModified") else None
+                        modified=obj.get("LastModified", "").strftime("%Y-%m-%d %H:%M") if obj.get("LastModified") else None,
+                        mtime=obj["LastModified"].timestamp() if obj.get("LastModified") else None,
+                        etag=obj.get("ETag")
                     ))
-
-            return sorted(files, key=lambda x: (not x.is_directory, x.name.lower()))
+                if files:
+                    yield files
         except ClientError as e:
             raise RuntimeError(f"S3 listeleme hatası: {e.response['Error']['Message']}")
 
+    def stat(self, path: str) -> Optional[RemoteFile]:
+        if not self._s3 or not self._bucket:
+            return None
+        try:
+            head = self._s3.head_object(Bucket=self._bucket, Key=path)
+        except ClientError as e:
+            if e.response["Error"].get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+        return RemoteFile(
+            name=path.rstrip("/").split("/")[-1],
+            path=path,
+            size=head["ContentLength"],
+            is_directory=False,
+            mtime=head["LastModified"].timestamp(),
+            etag=head["ETag"]
+        )
+
     def download_file(
         self,
         remote_path: str,
         local_path: str,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        resume: bool = False
     ) -> bool:
         if not self._s3 or not self._bucket:
             return False
 
         try:
-            response = self._s3.get_object(Bucket=self._bucket, Key=remote_path)
-            total_size = response["ContentLength"]
-            body = response["Body"]
-            downloaded = 0
+            return self._retry_on_mismatch(
+                lambda resume: self._download(remote_path, local_path, progress_callback, resume), resume
+            )
+        except ClientError as e:
+            if e.response["Error"].get("Code") in ("PreconditionFailed", "412"):
+                raise RuntimeError("İndirme hatası: nesne indirme sırasında değişti")
+            raise RuntimeError(f"İndirme hatası: {e.response['Error']['Message']}")
 
-            os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+    def _download(self, remote_path: str, local_path: str, progress_callback, resume: bool) -> bool:
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        transfer_id = self._resume.transfer_id("download", self._endpoint(), remote_path, local_path)
+        info = None
+        if resume and os.path.exists(local_path) and self._resume.load(transfer_id):
+            info = self.stat(remote_path)
+        state = TransferResume(self._resume, transfer_id, remote_fingerprint(info), enabled=info is not None)
+        check = self._download_check(remote_path) if self.verify_checksums else None
+
+        first = None
+        if state.resumable:
+            total_size, etag = info.size, info.etag
+            ranges = state.saved_ranges
+            sequential = ranges is None
+            if sequential:
+                offset = min(os.path.getsize(local_path), total_size)
+                ranges = [(offset, total_size - 1)] if offset < total_size else []
+        else:
+            # Çok parçalı ETag doğrulanacaksa aralıklar nesnenin kendi parçalarıyla çakışmalı
+            range_size = check["multipart"][1] if check and check["multipart"] else self._range_size or self._part_size
+            conditions = {"IfMatch": check["etag"]} if check else {}
+            # İlk parça tek istekle gelir; yanıt toplam boyutu ve ETag'i de verir
+            try:
+                first = self._s3.get_object(
+                    Bucket=self._bucket, Key=remote_path, Range=f"bytes=0-{range_size - 1}", **conditions
+                )
+                total_size = int(first["ContentRange"].rsplit("/", 1)[1])
+            except ClientError as e:
+                if e.response["Error"].get("Code") != "InvalidRange":
+                    raise
+                first = self._s3.get_object(Bucket=self._bucket, Key=remote_path, **conditions)
+                total_size = first["ContentLength"]
+            etag = first["ETag"]
+            first_len = first["ContentLength"]
+            state = TransferResume(
+                self._resume, transfer_id, [total_size, first["LastModified"].timestamp(), etag], enabled=False
+            )
 
+            sequential = total_size <= self._multipart_threshold
             with open(local_path, "wb") as f:
-                for chunk in body.iter_chunks(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if progress_callback:
-                            progress_callback(downloaded, total_size)
-            return True
-        except ClientError as e:
-            raise RuntimeError(f"İndirme hatası: {e.response['Error']['Message']}")
+                if not sequential:
+                    f.truncate(total_size)
+            ranges = [(0, first_len - 1)] if first_len else []
+            if sequential:
+                ranges += [(first_len, total_size - 1)] if first_len < total_size else []
+            else:
+                ranges += split_ranges(first_len, total_size, range_size)
+
+        # Baştan indirmede baytlar geçerken özetlenir; devam eden indirme dosyadan özetlenir
+        stream = part_md5 = None
+        hashers: dict = {}
+        if check and first is not None:
+            if sequential:
+                stream = StreamHasher([check["sum"][0]]) if check["sum"] else None
+                part_md5 = PartMD5(check["multipart"][1]) if check["multipart"] else None
+                feed = [h for h in (stream, part_md5) if h]
+                hashers = {rng: feed for rng in ranges}
+            elif check["multipart"]:
+                hashers = {rng: [hashlib.md5()] for rng in ranges}
+
+        tracker = RangeTracker(ranges)
+        try:
+            state.begin(None if sequential else ranges)
+            workers = 1 if sequential else self._max_concurrency
+            self._download_ranges(
+                remote_path, local_path, etag, total_size, tracker, workers, progress_callback, first, hashers
+            )
+        except BaseException:
+            state.fail(ranges=None if sequential else tracker.remaining())
+            raise
+        state.done()
+
+        if os.path.getsize(local_path) != total_size:
+            raise RuntimeError("İndirilen dosya boyutu uyuşmuyor")
+        if check:
+            parts = None
+            if part_md5:
+                parts = part_md5.finish()
+            elif hashers and not sequential:
+                parts = [hashers[rng][0].digest() for rng in sorted(hashers)]
+            self._verify_download(remote_path, local_path, total_size, check, stream, parts)
+        return True
+
+    @staticmethod
+    def _etag_opaque(resp: dict) -> bool:
+        """SSE-KMS and SSE-C objects get ETags that are not the MD5 of their data."""
+        return resp.get("ServerSideEncryption") == "aws:kms" or bool(resp.get("SSECustomerAlgorithm"))
+
+    def _download_check(self, remote_path: str) -> dict:
+        """
+        What S3 vouches for about an object: its ETag (to pin the version),
+        one full-object checksum as (algorithm, hex) and, for a multipart
+        ETag, (ETag, part size).
+        """
+        head = self._s3.head_object(Bucket=self._bucket, Key=remote_path, ChecksumMode="ENABLED")
+        etag = head["ETag"].strip('"')
+        opaque = self._etag_opaque(head)
+        checksum = None
+        if head.get("ChecksumType", "FULL_OBJECT") == "FULL_OBJECT":
+            for field, algorithm in OBJECT_CHECKSUMS:
+                value = head.get(field)
+                # "-N" ile biten değer parçaların özetinden türetilmiş, dosyanınki değil
+                if value and "-" not in value and available(algorithm):
+                    checksum = (algorithm, base64.b64decode(value).hex())
+                    break
+        if checksum is None and not opaque and "-" not in etag:
+            checksum = ("md5", etag)
+        multipart = None
+        if not opaque and "-" in etag:
+            part = self._s3.head_object(Bucket=self._bucket, Key=remote_path, PartNumber=1, IfMatch=head["ETag"])
+            multipart = (etag, part["ContentLength"])
+        return {"etag": head["ETag"], "sum": checksum, "multipart": multipart}
+
+    def _verify_download(
+        self, remote_path: str, local_path: str, size: int, check: dict,
+        stream: Optional[StreamHasher], parts: Optional[list[bytes]]
+    ) -> None:
+        """Compare with what _download_check found, reading the file only for what was not hashed in flight."""
+        if check["multipart"]:
+            etag, part_size = check["multipart"]
+            if parts is None:
+                parts = [
+                    hash_file(local_path, ["md5"], start, part_size).digest("md5")
+                    for start in range(0, size, part_size)
+                ]
+            self._check_digest(remote_path, etag, multipart_etag(parts))
+        elif check["sum"]:
+            algorithm, expected = check["sum"]
+            if stream is None or stream.broken:
+                stream = hash_file(local_path, [algorithm])
+            self._check_digest(remote_path, expected, stream.hexdigest(algorithm))
+        else:
+            self._count_checksum("unavailable")
+
+    def _write_body(
+        self, body, f, on_data: Callable[[int], None], abort: Optional[threading.Event] = None, hashers=()
+    ) -> None:
+        """Stream a response body into f through one pooled buffer, block by block."""
+        # StreamingBody.readinto botocore 1.39'da geldi; eskilerde read ile kopyalanır
+        readinto = getattr(body, "readinto", None)
+        with self.buffers.lease() as buf:
+            while True:
+                if abort is not None and abort.is_set():
+                    body.close()
+                    return
+                if readinto is not None:
+                    n = readinto(buf)
+                else:
+                    chunk = body.read(len(buf))
+                    n = len(chunk)
+                    buf[:n] = chunk
+                if not n:
+                    break
+                data = buf[:n]
+                self._throttle(n)
+                write_all(f, data)
+                for h in hashers:
+                    h.update(data)
+                on_data(n)
+
+    def _download_ranges(
+        self,
+        remote_path: str,
+        local_path: str,
+        etag: str,
+        total_size: int,
+        tracker: RangeTracker,
+        workers: int,
+        progress_callback,
+        first: Optional[dict] = None,
+        hashers: Optional[dict] = None,
+    ) -> None:
+        """
+        Fetch byte ranges and write each one at its offset. first is an
+        already opened response for the range starting at 0. With one worker
+        ranges are fetched in order, so the local file is always a valid prefix.
+        hashers maps a range to the hashes its bytes are fed into.
+        """
+        ranges = [tuple(r) for r in tracker.remaining()]
+        missing = sum(end + 1 - start for start, end in ranges)
+        progress = SharedProgress(total_size, progress_callback, done=total_size - missing)
+
+        def fetch(rng: tuple[int, int], abort: Optional[threading.Event] = None):
+            start, end = rng
+            if first is not None and start == 0:
+                resp = first
+            else:
+                resp = self._s3.get_object(
+                    Bucket=self._bucket, Key=remote_path, Range=f"bytes={start}-{end}", IfMatch=etag
+                )
+                if resp["ETag"] != etag or int(resp["ContentRange"].rsplit("/", 1)[1]) != total_size:
+                    raise RuntimeError("İndirme hatası: nesne indirme sırasında değişti")
+
+            def on_data(n: int):
+                tracker.advance(rng, n)
+                progress.add(n)
+
+            with open(local_path, "r+b", buffering=0) as f:
+                f.seek(start)
+                self._write_body(resp["Body"], f, on_data, abort, (hashers or {}).get(rng, ()))
+
+        if workers == 1:
+            for rng in ranges:
+                fetch(rng)
+        else:
+            run_parallel(fetch, ranges, workers)
 
     def upload_file(
         self,
         local_path: str,
         remote_path: str,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        resume: bool = False
     ) -> bool:
         if not self._s3 or not self._bucket:
             return False
 
+        try:
+            return self._retry_on_mismatch(
+                lambda resume: self._upload(local_path, remote_path, progress_callback, resume), resume
+            )
+        except ClientError as e:
+            raise RuntimeError(f"Yükleme hatası: {e.response['Error']['Message']}")
+        finally:
+            self.invalidate_listing(remote_path)
+
+    def _upload(self, local_path: str, remote_path: str, progress_callback, resume: bool) -> bool:
         try:
             size = os.path.getsize(local_path)
+            if size > self._multipart_threshold:
+                self._multipart_upload(local_path, remote_path, size, progress_callback, resume)
+                return True
+            if self.verify_checksums:
+                self._put_verified(local_path, remote_path, size, progress_callback)
+                return True
+
+            uploaded = [0]
 
             def upload_callback(bytes_transferred):
+                # boto3 bir sonraki bloğu bu geri çağrı dönünce okur; beklemek hızı sınırlar
+                self._throttle(bytes_transferred)
+                uploaded[0] += bytes_transferred
                 if progress_callback:
-                    progress_callback(bytes_transferred, size)
+                    progress_callback(uploaded[0], size)
 
             self._s3.upload_file(
                 local_path,
                 self._bucket,
                 remote_path,
-                Callback=upload_callback
+                Callback=upload_callback,
+                Config=TransferConfig(
+                    multipart_threshold=self._multipart_threshold + 1,
+                    multipart_chunksize=self._part_size,
+                    max_concurrency=self._max_concurrency,
+                    io_chunksize=self.buffers.block_size,
+                ),
             )
             if progress_callback:
                 progress_callback(size, size)
             return True
         except ClientError as e:
-            raise RuntimeError(f"Yükleme hatası: {e.response['Error']['Message']}")
+            if e.response["Error"].get("Code") in DIGEST_ERRORS:
+                self._count_checksum("mismatch")
+                raise ChecksumMismatch(f"S3 gövdeyi reddetti, sağlama toplamı tutmuyor: {remote_path}") from e
+            raise
+
+    def _put_verified(
+        self, local_path: str, remote_path: str, size: int, progress_callback: Optional[Callable[[int, int], None]]
+    ) -> None:
+        """
+        Single PUT carrying the MD5 and SHA-256 of the file, so S3 refuses a
+        body that changed on the way; the ETag is checked as well. The file
+        is hashed and then sent as a stream, never held in memory whole.
+        """
+        hasher = hash_file(local_path, ("md5", "sha256"), block_size=self.buffers.block_size)
+
+        def on_read(n: int) -> None:
+            self._throttle(n)
+            if progress_callback:
+                progress_callback(min(body.tell(), size), size)
+
+        with open(local_path, "rb") as f:
+            body = _ThrottledReader(f, on_read)
+            resp = self._s3.put_object(
+                Bucket=self._bucket,
+                Key=remote_path,
+                Body=body,
+                ContentLength=size,
+                ContentMD5=b64(hasher.digest("md5")),
+                ChecksumSHA256=b64(hasher.digest("sha256")),
+            )
+        if self._etag_opaque(resp):
+            self._count_checksum("unavailable")
+        else:
+            self._check_digest(remote_path, resp["ETag"].strip('"'), hasher.hexdigest("md5"))
+        if progress_callback:
+            progress_callback(size, size)
+
+    def _multipart_upload(
+        self,
+        local_path: str,
+        remote_path: str,
+        size: int,
+        progress_callback: Optional[Callable[[int, int], None]],
+        resume: bool = True,
+    ) -> None:
+        """
+        Upload in parts, resuming a previous attempt of the same file version.
+
+        Parts already confirmed by ListParts are skipped; the state file is
+        removed once CompleteMultipartUpload succeeds. With resume=False an
+        earlier attempt is aborted and the upload starts over.
+        """
+        part_size = self._part_size
+        state_id = self._state.state_id(self._bucket, remote_path, local_path, part_size)
+        state = self._state.load(state_id)
+        done: dict[int, tuple[str, int]] = {}
+
+        if state and not resume:
+            try:
+                self._s3.abort_multipart_upload(Bucket=self._bucket, Key=remote_path, UploadId=state["upload_id"])
+            except ClientError:
+                pass
+            self._state.remove(state_id)
+            state = None
+
+        if state:
+            try:
+                done = self._list_parts(remote_path, state["upload_id"])
+            except ClientError as e:
+                if e.response["Error"].get("Code") != "NoSuchUpload":
+                    raise
+                self._state.remove(state_id)
+                state = None
+
+        if not state:
+            upload_id = self._s3.create_multipart_upload(Bucket=self._bucket, Key=remote_path)["UploadId"]
+            state = {
+                "bucket": self._bucket,
+                "key": remote_path,
+                "local_path": os.path.abspath(local_path),
+                "upload_id": upload_id,
+                "part_size": part_size,
+                "created": time.time(),
+                "parts": {},
+            }
+            self._state.save(state_id, state)
+        upload_id = state["upload_id"]
+
+        part_count = max(1, -(-size // part_size))
+        missing = []
+        for number in range(1, part_count + 1):
+            expected = min(part_size, size - (number - 1) * part_size)
+            if number in done and done[number][1] == expected and self._part_matches(
+                local_path, (number - 1) * part_size, expected, done[number][0]
+            ):
+                state["parts"][str(number)] = done[number][0]
+            else:
+                missing.append(number)
+
+        progress = SharedProgress(size, progress_callback)
+        progress.add(sum(min(part_size, size - (n - 1) * part_size) for n in range(1, part_count + 1) if n not in missing))
+        state_lock = threading.Lock()
+
+        def send(number: int, abort: threading.Event):
+            offset = (number - 1) * part_size
+            with open(local_path, "rb") as f:
+                f.seek(offset)
+                data = f.read(part_size)
+            self._throttle(len(data))
+            digest = {}
+            if self.verify_checksums:
+                md5 = hashlib.md5(data)
+                digest = {"ContentMD5": b64(md5.digest())}
+            resp = self._s3.upload_part(
+                Bucket=self._bucket, Key=remote_path, UploadId=upload_id, PartNumber=number, Body=data, **digest
+            )
+            if digest and not self._etag_opaque(resp):
+                self._check_digest(f"{remote_path} #{number}", resp["ETag"].strip('"'), md5.hexdigest())
+            with state_lock:
+                state["parts"][str(number)] = resp["ETag"]
+                self._state.save(state_id, state)
+            progress.add(len(data))
+
+        run_parallel(send, missing, self._max_concurrency)
+
+        parts = sorted(
+            ({"PartNumber": int(n), "ETag": etag} for n, etag in state["parts"].items()),
+            key=lambda p: p["PartNumber"],
+        )
+        resp = self._s3.complete_multipart_upload(
+            Bucket=self._bucket,
+            Key=remote_path,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+        self._state.remove(state_id)
+        if self.verify_checksums and not self._etag_opaque(resp):
+            expected = multipart_etag(bytes.fromhex(p["ETag"].strip('"')) for p in parts)
+            self._check_digest(remote_path, resp["ETag"].strip('"'), expected)
+
+    def _part_matches(self, local_path: str, offset: int, length: int, etag: str) -> bool:
+        """With verification on, a part left by an earlier attempt is kept only if it hashes to its ETag."""
+        if not self.verify_checksums:
+            return True
+        return hash_file(local_path, ["md5"], offset, length).hexdigest("md5") == etag.strip('"')
+
+    def _list_parts(self, remote_path: str, upload_id: str) -> dict[int, tuple[str, int]]:
+        """Return {PartNumber: (ETag, Size)} for parts S3 already has."""
+        parts = {}
+        paginator = self._s3.get_paginator("list_parts")
+        for page in paginator.paginate(Bucket=self._bucket, Key=remote_path, UploadId=upload_id):
+            for part in page.get("Parts", []):
+                parts[part["PartNumber"]] = (part["ETag"], part["Size"])
+        return parts
+
+    def abort_stale_uploads(self, max_age: float = 7 * 24 * 3600) -> int:
+        """
+        Abort multipart uploads started by this tool that have not been
+        touched for max_age seconds. Returns how many were aborted.
+        """
+        if not self._s3:
+            return 0
+        aborted = 0
+        now = time.time()
+        for state_id, state in self._state.all():
+            if now - state.get("updated", state.get("created", 0)) < max_age:
+                continue
+            try:
+                self._s3.abort_multipart_upload(
+                    Bucket=state["bucket"], Key=state["key"], UploadId=state["upload_id"]
+                )
+                aborted += 1
+            except ClientError as e:
+                if e.response["Error"].get("Code") != "NoSuchUpload":
+                    continue
+            self._state.remove(state_id)
+        return aborted
 
     def delete(self, path: str) -> bool:
         if not self._s3 or not self._bucket:
             return False
 
+        if path.endswith("/"):
+            # Klasör sadece bir önek; işaret nesnesini silmek içindekileri bırakırdı
+            try:
+                return self.delete_tree(path).ok
+            except ValueError:
+                return False
         try:
-            self._s3.delete_object(Bucket=self._bucket, Key=path.rstrip("/"))
+            self._s3.delete_object(Bucket=self._bucket, Key=path)
+            self.invalidate_listing(path)
             return True
         except ClientError:
             return False
 
+    def delete_tree(
+        self,
+        path: str,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        workers: int = DELETE_WORKERS,
+        abort: Optional[threading.Event] = None,
+    ) -> DeleteResult:
+        """
+        Delete every key under the prefix, directory markers included. The
+        prefix is listed without a delimiter, so the whole subtree arrives in
+        pages of up to 1000 keys, and each page is sent as one DeleteObjects
+        request on `workers` threads while the next pages are listed.
+        """
+        if not self._s3 or not self._bucket:
+            raise RuntimeError("Bağlantı yok")
+        prefix = self._normalize_path(path)
+        if not prefix:
+            raise ValueError("Kök klasör silinemez")
+        prefixes = {prefix}
+        try:
+            return delete_batches(self._key_pages(prefix, prefixes), self._delete_keys, workers, progress_callback, abort)
+        finally:
+            for key in prefixes:
+                self.invalidate_listing(key)
+
+    def _key_pages(self, prefix: str, prefixes: set) -> Iterator[list[str]]:
+        """Keys under prefix, one list_objects_v2 page at a time; the "directories" seen are added to prefixes."""
+        paginator = self._s3.get_paginator("list_objects_v2")
+        try:
+            for page in paginator.paginate(Bucket=self._bucket, Prefix=prefix):
+                keys = [obj["Key"] for obj in page.get("Contents", [])]
+                for key in keys:
+                    prefixes.add(key[:key.rfind("/") + 1])
+                yield keys
+        except ClientError as e:
+            raise RuntimeError(f"S3 listeleme hatası: {e.response['Error']['Message']}")
+
+    def _delete_keys(self, keys: list[str]) -> list[str]:
+        response = self._s3.delete_objects(
+            Bucket=self._bucket,
+            Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+        )
+        return [f"{e['Key']}: {e.get('Message') or e.get('Code')}" for e in response.get("Errors", [])]
+
     def create_directory(self, path: str) -> bool:
         if not self._s3 or not self._bucket:
             return False
@@ -177,6 +790,7 @@ class S3Connector(BaseConnector):
         path = path.rstrip("/") + "/"
         try:
             self._s3.put_object(Bucket=self._bucket, Key=path, Body=b"")
+            self.invalidate_listing(path)
             return True
         except ClientError:
             return False
@@ -0,0 +1,80 @@
+"""Helpers for transferring one file as several concurrent byte ranges."""
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SharedProgress:
+    """Serializes progress reports coming from several part threads."""
+
+    def __init__(self, total: int, callback: Optional[Callable[[int, int], None]], done: int = 0):
+        self.total = total
+        self.done = done
+        self._callback = callback
+        self._lock = threading.Lock()
+
+    def add(self, n: int) -> None:
+        with self._lock:
+            self.done += n
+            if self._callback:
+                self._callback(self.done, self.total)
+
+
+class RangeTracker:
+    """Tracks how far each byte range has got so unfinished ranges can be resumed."""
+
+    def __init__(self, ranges: Iterable[tuple[int, int]]):
+        self._pos = {(start, end): start for start, end in ranges}
+        self._lock = threading.Lock()
+
+    def advance(self, rng: tuple[int, int], n: int) -> None:
+        with self._lock:
+            self._pos[rng] += n
+
+    def remaining(self) -> list[list[int]]:
+        """Inclusive [first, last] ranges that still have bytes to move."""
+        with self._lock:
+            return [[pos, end] for (start, end), pos in sorted(self._pos.items()) if pos <= end]
+
+
+def split_ranges(start: int, total: int, part_size: int) -> list[tuple[int, int]]:
+    """Split [start, total) into inclusive (first, last) byte ranges of part_size."""
+    return [(pos, min(pos + part_size, total) - 1) for pos in range(start, total, part_size)]
+
+
+def run_parallel(
+    func: Callable[[T, threading.Event], None],
+    items: Iterable[T],
+    max_workers: int,
+) -> None:
+    """
+    Run func(item, abort) for every item on a thread pool.
+
+    The first failure sets abort, cancels parts that have not started and is
+    re-raised; running parts are expected to poll abort and stop early.
+    Each part runs in a copy of the caller's context, so the job's
+    transfer priority applies to its parts as well.
+    """
+    items = list(items)
+    if not items:
+        return
+    abort = threading.Event()
+
+    def guarded(item: T):
+        if not abort.is_set():
+            func(item, abort)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, guarded, item) for item in items]
+        try:
+            for fut in as_completed(futures):
+                fut.result()
+        except BaseException:
+            abort.set()
+            for fut in futures:
+                fut.cancel()
+            raise
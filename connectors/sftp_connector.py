@@ -1,20 +1,72 @@
 """SFTP (SSH File Transfer Protocol) connector."""
 
 import os
-from typing import Optional, Callable
+import posixpath
+import shlex
+import threading
+from datetime import datetime
+from typing import Callable, Iterator, Optional
 
 import paramiko
 
-from .base import BaseConnector, RemoteFile
+from .base import BaseConnector, RemoteFile, sort_listing
+from .buffers import write_all
+from .checksum import ChecksumMismatch, StreamHasher
+from .pool import SessionPool
+from .resume import DEFAULT_RESUME_DIR, ResumeStore, TransferResume, local_fingerprint, remote_fingerprint
+from .segments import RangeTracker, SharedProgress, run_parallel, split_ranges
+
+MB = 1024 * 1024
+
+# check-file uzantısı olmayan sunucularda (OpenSSH dahil) denenecek kabuk komutları
+HASH_COMMANDS = ("sha256sum --", "shasum -a 256 --")
 
 
 class SFTPConnector(BaseConnector):
-    """SFTP protocol connector."""
+    """
+    SFTP protocol connector.
+
+    One SSH connection is authenticated once; every operation leases one of
+    up to `channels` SFTP channels opened on that shared Transport, so
+    concurrent jobs do not pay another TCP handshake, key exchange and login.
+
+    Downloads keep up to prefetch_depth read requests in flight (0, the
+    default, leaves it uncapped like sftp.get); files larger than
+    segment_threshold are split into `segments` offset ranges that are
+    moved concurrently on separate channels.
+
+    compression turns on zlib on the SSH transport, which covers listings
+    and transfers alike.
+
+    With verify_checksums a SHA-256 of each finished transfer is compared
+    with the server's, asked through the check-file extension or, failing
+    that, by running sha256sum over an exec channel.
+
+    Local files are read and written one pooled block (set_block_size) at
+    a time; paramiko itself still moves 32 KB SFTP requests.
+    """
+
+    # paramiko'nun tek okuma/yazma isteği; prefetch parçaları da bu boyutta
+    REQUEST_SIZE = paramiko.SFTPFile.MAX_REQUEST_SIZE
 
     def __init__(self):
         self._client: Optional[paramiko.SSHClient] = None
-        self._sftp: Optional[paramiko.SFTPClient] = None
+        self._pool: Optional[SessionPool] = None
+        self._login: dict = {}
+        self._transport_lock = threading.Lock()
         self._current_path = "/"
+        self._window_size = 8 * MB
+        # paramiko sınıra takılınca her istekten önce io_sleep (10 ms) bekler; sığ sınır indirmeyi boğar
+        self._prefetch_depth = 0
+        self._segment_threshold = 64 * MB
+        self._segments = 4
+        # Bir aralığın en fazla boyutu; 0 ise dosya segmentlere eşit bölünür
+        self._segment_size = 0
+        self._confirm_uploads = True
+        self._compression = False
+        self._resume = ResumeStore()
+        # Sunucuda çalışan özet komutu; "" hiçbiri yok, None henüz denenmedi
+        self._hash_command: Optional[str] = None
 
     def connect(
         self,
@@ -22,149 +74,476 @@ class SFTPConnector(BaseConnector):
         port: int = 22,
         username: str = "",
         password: str = "",
+        channels: int = 4,
+        window_size: int = 8 * MB,
+        prefetch_depth: int = 0,
+        segment_threshold: int = 64 * MB,
+        segments: int = 4,
+        confirm_uploads: bool = True,
+        resume_dir: str = DEFAULT_RESUME_DIR,
+        verify_checksums: bool = False,
+        compression: bool = False,
         **kwargs
     ) -> bool:
+        self.verify_checksums = verify_checksums
+        self._hash_command = None
+        self._compression = compression
+        self._window_size = int(window_size)
+        self._prefetch_depth = max(0, int(prefetch_depth))
+        self._segment_threshold = int(segment_threshold)
+        self._segments = max(1, int(segments))
+        self._segment_size = 0
+        self._confirm_uploads = confirm_uploads
+        self._resume = ResumeStore(resume_dir)
+        self._login = {
+            "hostname": host,
+            "port": port,
+            "username": username or "anonymous",
+            "password": password or "",
+        }
         try:
-            self._client = paramiko.SSHClient()
-            self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            self._client.connect(
-                hostname=host,
-                port=port,
-                username=username or "anonymous",
-                password=password or "",
-                timeout=30,
+            self._open_transport()
+            pool = SessionPool(
+                self._open_channel,
+                max_size=channels,
+                close=lambda sftp: sftp.close(),
+                validate=lambda sftp: sftp.normalize("."),
+                # paramiko olmayan dosya ve izin cevaplarını bu ikisine çevirir; diğer OSError'lar
+                # (soket hatası, zaman aşımı, "Socket is closed") kanalın bozulduğunu da gösterebilir
+                recoverable=(FileNotFoundError, PermissionError),
             )
-            self._sftp = self._client.open_sftp()
-            self._current_path = self._sftp.normalize(".")
+            with pool.lease() as sftp:
+                self._current_path = sftp.normalize(".")
+            self._pool = pool
             return True
         except Exception as e:
+            self._close_transport()
             raise ConnectionError(f"SFTP bağlantı hatası: {str(e)}")
 
-    def disconnect(self) -> None:
-        if self._sftp:
-            try:
-                self._sftp.close()
-            except Exception:
-                pass
-            self._sftp = None
+    def _open_transport(self) -> None:
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(timeout=30, compress=self._compression, **self._login)
+        self._client = client
+
+    def _close_transport(self) -> None:
         if self._client:
             try:
                 self._client.close()
             except Exception:
                 pass
             self._client = None
+
+    def _open_channel(self) -> paramiko.SFTPClient:
+        """Open a new SFTP channel, re-establishing the transport if it died."""
+        with self._transport_lock:
+            transport = self._client.get_transport() if self._client else None
+            if transport is None or not transport.is_active():
+                if transport is not None:
+                    host = f"{self._login.get('hostname')}:{self._login.get('port')}"
+                    self.metrics.inc("ducktransfer_reconnects_total", {"protocol": "sftp", "host": host})
+                self._close_transport()
+                self._open_transport()
+                transport = self._client.get_transport()
+        try:
+            return paramiko.SFTPClient.from_transport(transport, window_size=self._window_size)
+        except paramiko.ChannelException:
+            # Sunucunun MaxSessions sınırı dolu; ayarlayıcı geri çekilir
+            self._count_throttled()
+            raise
+
+    def disconnect(self) -> None:
+        if self._pool:
+            self._pool.close()
+            self._pool = None
+        with self._transport_lock:
+            self._close_transport()
         self._current_path = "/"
 
     def is_connected(self) -> bool:
-        return self._sftp is not None
+        return self._pool is not None
+
+    def _endpoint(self) -> str:
+        return f"sftp://{self._login.get('username')}@{self._login.get('hostname')}:{self._login.get('port')}"
+
+    def parallelism(self) -> tuple[int, int]:
+        return self._segments, self._segment_size
+
+    def set_parallelism(self, segments: int, segment_size: int = 0) -> None:
+        self._segments = max(1, int(segments))
+        self._segment_size = max(0, int(segment_size))
+
+    def _split(self, size: int) -> list[tuple[int, int]]:
+        """Ranges for a segmented transfer: one per segment, none larger than _segment_size if set."""
+        piece = -(-size // self._segments)
+        return split_ranges(0, size, min(piece, self._segment_size or piece))
+
+    def checksum_algorithm(self) -> Optional[str]:
+        return "sha256"
+
+    def remote_checksum(self, path: str) -> Optional[tuple[str, str]]:
+        if not self._pool:
+            return None
+        path = self._abspath(path)
+        try:
+            with self._pool.lease() as sftp, sftp.open(path, "rb") as f:
+                return "sha256", f.check("sha256").hex()
+        except (IOError, paramiko.SFTPError):
+            pass
+        if self._hash_command == "" or self._client is None:
+            return None
+        for command in [self._hash_command] if self._hash_command else HASH_COMMANDS:
+            try:
+                _, stdout, _ = self._client.exec_command(f"{command} {shlex.quote(path)}", timeout=600)
+                output = stdout.read().decode("utf-8", "replace")
+                status = stdout.channel.recv_exit_status()
+            except (paramiko.SSHException, OSError):
+                return None
+            digest = output.split()[0] if output.strip() else ""
+            if status == 0 and len(digest) == 64:
+                self._hash_command = command
+                return "sha256", digest.lower()
+        if self._hash_command is None:
+            self._hash_command = ""
+        return None
+
+    def _abspath(self, path: str) -> str:
+        if not path:
+            return self._current_path
+        if not path.startswith("/"):
+            path = os.path.join(self._current_path, path)
+        return path.replace("\\", "/")
+
+    def _listing_key(self, path: str) -> str:
+        return posixpath.normpath(self._abspath(path))
 
     def list_directory(self, path: str = "/") -> list[RemoteFile]:
-        if not self._sftp:
-            return []
+        files = []
+        for batch in self.iter_directory(path, batch_size=4096):
+            files.extend(batch)
+        return sort_listing(files)
+
+    def iter_directory(self, path: str = "/", batch_size: int = 500) -> Iterator[list[RemoteFile]]:
+        """Built on listdir_iter, which yields entries as each READDIR reply arrives."""
+        if not self._pool:
+            return
 
         try:
-            if path and path != self._current_path:
-                self._sftp.chdir(path)
-                self._current_path = path
-
-            files = []
-            for entry in self._sftp.listdir_attr(self._current_path):
-                if entry.filename in (".", ".."):
-                    continue
-                full_path = os.path.join(self._current_path, entry.filename).replace("\\", "/")
-                is_dir = entry.st_mode and (entry.st_mode & 0o170000) == 0o040000
-                mod_time = None
-                if hasattr(entry, "st_mtime"):
-                    from datetime import datetime
-                    mod_time = datetime.fromtimestamp(entry.st_mtime).strftime("%Y-%m-%d %H:%M")
-
-                files.append(RemoteFile(
-                    name=entry.filename,
-                    path=full_path,
-                    size=entry.st_size if not is_dir else 0,
-                    is_directory=is_dir,
-                    modified=mod_time
-                ))
-
-            return sorted(files, key=lambda x: (not x.is_directory, x.name.lower()))
+            path = self._abspath(path)
+            with self._pool.lease() as sftp:
+                batch = []
+                for entry in sftp.listdir_iter(path):
+                    if entry.filename in (".", ".."):
+                        continue
+                    batch.append(self._entry(path, entry))
+                    if len(batch) >= batch_size:
+                        yield batch
+                        batch = []
+                if batch:
+                    yield batch
         except Exception as e:
             raise RuntimeError(f"Dizin listelenemedi: {str(e)}")
 
+    def _entry(self, path: str, entry: paramiko.SFTPAttributes) -> RemoteFile:
+        full_path = os.path.join(path, entry.filename).replace("\\", "/")
+        is_dir = entry.st_mode and (entry.st_mode & 0o170000) == 0o040000
+        mod_time = None
+        if entry.st_mtime is not None:
+            mod_time = datetime.fromtimestamp(entry.st_mtime).strftime("%Y-%m-%d %H:%M")
+
+        return RemoteFile(
+            name=entry.filename,
+            path=full_path,
+            size=entry.st_size if not is_dir else 0,
+            is_directory=bool(is_dir),
+            modified=mod_time,
+            mtime=entry.st_mtime
+        )
+
+    def stat(self, path: str) -> Optional[RemoteFile]:
+        if not self._pool:
+            return None
+        path = self._abspath(path)
+        try:
+            with self._pool.lease() as sftp:
+                attr = sftp.stat(path)
+        except FileNotFoundError:
+            return None
+        is_dir = bool(attr.st_mode) and (attr.st_mode & 0o170000) == 0o040000
+        return RemoteFile(
+            name=path.rstrip("/").split("/")[-1],
+            path=path,
+            size=attr.st_size or 0,
+            is_directory=is_dir,
+            mtime=attr.st_mtime
+        )
+
+    def _stat_quietly(self, path: str) -> Optional[RemoteFile]:
+        try:
+            return self.stat(path)
+        except Exception:
+            return None
+
     def download_file(
         self,
         remote_path: str,
         local_path: str,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        resume: bool = False
     ) -> bool:
-        if not self._sftp:
+        if not self._pool:
             return False
+        remote_path = self._abspath(remote_path)
+        try:
+            return self._retry_on_mismatch(
+                lambda resume: self._download(remote_path, local_path, progress_callback, resume), resume
+            )
+        except ChecksumMismatch:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"İndirme hatası: {str(e)}")
+
+    def _download(self, remote_path: str, local_path: str, progress_callback, resume: bool) -> bool:
+        info = self.stat(remote_path)
+        if info is None:
+            raise FileNotFoundError(remote_path)
+        size = info.size
+        state = TransferResume(
+            self._resume,
+            self._resume.transfer_id("download", self._endpoint(), remote_path, local_path),
+            remote_fingerprint(info),
+            enabled=resume and os.path.exists(local_path),
+        )
+
+        # Sıralı indirmede yerel dosya boyutu kaldığı yeri gösterir; segmentli
+        # indirmede ise eksik aralıklar kayıtta tutulur.
+        ranges = state.saved_ranges
+        sequential = ranges is None and (size <= self._segment_threshold or self._segments == 1)
+        if sequential:
+            offset = os.path.getsize(local_path) if state.resumable else 0
+            if offset > size or not state.resumable:
+                offset = 0
+                open(local_path, "wb").close()
+            ranges = [(offset, size - 1)] if offset < size else []
+        elif ranges is None:
+            ranges = self._split(size)
+            with open(local_path, "wb") as f:
+                f.truncate(size)
+        tracker = RangeTracker(ranges)
+        # Tek aralık sırayla okunur; segmentler bitince dosyadan özetlenir
+        hasher = self._new_hasher() if sequential else None
+        if hasher:
+            hasher.seed(local_path, ranges[0][0] if ranges else size)
 
         try:
-            size = self._sftp.stat(remote_path).st_size
-            downloaded = [0]
+            state.begin(None if sequential else ranges)
+            self._download_ranges(remote_path, local_path, size, tracker, progress_callback, hasher)
+        except BaseException:
+            state.fail(ranges=None if sequential else tracker.remaining())
+            raise
+        state.done()
+        self._verify_remote(remote_path, local_path, hasher)
+        if progress_callback:
+            progress_callback(size, size)
+        return True
 
-            def callback(transferred, total):
-                downloaded[0] = transferred
-                if progress_callback:
-                    progress_callback(transferred, total)
+    def _download_ranges(
+        self, remote_path: str, local_path: str, size: int, tracker: RangeTracker, progress_callback,
+        hasher: Optional[StreamHasher] = None
+    ) -> None:
+        """
+        Read offset ranges with prefetching, each on its own channel, into the
+        local file. hasher is only passed for a single, in-order range.
+        """
+        ranges = [tuple(r) for r in tracker.remaining()]
+        missing = sum(end + 1 - start for start, end in ranges)
+        progress = SharedProgress(size, progress_callback, done=size - missing)
 
-            self._sftp.get(remote_path, local_path, callback=callback)
-            if progress_callback:
-                progress_callback(size, size)
-            return True
-        except Exception as e:
-            raise RuntimeError(f"İndirme hatası: {str(e)}")
+        def fetch(rng: tuple[int, int], abort: threading.Event):
+            start, end = rng
+            with self._pool.lease() as sftp, sftp.open(remote_path, "rb") as rf, \
+                    open(local_path, "r+b", buffering=0) as lf, self.buffers.lease() as buf:
+                rf.seek(start)
+                rf.prefetch(end + 1, max_concurrent_requests=self._prefetch_depth or None)
+                lf.seek(start)
+                remaining = end + 1 - start
+                filled = 0
+                while remaining > 0:
+                    if abort.is_set():
+                        return
+                    # Prefetch parçası kopyalanmadan gelir; daha büyük read() onları birleştirip kopyalar
+                    data = rf.read(min(self.REQUEST_SIZE, remaining, len(buf) - filled))
+                    if not data:
+                        raise IOError("Beklenmeyen dosya sonu")
+                    self._throttle(len(data))
+                    buf[filled:filled + len(data)] = data
+                    filled += len(data)
+                    remaining -= len(data)
+                    progress.add(len(data))
+                    if filled == len(buf) or remaining == 0:
+                        # Diske blok blok yazılır; tracker yalnızca yazılanı kaydeder
+                        write_all(lf, buf[:filled])
+                        if hasher:
+                            hasher.update(buf[:filled])
+                        tracker.advance(rng, filled)
+                        filled = 0
+
+        run_parallel(fetch, ranges, self._segments)
 
     def upload_file(
         self,
         local_path: str,
         remote_path: str,
-        progress_callback: Optional[Callable[[int, int], None]] = None
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        resume: bool = False
     ) -> bool:
-        if not self._sftp:
+        if not self._pool:
             return False
+        remote_path = self._abspath(remote_path)
+        try:
+            return self._retry_on_mismatch(
+                lambda resume: self._upload(local_path, remote_path, progress_callback, resume), resume
+            )
+        except ChecksumMismatch:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"Yükleme hatası: {str(e)}")
+
+    def _upload(self, local_path: str, remote_path: str, progress_callback, resume: bool) -> bool:
+        size = os.path.getsize(local_path)
+        state = TransferResume(
+            self._resume,
+            self._resume.transfer_id("upload", self._endpoint(), remote_path, local_path),
+            local_fingerprint(local_path),
+            enabled=resume,
+        )
+
+        # Kaldığı yerden devam yalnızca uzak dosya hatadan sonraki haliyle aynıysa
+        ranges = None
+        if state.resumable and state.saved_target is not None:
+            current = self._stat_quietly(remote_path)
+            if current is not None and remote_fingerprint(current) == state.saved_target:
+                ranges = state.saved_ranges
+                if ranges is None and current.size <= size:
+                    ranges = [(current.size, size - 1)] if current.size < size else []
+        fresh = ranges is None
+        if fresh:
+            if size > self._segment_threshold and self._segments > 1:
+                ranges = self._split(size)
+            else:
+                ranges = [(0, size - 1)] if size else []
+        segmented = len(ranges) > 1 or state.saved_ranges is not None
+        tracker = RangeTracker(ranges)
+        hasher = None if segmented else self._new_hasher()
+        if hasher:
+            hasher.seed(local_path, ranges[0][0] if ranges else size)
 
         try:
-            size = os.path.getsize(local_path)
-            uploaded = [0]
+            state.begin(ranges if segmented else None)
+            if fresh:
+                with self._pool.lease() as sftp:
+                    sftp.open(remote_path, "wb").close()
+            self._upload_ranges(local_path, remote_path, size, tracker, progress_callback, hasher)
+        except BaseException:
+            state.fail(
+                ranges=tracker.remaining() if segmented else None,
+                target=remote_fingerprint(self._stat_quietly(remote_path)),
+            )
+            raise
+        finally:
+            self.invalidate_listing(remote_path)
+        state.done()
 
-            def callback(transferred, total):
-                uploaded[0] = transferred
-                if progress_callback:
-                    progress_callback(transferred, total)
+        if self._confirm_uploads:
+            with self._pool.lease() as sftp:
+                remote_size = sftp.stat(remote_path).st_size
+            if remote_size != size:
+                raise IOError(f"Boyut uyuşmuyor: {remote_size} != {size}")
+        self._verify_remote(remote_path, local_path, hasher)
+        if progress_callback:
+            progress_callback(size, size)
+        return True
 
-            self._sftp.put(local_path, remote_path, callback=callback)
-            if progress_callback:
-                progress_callback(size, size)
-            return True
-        except Exception as e:
-            raise RuntimeError(f"Yükleme hatası: {str(e)}")
+    def _upload_ranges(
+        self, local_path: str, remote_path: str, size: int, tracker: RangeTracker, progress_callback,
+        hasher: Optional[StreamHasher] = None
+    ) -> None:
+        """Write offset ranges with pipelined writes, each on its own channel."""
+        ranges = [tuple(r) for r in tracker.remaining()]
+        missing = sum(end + 1 - start for start, end in ranges)
+        progress = SharedProgress(size, progress_callback, done=size - missing)
+
+        def send(rng: tuple[int, int], abort: threading.Event):
+            start, end = rng
+            with self._pool.lease() as sftp, sftp.open(remote_path, "r+b") as rf, \
+                    open(local_path, "rb", buffering=0) as lf, self.buffers.lease() as buf:
+                rf.set_pipelined(True)
+                rf.seek(start)
+                lf.seek(start)
+                remaining = end + 1 - start
+                while remaining > 0:
+                    if abort.is_set():
+                        return
+                    n = lf.readinto(buf[:min(len(buf), remaining)])
+                    if not n:
+                        raise IOError("Yerel dosya yükleme sırasında kısaldı")
+                    data = buf[:n]
+                    self._throttle(n)
+                    # paramiko görünümü 32 KB'lık isteklere bölüp pakete kopyalar; tampon hemen yeniden kullanılabilir
+                    rf.write(data)
+                    if hasher:
+                        hasher.update(data)
+                    remaining -= n
+                    tracker.advance(rng, n)
+                    progress.add(n)
+
+        run_parallel(send, ranges, self._segments)
 
     def delete(self, path: str) -> bool:
-        if not self._sftp:
+        if not self._pool:
             return False
+        path = self._abspath(path)
         try:
-            try:
-                self._sftp.remove(path)
-            except IOError:
-                self._sftp.rmdir(path)
+            with self._pool.lease() as sftp:
+                try:
+                    sftp.remove(path)
+                except IOError:
+                    sftp.rmdir(path)
+            self.invalidate_listing(path)
             return True
         except Exception:
             return False
 
+    def _remove(self, path: str, is_directory: bool) -> None:
+        if not self._pool:
+            raise RuntimeError("Bağlantı yok")
+        with self._pool.lease() as sftp:
+            if is_directory:
+                sftp.rmdir(self._abspath(path))
+            else:
+                sftp.remove(self._abspath(path))
+
+    def set_mtime(self, path: str, mtime: float) -> bool:
+        if not self._pool:
+            return False
+        try:
+            with self._pool.lease() as sftp:
+                sftp.utime(self._abspath(path), (mtime, mtime))
+        except Exception:
+            return False
+        self.invalidate_listing(path)
+        return True
+
     def create_directory(self, path: str) -> bool:
-        if not self._sftp:
+        if not self._pool:
             return False
         try:
-            self._sftp.mkdir(path)
+            with self._pool.lease() as sftp:
+                sftp.mkdir(self._abspath(path))
+            self.invalidate_listing(path)
             return True
         except Exception:
             return False
 
     def get_current_path(self) -> str:
-        if self._sftp:
-            try:
-                self._current_path = self._sftp.normalize(".")
-            except Exception:
-                pass
         return self._current_path
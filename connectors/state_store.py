@@ -0,0 +1,61 @@
+"""Small JSON state files kept between transfer attempts."""
+
+import json
+import os
+import threading
+import time
+from typing import Optional
+
+
+STATE_ROOT = os.path.join(os.path.expanduser("~"), ".config", "ducktransfer")
+
+
+class JSONStateStore:
+    """
+    One JSON file per state id. Files are rewritten atomically so a crash
+    never leaves a half-written state behind.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _path(self, state_id: str) -> str:
+        return os.path.join(self.directory, f"{state_id}.json")
+
+    def load(self, state_id: str) -> Optional[dict]:
+        try:
+            with open(self._path(state_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def save(self, state_id: str, state: dict) -> None:
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            state["updated"] = time.time()
+            tmp = self._path(state_id) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f)
+            os.replace(tmp, self._path(state_id))
+
+    def remove(self, state_id: str) -> None:
+        try:
+            os.remove(self._path(state_id))
+        except OSError:
+            pass
+
+    def all(self) -> list[tuple[str, dict]]:
+        """Return (state_id, state) for every saved entry."""
+        result = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return result
+        for name in names:
+            if name.endswith(".json"):
+                state_id = name[:-5]
+                state = self.load(state_id)
+                if state:
+                    result.append((state_id, state))
+        return result
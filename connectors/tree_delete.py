@@ -0,0 +1,237 @@
+"""Recursive delete: list a tree as a stream and remove it with parallel workers."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+# Sonuçta en fazla bu kadar hata mesajı tutulur
+MAX_ERRORS = 20
+# Varsayılan eşzamanlı silme sayısı
+DELETE_WORKERS = 8
+# Kuyrukta bekleyen silme işi worker başına en fazla bu kadar; liste bellekte birikmesin
+BACKLOG_PER_WORKER = 64
+
+
+@dataclass
+class DeleteResult:
+    """Outcome of a recursive delete; errors keeps the first MAX_ERRORS messages."""
+    found: int = 0
+    deleted: int = 0
+    failed: int = 0
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.failed == 0
+
+
+class DeleteProgress:
+    """
+    Thread-safe DeleteResult that reports callback(deleted, found) at most
+    every interval seconds, and once more from finish().
+    """
+
+    def __init__(self, callback: Optional[Callable[[int, int], None]] = None, interval: float = 0.2):
+        self.result = DeleteResult()
+        self._callback = callback
+        self._interval = interval
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def found(self, n: int = 1) -> None:
+        with self._lock:
+            self.result.found += n
+        self._report()
+
+    def deleted(self, n: int = 1) -> None:
+        with self._lock:
+            self.result.deleted += n
+        self._report()
+
+    def failed(self, message: str, n: int = 1) -> None:
+        with self._lock:
+            self.result.failed += n
+            if len(self.result.errors) < MAX_ERRORS:
+                self.result.errors.append(message)
+        self._report()
+
+    def finish(self) -> DeleteResult:
+        self._report(force=True)
+        return self.result
+
+    def _report(self, force: bool = False) -> None:
+        if not self._callback:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last < self._interval:
+                return
+            self._last = now
+            deleted, found = self.result.deleted, self.result.found
+        try:
+            self._callback(deleted, found)
+        except Exception:
+            pass
+
+
+def delete_batches(
+    batches: Iterable[list[str]],
+    delete: Callable[[list[str]], list[str]],
+    workers: int = DELETE_WORKERS,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    abort: Optional[threading.Event] = None,
+) -> DeleteResult:
+    """
+    Call delete(batch) for every batch of paths on `workers` threads while
+    the next batches are still being listed. delete returns one error
+    message per path it could not remove; an exception fails the whole batch.
+    """
+    workers = max(1, int(workers))
+    abort = abort or threading.Event()
+    progress = DeleteProgress(progress_callback)
+    slots = threading.BoundedSemaphore(workers * 2)
+
+    def run(batch: list[str]) -> None:
+        try:
+            if abort.is_set():
+                return
+            try:
+                errors = delete(batch)
+            except Exception as e:
+                errors = [f"{path}: {e}" for path in batch]
+            for message in errors:
+                progress.failed(message)
+            progress.deleted(len(batch) - len(errors))
+        finally:
+            slots.release()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for batch in batches:
+                if abort.is_set():
+                    break
+                if not batch:
+                    continue
+                progress.found(len(batch))
+                slots.acquire()
+                pool.submit(run, batch)
+    except BaseException:
+        abort.set()
+        raise
+    return progress.finish()
+
+
+class _Dir:
+    __slots__ = ("path", "parent", "pending", "failed")
+
+    def __init__(self, path: str, parent: Optional["_Dir"]):
+        self.path = path
+        self.parent = parent
+        # Bitmemiş çocuklar + listelemenin kendisi
+        self.pending = 1
+        self.failed = False
+
+
+class TreeDeleter:
+    """
+    Deletes a directory tree on a connector with real directories.
+
+    The calling thread lists the tree depth first with iter_directory, so
+    files are being removed while the listing goes on; `workers` threads
+    call connector._remove for the files. Every directory counts its
+    unfinished children and is removed by whichever thread finishes the
+    last of them, so directories go bottom-up without waiting for the whole
+    walk. A directory with a child that could not be removed is left in
+    place, and so are the directories above it.
+    """
+
+    def __init__(
+        self,
+        connector,
+        workers: int = DELETE_WORKERS,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        abort: Optional[threading.Event] = None,
+    ):
+        self.connector = connector
+        self.workers = max(1, int(workers))
+        self.progress = DeleteProgress(progress_callback)
+        self.abort = abort or threading.Event()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers * BACKLOG_PER_WORKER)
+
+    def run(self, path: str) -> DeleteResult:
+        stack = [_Dir(path, None)]
+        self.progress.found()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                while stack and not self.abort.is_set():
+                    node = stack.pop()
+                    try:
+                        for batch in self.connector.iter_directory(node.path):
+                            for entry in batch:
+                                if self.abort.is_set():
+                                    break
+                                with self._lock:
+                                    node.pending += 1
+                                self.progress.found()
+                                if entry.is_directory:
+                                    stack.append(_Dir(entry.path, node))
+                                else:
+                                    self._slots.acquire()
+                                    pool.submit(self._remove_file, entry.path, node)
+                            if self.abort.is_set():
+                                break
+                    except Exception as e:
+                        self._fail(node, node.path, e)
+                    # Listeleme bitti; klasör artık sadece çocuklarını bekler
+                    self._finish(node)
+        except BaseException:
+            self.abort.set()
+            raise
+        return self.progress.finish()
+
+    def _remove_file(self, path: str, node: _Dir) -> None:
+        try:
+            if self.abort.is_set():
+                return
+            try:
+                self.connector._remove(path, False)
+                self.progress.deleted()
+            except Exception as e:
+                self._fail(node, path, e)
+            self._finish(node)
+        finally:
+            self._slots.release()
+
+    def _fail(self, node: _Dir, path: str, error: Exception) -> None:
+        with self._lock:
+            node.failed = True
+        self.progress.failed(f"{path}: {error}")
+
+    def _finish(self, node: Optional[_Dir]) -> None:
+        """One child of node (or its listing) is done; remove it and walk up while directories empty out."""
+        while node is not None and not self.abort.is_set():
+            with self._lock:
+                node.pending -= 1
+                if node.pending:
+                    return
+                failed = node.failed
+            parent = node.parent
+            if failed:
+                if parent is not None:
+                    with self._lock:
+                        parent.failed = True
+            else:
+                try:
+                    self.connector._remove(node.path, True)
+                    self.progress.deleted()
+                except Exception as e:
+                    if parent is not None:
+                        self._fail(parent, node.path, e)
+                    else:
+                        self.progress.failed(f"{node.path}: {e}")
+            # Klasör kalsa da içinden dosyalar silindi; önbellekteki listesi eskidi
+            self.connector.invalidate_listing(node.path)
+            node = parent
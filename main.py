@@ -13,18 +13,22 @@ from tkinter import messagebox
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
-from connectors import FTPConnector, S3Connector, HAS_SFTP
-try:
-    from connectors import SFTPConnector
-except ImportError:
-    SFTPConnector = None
-from connectors.base import BaseConnector, RemoteFile
-from ui import FilePanel, ConnectionDialog, ProgressDialog
+from connectors import LIMITER, METRICS, DeleteResult, create_connector
+from connectors.base import BaseConnector, RemoteFile, sort_listing
+from connectors.tree_delete import MAX_ERRORS
+from transfer import (
+    JobState, SyncOp, SyncPlanner, TransferJob, TransferQueue, TransferStats, TreeScan, autotune_limits,
+)
+from ui import FilePanel, ConnectionDialog, QueuePanel, SyncDialog, SyncPreviewDialog
+from ui.panels import format_duration, format_rate
 
 
 class CyberDuckApp(ttk.Window):
     """Ana uygulama penceresi."""
 
+    # Bağlayıcı metrikleri bu aralıkla ~/.config/ducktransfer/metrics/ altına yazılır
+    METRICS_INTERVAL_MS = 30_000
+
     def __init__(self):
         super().__init__(
             title="DuckTransfer - FTP, SFTP & S3 İstemcisi",
@@ -34,8 +38,16 @@ class CyberDuckApp(ttk.Window):
         )
         self.connector: BaseConnector | None = None
         self.connection_config: dict | None = None
+        self.transfer_queue: TransferQueue | None = None
+        self._listing_cancel: threading.Event | None = None
+        # Süren klasör silmeleri; bağlantı kesilince durdurulur
+        self._delete_aborts: set[threading.Event] = set()
+        self._transfer_stats: TransferStats | None = None
+        self._refresh_local_after_queue = False
+        self._refresh_remote_after_queue = False
         self._set_icon()
         self._build_ui()
+        self.after(self.METRICS_INTERVAL_MS, self._export_metrics)
 
     def _set_icon(self):
         """Pencere ikonunu ayarla. assets/icon.png dosyasını kullanır."""
@@ -66,10 +78,22 @@ class CyberDuckApp(ttk.Window):
         ttk.Button(toolbar, text="⬆ Yükle", bootstyle=INFO, command=self._upload).pack(side=LEFT, padx=5)
         ttk.Button(toolbar, text="📁 Yeni Klasör", bootstyle=OUTLINE, command=self._create_folder).pack(side=LEFT, padx=5)
         ttk.Button(toolbar, text="🗑 Sil", bootstyle=OUTLINE, command=self._delete).pack(side=LEFT, padx=5)
+        ttk.Button(toolbar, text="🔄 Senkronize Et", bootstyle=OUTLINE, command=self._sync).pack(side=LEFT, padx=5)
 
         self.status_var = ttk.StringVar(value="Hazır - Bağlantı kurmak için 'Yeni Bağlantı' tıklayın")
         ttk.Label(toolbar, textvariable=self.status_var, bootstyle=INVERSE).pack(side=RIGHT, padx=10)
 
+        # Alt kısım - transfer kuyruğu (modal değil, çalışırken gezinmeye devam edilebilir)
+        self.queue_panel = QueuePanel(
+            self,
+            on_cancel=self._cancel_jobs,
+            on_cancel_all=self._cancel_all_jobs,
+            on_clear=self._clear_finished_jobs,
+            on_retry=self._retry_jobs,
+            on_rate_limit=lambda kbps: LIMITER.set_rate(kbps * 1024),
+        )
+        self.queue_panel.pack(side=BOTTOM, fill=X, padx=10, pady=(0, 10))
+
         # Ana içerik - çift panel
         content = ttk.Frame(self)
         content.pack(fill=BOTH, expand=True, padx=10, pady=10)
@@ -106,6 +130,7 @@ class CyberDuckApp(ttk.Window):
             on_navigate=self._on_remote_navigate,
             on_select=self._on_remote_select,
             on_double_click=self._on_remote_double_click,
+            on_refresh=lambda path: self._on_remote_navigate(path, force=True),
         )
         self.remote_panel.pack(fill=BOTH, expand=True, padx=5, pady=5)
         self.remote_panel.load_items([])  # Başlangıçta boş
@@ -123,37 +148,28 @@ class CyberDuckApp(ttk.Window):
             return
 
         config = self.connection_config
-        proto = config.get("protocol", "ftp")
 
         try:
-            if proto in ("ftp", "ftp_ssl"):
-                self.connector = FTPConnector()
-                self.connector.connect(
-                    host=config["host"],
-                    port=config.get("port", 21),
-                    username=config.get("username", ""),
-                    password=config.get("password", ""),
-                    use_ssl=(proto == "ftp_ssl"),
-                )
-                path = self.connector.get_current_path()
-            elif proto == "sftp" and SFTPConnector:
-                self.connector = SFTPConnector()
-                self.connector.connect(
-                    host=config["host"],
-                    port=config.get("port", 22),
-                    username=config.get("username", ""),
-                    password=config.get("password", ""),
-                )
-                path = self.connector.get_current_path()
-            elif proto == "s3":
-                self.connector = S3Connector()
-                self.connector.connect(
-                    access_key=config.get("access_key", ""),
-                    secret_key=config.get("secret_key", ""),
-                    region=config.get("region", "us-east-1"),
-                    bucket=config["bucket"],
-                )
-                path = "" if config.get("protocol") == "s3" else "/"
+            self.connector = create_connector(config)
+            self.connector.enable_listing_cache(
+                max_entries=config.get("listing_cache_size", 256),
+                ttl=config.get("listing_cache_ttl", 30),
+            )
+            path = "" if config.get("protocol") == "s3" else self.connector.get_current_path()
+
+            self.transfer_queue = TransferQueue(
+                self.connector,
+                max_workers=config.get("transfer_workers", 3),
+                on_update=lambda job: self.after(0, lambda: self._on_job_update(job)),
+                on_scan_update=lambda scan: self.after(0, lambda: self._on_scan_update(scan)),
+                # Parça başına değil, saniyede en fazla ~10 kez
+                on_progress=lambda jobs, stats: self.after(0, lambda: self._on_transfer_progress(jobs, stats)),
+                autotune=autotune_limits(config, config.get("transfer_workers", 3)),
+            )
+
+            if config.get("protocol") == "s3":
+                # Uzun süredir dokunulmamış yarım multipart yüklemeleri arka planda temizle
+                threading.Thread(target=self.connector.abort_stale_uploads, daemon=True).start()
 
             display = config.get("host") or config.get("bucket", "S3")
             self.status_var.set(f"Bağlı: {display}")
@@ -163,10 +179,18 @@ class CyberDuckApp(ttk.Window):
             self.connector = None
 
     def _disconnect(self):
+        self._cancel_listing()
+        for abort in self._delete_aborts:
+            abort.set()
+        self._delete_aborts.clear()
+        if self.transfer_queue:
+            self.transfer_queue.shutdown()
+            self.transfer_queue = None
         if self.connector:
             self.connector.disconnect()
             self.connector = None
-        self.remote_panel.load_items([])
+            self._write_metrics()
+        self.remote_panel.finish_loading([])
         self.remote_panel.set_path("/")
         self.status_var.set("Bağlantı kesildi")
 
@@ -189,15 +213,79 @@ class CyberDuckApp(ttk.Window):
             # Dosya seçildi - yükleme için
             pass
 
-    def _on_remote_navigate(self, path: str):
+    def _on_remote_navigate(self, path: str, force: bool = False):
         if not self.connector:
             return
+        connector = self.connector
+
+        def on_refresh(items: list[RemoteFile]):
+            # Önbellekten gösterilen eski liste arka planda yenilendi
+            self.after(0, lambda: self._on_remote_revalidated(connector, path, items))
+
+        if self._listing_cancel:
+            self._listing_cancel.set()
+            self._listing_cancel = None
+        if not force:
+            items = connector.cached_listing(path, on_refresh=on_refresh)
+            if items is not None:
+                self.remote_panel.set_path(path or "/")
+                self.remote_panel.finish_loading(items)
+                return
+
+        # Büyük klasörler parça parça gelir; satırlar geldikçe panele eklenir
+        previous = self.remote_panel.current_path
+        cancel = threading.Event()
+        self._listing_cancel = cancel
+        self.remote_panel.set_path(path or "/")
+        self.remote_panel.begin_loading(on_cancel=self._cancel_listing)
+        threading.Thread(
+            target=self._stream_listing, args=(connector, path, previous, cancel), daemon=True
+        ).start()
+
+    def _stream_listing(self, connector: BaseConnector, path: str, previous: str, cancel: threading.Event):
+        items = []
         try:
-            items = self.connector.list_directory(path)
-            self.remote_panel.set_path(path or "/")
-            self.remote_panel.load_items(items)
+            listing = connector.iter_directory_cached(path)
+            try:
+                for batch in listing:
+                    if cancel.is_set():
+                        return
+                    items.extend(batch)
+                    self.after(0, lambda b=batch: self._on_listing_batch(cancel, b))
+            finally:
+                listing.close()
         except Exception as e:
-            messagebox.showerror("Hata", str(e))
+            error = str(e)
+            self.after(0, lambda: self._on_listing_failed(cancel, previous, error))
+            return
+        self.after(0, lambda: self._on_listing_done(cancel, sort_listing(items)))
+
+    def _on_listing_batch(self, cancel: threading.Event, batch: list[RemoteFile]):
+        if cancel is self._listing_cancel:
+            self.remote_panel.append_items(batch)
+
+    def _on_listing_done(self, cancel: threading.Event, items: list[RemoteFile]):
+        if cancel is self._listing_cancel:
+            self._listing_cancel = None
+            self.remote_panel.finish_loading(items)
+
+    def _on_listing_failed(self, cancel: threading.Event, previous: str, error: str):
+        if cancel is self._listing_cancel:
+            self._listing_cancel = None
+            self.remote_panel.finish_loading(None)
+            self.remote_panel.set_path(previous)
+            messagebox.showerror("Hata", error)
+
+    def _cancel_listing(self):
+        """Süren uzak listelemeyi bırak; gelen satırlar panelde kalır."""
+        if self._listing_cancel:
+            self._listing_cancel.set()
+            self._listing_cancel = None
+            self.remote_panel.finish_loading(None)
+
+    def _on_remote_revalidated(self, connector: BaseConnector, path: str, items: list[RemoteFile]):
+        if connector is self.connector and (self.remote_panel.current_path or "/") == (path or "/"):
+            self.remote_panel.load_items(items)
 
     def _on_remote_select(self, path: str, is_dir: bool):
         pass
@@ -209,74 +297,187 @@ class CyberDuckApp(ttk.Window):
             pass
 
     def _download(self):
-        if not self.connector:
+        if not self.connector or not self.transfer_queue:
             messagebox.showwarning("Uyarı", "Önce bir bağlantı kurun.")
             return
 
-        sel = self.remote_panel.get_selected()
-        if not sel:
+        selected = self.remote_panel.get_selected_items()
+        if not selected:
             messagebox.showwarning("Uyarı", "İndirilecek dosyayı seçin.")
             return
 
-        remote_path, is_dir = sel
-        if is_dir:
-            messagebox.showinfo("Bilgi", "Klasör indirme henüz desteklenmiyor. Sadece dosya seçin.")
-            return
-
         local_dir = self.local_panel.current_path
-        local_path = os.path.join(local_dir, os.path.basename(remote_path))
-
-        prog = ProgressDialog(self, title="İndiriliyor...")
-        prog.update_progress(0, 100, os.path.basename(remote_path))
-
-        def cb(current, total):
-            self.after(0, lambda: prog.update_progress(current, total))
-
-        def do_download():
-            try:
-                self.connector.download_file(remote_path, local_path, progress_callback=cb)
-                self.after(0, lambda: (prog.set_complete(True), prog.destroy(), self._on_local_navigate(local_dir)))
-            except Exception as e:
-                self.after(0, lambda: (prog.destroy(), messagebox.showerror("Hata", str(e))))
-
-        threading.Thread(target=do_download, daemon=True).start()
+        for remote_path, is_dir in selected:
+            local_path = os.path.join(local_dir, os.path.basename(remote_path.rstrip("/")))
+            if is_dir:
+                # Klasör ağacı arka planda taranır, dosyalar bulundukça kuyruğa girer
+                self.transfer_queue.submit_tree("download", remote_path, local_path)
+            else:
+                self.transfer_queue.submit(TransferJob("download", remote_path, local_path))
+        self._refresh_local_after_queue = True
+        self._update_queue_summary()
 
     def _upload(self):
-        if not self.connector:
+        if not self.connector or not self.transfer_queue:
             messagebox.showwarning("Uyarı", "Önce bir bağlantı kurun.")
             return
 
-        sel = self.local_panel.get_selected()
-        if not sel:
+        selected = self.local_panel.get_selected_items()
+        if not selected:
             messagebox.showwarning("Uyarı", "Yüklenecek dosyayı seçin.")
             return
 
-        local_path, is_dir = sel
-        if is_dir:
-            messagebox.showinfo("Bilgi", "Klasör yükleme henüz desteklenmiyor. Sadece dosya seçin.")
-            return
-
         remote_dir = self.remote_panel.current_path
+        for local_path, is_dir in selected:
+            remote_path = self._remote_join(remote_dir, os.path.basename(local_path.rstrip(os.sep)))
+            if is_dir:
+                self.transfer_queue.submit_tree("upload", local_path, remote_path)
+            else:
+                job = TransferJob("upload", local_path, remote_path, size=os.path.getsize(local_path))
+                self.transfer_queue.submit(job)
+        self._refresh_remote_after_queue = True
+        self._update_queue_summary()
+
+    def _remote_join(self, remote_dir: str, name: str) -> str:
+        """Uzak dizin ile dosya adını protokole uygun birleştir."""
         proto = self.connection_config.get("protocol", "") if self.connection_config else ""
         if proto == "s3":
-            remote_path = f"{remote_dir.rstrip('/')}/{os.path.basename(local_path)}".lstrip("/")
-        else:
-            remote_path = f"{remote_dir.rstrip('/')}/{os.path.basename(local_path)}".replace("//", "/") or f"/{os.path.basename(local_path)}"
+            return f"{remote_dir.rstrip('/')}/{name}".lstrip("/")
+        return f"{remote_dir.rstrip('/')}/{name}".replace("//", "/") or f"/{name}"
+
+    def _on_job_update(self, job: TransferJob):
+        self.queue_panel.update_job(job)
+        if job.finished:
+            self._on_queue_progress()
+
+    def _on_scan_update(self, scan: TreeScan):
+        if scan.state == JobState.FAILED:
+            messagebox.showerror("Klasör Aktarım Hatası", f"{scan.name}: {scan.error}")
+        elif scan.direction == "sync" and scan.finished:
+            self.status_var.set(
+                f"Senkronizasyon: {scan.files} aktarım, {scan.deleted} silme, {scan.skipped} değişmemiş"
+            )
+            if scan.failed:
+                messagebox.showwarning(
+                    "Senkronizasyon", f"{scan.failed} adım yapılamadı.\nSon hata: {scan.error}"
+                )
+        self._on_queue_progress()
 
-        prog = ProgressDialog(self, title="Yükleniyor...")
-        prog.update_progress(0, 100, os.path.basename(local_path))
+    def _sync(self):
+        """Yerel ve uzak paneldeki klasörleri karşılaştırıp sadece farkları aktar."""
+        if not self.connector or not self.transfer_queue:
+            messagebox.showwarning("Uyarı", "Önce bir bağlantı kurun.")
+            return
 
-        def cb(current, total):
-            self.after(0, lambda: prog.update_progress(current, total))
+        local_dir = self.local_panel.current_path
+        remote_dir = self.remote_panel.current_path
+        if self.connection_config.get("protocol") == "s3":
+            remote_dir = remote_dir.strip("/")
+
+        def on_start(options: dict):
+            planner = SyncPlanner(
+                self.connector, local_dir, remote_dir,
+                mode=options["mode"], delete=options["delete"], use_etag=options["use_etag"],
+            )
+            self._refresh_local_after_queue = True
+            self._refresh_remote_after_queue = True
+            if options["preview"]:
+                self.status_var.set("Senkronizasyon planı hazırlanıyor...")
+                threading.Thread(target=self._build_sync_preview, args=(planner,), daemon=True).start()
+            else:
+                self.transfer_queue.submit_sync(planner)
+                self._update_queue_summary()
 
-        def do_upload():
-            try:
-                self.connector.upload_file(local_path, remote_path, progress_callback=cb)
-                self.after(0, lambda: (prog.set_complete(True), prog.destroy(), self._on_remote_navigate(remote_dir)))
-            except Exception as e:
-                self.after(0, lambda: (prog.destroy(), messagebox.showerror("Hata", str(e))))
+        SyncDialog(self, local_dir, remote_dir, on_start=on_start)
 
-        threading.Thread(target=do_upload, daemon=True).start()
+    def _build_sync_preview(self, planner: SyncPlanner):
+        try:
+            actions = list(planner.actions())
+        except Exception as e:
+            error = str(e)
+            self.after(0, lambda: messagebox.showerror("Senkronizasyon Hatası", error))
+            return
+        self.after(0, lambda: self._show_sync_preview(planner, actions))
+
+    def _show_sync_preview(self, planner: SyncPlanner, actions: list):
+        self.status_var.set("Senkronizasyon planı hazır")
+        if not actions:
+            messagebox.showinfo("Senkronizasyon", f"Klasörler zaten eşit ({planner.unchanged} dosya).")
+            return
+
+        def on_apply():
+            if self.transfer_queue:
+                todo = [a for a in actions if a.op != SyncOp.CONFLICT]
+                self.transfer_queue.submit_sync(planner, todo)
+                self._update_queue_summary()
+
+        SyncPreviewDialog(self, actions, planner.unchanged, on_apply=on_apply)
+
+    def _on_transfer_progress(self, jobs: list[TransferJob], stats: TransferStats):
+        for job in jobs:
+            self.queue_panel.update_job(job)
+        self._transfer_stats = stats
+        self._update_queue_summary()
+
+    def _update_queue_summary(self) -> tuple[int, int]:
+        if not self.transfer_queue:
+            return 0, 0
+        active = self.transfer_queue.active_count()
+        scanning = self.transfer_queue.scanning_count()
+        if not active:
+            self._transfer_stats = None
+        parts = []
+        if active:
+            parts.append(f"{active} aktif iş")
+            stats = self._transfer_stats
+            if stats and stats.bytes_per_second > 0:
+                parts.append(f"{format_rate(stats.bytes_per_second)}, kalan {format_duration(stats.eta)}")
+        if scanning:
+            parts.append(f"{scanning} klasör taranıyor")
+        self.queue_panel.set_summary(", ".join(parts))
+        return active, scanning
+
+    def _on_queue_progress(self):
+        active, scanning = self._update_queue_summary()
+        if active == 0 and scanning == 0:
+            if self._refresh_local_after_queue:
+                self._refresh_local_after_queue = False
+                self._on_local_navigate(self.local_panel.current_path)
+            if self._refresh_remote_after_queue:
+                self._refresh_remote_after_queue = False
+                self._on_remote_navigate(self.remote_panel.current_path)
+
+    def _find_job(self, job_id: int) -> TransferJob | None:
+        if self.transfer_queue:
+            return self.transfer_queue.get_job(job_id)
+        return None
+
+    def _cancel_jobs(self, job_ids: list[int]):
+        for job_id in job_ids:
+            job = self._find_job(job_id)
+            if job and self.transfer_queue:
+                self.transfer_queue.cancel(job)
+
+    def _retry_jobs(self, job_ids: list[int]):
+        """Hatalı/iptal edilmiş işleri kaldığı yerden devam ettir."""
+        for job_id in job_ids:
+            job = self._find_job(job_id)
+            if job and self.transfer_queue:
+                new_job = self.transfer_queue.retry(job)
+                if new_job:
+                    self.queue_panel.remove_jobs([job])
+                    if job.direction == "download":
+                        self._refresh_local_after_queue = True
+                    else:
+                        self._refresh_remote_after_queue = True
+
+    def _cancel_all_jobs(self):
+        if self.transfer_queue:
+            self.transfer_queue.cancel_all()
+
+    def _clear_finished_jobs(self):
+        if self.transfer_queue:
+            self.queue_panel.remove_jobs(self.transfer_queue.clear_finished())
 
     def _create_folder(self):
         if not self.connector:
@@ -289,11 +490,7 @@ class CyberDuckApp(ttk.Window):
             return
 
         remote_dir = self.remote_panel.current_path
-        proto = self.connection_config.get("protocol", "") if self.connection_config else ""
-        if proto == "s3":
-            path = f"{remote_dir.rstrip('/')}/{name.strip()}".lstrip("/")
-        else:
-            path = f"{remote_dir.rstrip('/')}/{name.strip()}".replace("//", "/") or f"/{name.strip()}"
+        path = self._remote_join(remote_dir, name.strip())
 
         try:
             if self.connector.create_directory(path):
@@ -309,23 +506,83 @@ class CyberDuckApp(ttk.Window):
             messagebox.showwarning("Uyarı", "Önce bir bağlantı kurun.")
             return
 
-        sel = self.remote_panel.get_selected()
-        if not sel:
+        selected = self.remote_panel.get_selected_items()
+        if not selected:
             messagebox.showwarning("Uyarı", "Silinecek öğeyi seçin.")
             return
 
-        path, is_dir = sel
-        if not messagebox.askyesno("Onay", f"'{os.path.basename(path)}' silinsin mi?"):
+        if len(selected) == 1:
+            path, is_dir = selected[0]
+            name = os.path.basename(path.rstrip("/"))
+            question = f"'{name}' ve içindeki her şey silinsin mi?" if is_dir else f"'{name}' silinsin mi?"
+        else:
+            name = f"{len(selected)} öğe"
+            question = f"{name} silinsin mi?"
+            if any(is_dir for _, is_dir in selected):
+                question += " Klasörler içindekilerle birlikte silinir."
+        if not messagebox.askyesno("Onay", question):
             return
 
+        # Büyük ağaçlar dakikalar sürebilir; liste akarken arka planda silinir
+        abort = threading.Event()
+        self._delete_aborts.add(abort)
+        self.status_var.set(f"Siliniyor: {name}")
+        threading.Thread(
+            target=self._delete_items, args=(self.connector, selected, abort), daemon=True
+        ).start()
+
+    def _delete_items(self, connector: BaseConnector, items: list[tuple[str, bool]], abort: threading.Event):
+        total = DeleteResult()
+
+        def progress(deleted, found):
+            done = total.deleted + deleted
+            self.after(0, lambda: self.status_var.set(f"Siliniyor: {done} öğe"))
+
         try:
-            if self.connector.delete(path):
-                self._on_remote_navigate(self.remote_panel.current_path)
-                self.status_var.set("Silindi")
-            else:
-                messagebox.showerror("Hata", "Silinemedi.")
+            for path, is_dir in items:
+                if abort.is_set():
+                    break
+                if is_dir:
+                    result = connector.delete_tree(path, progress, abort=abort)
+                else:
+                    result = DeleteResult(found=1)
+                    if connector.delete(path):
+                        result.deleted = 1
+                    else:
+                        result.failed = 1
+                        result.errors.append(f"{path}: Silinemedi")
+                total.found += result.found
+                total.deleted += result.deleted
+                total.failed += result.failed
+                total.errors.extend(result.errors)
         except Exception as e:
-            messagebox.showerror("Hata", str(e))
+            error = str(e)
+            self.after(0, lambda: self._on_items_deleted(connector, abort, None, error))
+            return
+        self.after(0, lambda: self._on_items_deleted(connector, abort, total, ""))
+
+    def _on_items_deleted(self, connector: BaseConnector, abort: threading.Event, result: DeleteResult | None, error: str):
+        self._delete_aborts.discard(abort)
+        if connector is not self.connector:
+            return
+        self._on_remote_navigate(self.remote_panel.current_path)
+        if error:
+            messagebox.showerror("Hata", error)
+        elif not result.ok:
+            self.status_var.set(f"Silindi: {result.deleted} öğe, {result.failed} hata")
+            messagebox.showerror("Hata", f"{result.failed} öğe silinemedi:\n" + "\n".join(result.errors[:MAX_ERRORS]))
+        else:
+            self.status_var.set(f"Silindi: {result.deleted} öğe")
+
+    def _export_metrics(self):
+        self._write_metrics()
+        self.after(self.METRICS_INTERVAL_MS, self._export_metrics)
+
+    def _write_metrics(self):
+        try:
+            METRICS.write_files()
+        except OSError:
+            pass
 
 
 def main():
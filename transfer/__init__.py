@@ -0,0 +1,15 @@
+"""Background transfer queue and helpers."""
+
+from .autotune import Autotuner, TuningLimits, autotune_limits
+from .transfer_queue import JobState, TransferCancelled, TransferJob, TransferQueue, TreeScan
+from .progress import ProgressAggregator, RateMeter, TransferStats
+from .sync import SyncAction, SyncMode, SyncOp, SyncPlanner
+from .walker import join_remote, list_local, walk_local, walk_remote
+
+__all__ = [
+    "Autotuner", "TuningLimits", "autotune_limits",
+    "JobState", "TransferCancelled", "TransferJob", "TransferQueue", "TreeScan",
+    "ProgressAggregator", "RateMeter", "TransferStats",
+    "SyncAction", "SyncMode", "SyncOp", "SyncPlanner",
+    "join_remote", "list_local", "walk_local", "walk_remote",
+]
@@ -0,0 +1,217 @@
+"""Adaptive concurrency: tune parallel streams and range sizes from connector metrics."""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from connectors.base import BaseConnector
+from connectors.metrics import TRANSFERS, _labels
+
+MB = 1024 * 1024
+
+# Örnekleme aralığı (saniye); her adımda en fazla bir ayar değişir
+INTERVAL = 3.0
+# Bir artış ancak toplam hızı bu oranda artırdıysa kalıcı olur
+GAIN = 0.05
+# Sunucu reddederse (FTP 421, S3 SlowDown/503) yarıya, hata oranı yüksekse dörtte üçe in
+THROTTLE_BACKOFF = 0.5
+ERROR_BACKOFF = 0.75
+ERROR_RATE = 0.1
+# Geri çekilmeden sonra bu kadar adım yeniden artırma denenmez
+HOLD = 3
+# Bir aralık tek akışta yaklaşık bu kadar saniye sürsün
+RANGE_SECONDS = 4.0
+# Kullanıcının iptal ettiği işler hata sayılmaz
+IGNORED_ERRORS = ("TransferCancelled",)
+
+
+@dataclass
+class TuningLimits:
+    """Bounds the autotuner stays within; segments is capped by what the connector was set up with."""
+    min_workers: int = 1
+    max_workers: int = 8
+    min_segments: int = 1
+    max_segments: Optional[int] = None
+    min_segment_size: int = 8 * MB
+    max_segment_size: int = 256 * MB
+
+
+def autotune_limits(config: dict, workers: int) -> Optional[TuningLimits]:
+    """TuningLimits for a connection profile with "autotune" on, otherwise None."""
+    if not config.get("autotune", False):
+        return None
+    return TuningLimits(max_workers=max(workers, config.get("autotune_max_workers", 8)))
+
+
+class AIMD:
+    """An integer setting that grows by one step and shrinks by a factor, within [low, high]."""
+
+    def __init__(self, value: int, low: int, high: int):
+        self.low = max(1, low)
+        self.high = max(self.low, high)
+        self.value = min(self.high, max(self.low, value))
+
+    def increase(self) -> bool:
+        if self.value >= self.high:
+            return False
+        self.value += 1
+        return True
+
+    def decrease(self, factor: float = 0.0) -> bool:
+        """Multiply by factor, or step down by one when factor is 0."""
+        new = int(self.value * factor) if factor else self.value - 1
+        new = max(self.low, new)
+        changed = new != self.value
+        self.value = new
+        return changed
+
+
+class Autotuner:
+    """
+    Adjusts the number of parallel jobs and per-file segments of one
+    connection while transfers run.
+
+    Every INTERVAL seconds the connector's counters in the metrics registry
+    are sampled: bytes moved by the data loops, finished and failed
+    transfers, and refusals (FTP 421, S3 SlowDown/503, SFTP channel limit).
+    A refusal halves both settings, a high error rate cuts them by a
+    quarter. Otherwise one setting is raised by one (jobs while more jobs
+    are waiting than running, segments otherwise) and the raise is kept
+    only if total throughput went up by GAIN; a raise that did not pay off
+    is taken back. The range size follows per-stream throughput so one
+    range takes about RANGE_SECONDS.
+
+    on_workers(n) is called when the job count changes; busy() tells how
+    many jobs are queued or running, and sampling pauses while it is 0.
+    """
+
+    def __init__(
+        self,
+        connector: BaseConnector,
+        limits: TuningLimits,
+        workers: int,
+        on_workers: Callable[[int], None],
+        busy: Callable[[], int],
+        interval: float = INTERVAL,
+    ):
+        self.connector = connector
+        self.limits = limits
+        self.on_workers = on_workers
+        self.busy = busy
+        self.interval = interval
+        segments, segment_size = connector.parallelism()
+        self.workers = AIMD(workers, limits.min_workers, limits.max_workers)
+        self.segments = AIMD(segments, limits.min_segments, limits.max_segments or segments)
+        self.segment_size = segment_size
+        self._last: Optional[tuple[float, float, float, float, float]] = None
+        self._probe: Optional[AIMD] = None
+        self._probe_rate = 0.0
+        self._hold = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if not self.busy():
+                # Boşta ölçülen hız anlamsız; yeni işler gelince taban baştan alınır
+                self._last, self._probe = None, None
+                continue
+            try:
+                self.step()
+            except Exception:
+                pass
+
+    def _sample(self) -> tuple[float, float, float, float, float]:
+        """(time, stream bytes, finished transfers, failed transfers, refusals) so far."""
+        protocol, host = _labels(self.connector)
+        moved = ops = errors = throttled = 0.0
+        for c in self.connector.metrics.snapshot()["counters"]:
+            labels = c["labels"]
+            if labels.get("protocol") != protocol or labels.get("host") != host:
+                continue
+            name = c["name"]
+            if name == "ducktransfer_stream_bytes_total":
+                moved += c["value"]
+            elif name == "ducktransfer_throttled_total":
+                throttled += c["value"]
+            elif labels.get("op") not in TRANSFERS:
+                continue
+            elif name == "ducktransfer_operations_total":
+                ops += c["value"]
+            elif name == "ducktransfer_errors_total" and labels.get("error") not in IGNORED_ERRORS:
+                errors += c["value"]
+        return time.monotonic(), moved, ops, errors, throttled
+
+    def step(self) -> Optional[str]:
+        """Take one sample and adjust; returns what was done, or None."""
+        sample = self._sample()
+        last, self._last = self._last, sample
+        if last is None or sample[0] <= last[0]:
+            return None
+        seconds = sample[0] - last[0]
+        rate = (sample[1] - last[1]) / seconds
+        ops, errors, throttled = (sample[i] - last[i] for i in (2, 3, 4))
+
+        if throttled > 0:
+            action = self._back_off(THROTTLE_BACKOFF, "throttled")
+        elif ops > 0 and errors / ops > ERROR_RATE:
+            action = self._back_off(ERROR_BACKOFF, "errors")
+        elif self._hold > 0:
+            self._hold -= 1
+            action = None
+        elif self._probe is not None and rate < self._probe_rate * (1 + GAIN):
+            # Son artış hızı yükseltmedi: geri al ve bir süre bekle
+            self._probe.decrease()
+            self._probe, self._hold = None, HOLD
+            action = "plateau"
+        else:
+            action = self._increase(rate)
+
+        self._size_ranges(rate)
+        self._apply()
+        if action:
+            protocol, host = _labels(self.connector)
+            self.connector.metrics.inc(
+                "ducktransfer_autotune_total", {"protocol": protocol, "host": host, "action": action}
+            )
+        return action
+
+    def _back_off(self, factor: float, action: str) -> str:
+        self.workers.decrease(factor)
+        self.segments.decrease(factor)
+        self._probe, self._hold = None, HOLD
+        return action
+
+    def _increase(self, rate: float) -> Optional[str]:
+        # Bekleyen iş varsa önce iş sayısı, yoksa dosya başına segment denenir
+        knobs = (self.workers, self.segments)
+        if self.busy() <= self.workers.value:
+            knobs = knobs[::-1]
+        for knob in knobs:
+            if knob.increase():
+                self._probe, self._probe_rate = knob, rate
+                return "increase"
+        self._probe = None
+        return None
+
+    def _size_ranges(self, rate: float) -> None:
+        if rate <= 0 or self.segments.value <= 1:
+            return
+        per_stream = rate / (self.workers.value * self.segments.value)
+        size = int(per_stream * RANGE_SECONDS) // MB * MB
+        self.segment_size = min(self.limits.max_segment_size, max(self.limits.min_segment_size, size))
+
+    def _apply(self) -> None:
+        self.connector.set_parallelism(self.segments.value, self.segment_size)
+        self.on_workers(self.workers.value)
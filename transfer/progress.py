@@ -0,0 +1,120 @@
+"""Rate-limited progress reporting with throughput and ETA."""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+@dataclass
+class TransferStats:
+    """Totals over all running jobs at one sampling instant."""
+    active: int = 0
+    bytes_per_second: float = 0.0
+    remaining_bytes: int = 0
+
+    @property
+    def eta(self) -> Optional[float]:
+        if self.bytes_per_second <= 0:
+            return None
+        return self.remaining_bytes / self.bytes_per_second
+
+
+class RateMeter:
+    """Exponentially weighted moving average of a byte counter, in bytes/s."""
+
+    def __init__(self, window: float = 3.0):
+        self.window = window
+        self.rate = 0.0
+        self._primed = False
+        self._last_bytes: Optional[int] = None
+        self._last_time = 0.0
+
+    def update(self, total_bytes: int, now: float) -> float:
+        if self._last_bytes is None or total_bytes < self._last_bytes:
+            self._last_bytes, self._last_time = total_bytes, now
+            return self.rate
+        dt = now - self._last_time
+        if dt <= 0:
+            return self.rate
+        instant = (total_bytes - self._last_bytes) / dt
+        if not self._primed:
+            # İlk ölçüm sıfırdan tırmanmasın, doğrudan başlangıç değeri olsun
+            self.rate, self._primed = instant, True
+        else:
+            alpha = 1 - math.exp(-dt / self.window)
+            self.rate += alpha * (instant - self.rate)
+        self._last_bytes, self._last_time = total_bytes, now
+        return self.rate
+
+
+class ProgressAggregator:
+    """
+    Sits between the per-chunk progress callbacks and the UI.
+
+    report() only marks a job as changed, so it is cheap enough to call for
+    every block. A sampler thread wakes every interval, updates the moving
+    throughput of each running job and calls on_flush(jobs, stats) once with
+    everything that changed; nothing is delivered more often than that.
+    """
+
+    def __init__(self, on_flush: Callable[[list, TransferStats], None], interval: float = 0.1, window: float = 3.0):
+        self.on_flush = on_flush
+        self.interval = interval
+        self.window = window
+        self._tracked: dict[int, tuple] = {}
+        self._dirty: set[int] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def report(self, job) -> None:
+        with self._lock:
+            if job.id not in self._tracked:
+                self._tracked[job.id] = (job, RateMeter(self.window))
+            self._dirty.add(job.id)
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._sample, daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def finish(self, job) -> None:
+        """Stop tracking a job that is no longer running."""
+        with self._lock:
+            self._tracked.pop(job.id, None)
+            self._dirty.discard(job.id)
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+
+    def _sample(self) -> None:
+        while not self._closed:
+            # Boştayken uyu, ilk rapor gelince uyan
+            self._wake.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                tracked = list(self._tracked.values())
+                dirty, self._dirty = self._dirty, set()
+                if not tracked:
+                    self._wake.clear()
+            if not tracked:
+                continue
+
+            now = time.monotonic()
+            stats = TransferStats(active=len(tracked))
+            changed = []
+            for job, meter in tracked:
+                before = job.rate
+                job.rate = meter.update(job.transferred, now)
+                stats.bytes_per_second += job.rate
+                stats.remaining_bytes += max(0, job.size - job.transferred)
+                if job.id in dirty or abs(job.rate - before) > 1:
+                    changed.append(job)
+            if changed:
+                try:
+                    self.on_flush(changed, stats)
+                except Exception:
+                    pass
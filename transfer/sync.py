@@ -0,0 +1,241 @@
+"""Mirror a local and a remote directory tree by moving only what changed."""
+
+import hashlib
+import os
+from dataclasses import dataclass
+from enum import Enum
+from typing import Iterator, Optional
+
+from connectors.base import BaseConnector, RemoteFile
+from .walker import join_remote, list_local
+
+
+# FTP MDTM ve FAT dosya sistemleri saniye/2 saniye hassasiyetinde
+MTIME_TOLERANCE = 2.0
+
+
+class SyncMode(str, Enum):
+    """Which side is the source of truth."""
+    UPLOAD = "upload"      # yerel → uzak
+    DOWNLOAD = "download"  # uzak → yerel
+    BOTH = "both"          # iki yönlü, daha yeni olan kazanır
+
+
+class SyncOp(str, Enum):
+    UPLOAD = "upload"
+    DOWNLOAD = "download"
+    MKDIR_REMOTE = "mkdir_remote"
+    MKDIR_LOCAL = "mkdir_local"
+    DELETE_REMOTE = "delete_remote"
+    DELETE_LOCAL = "delete_local"
+    CONFLICT = "conflict"
+
+
+@dataclass
+class SyncAction:
+    """One step of a sync plan."""
+    op: SyncOp
+    rel: str
+    local_path: str
+    remote_path: str
+    size: int = 0
+    is_directory: bool = False
+    reason: str = ""
+    # Kaynak kopyanın değişme zamanı; aktarımdan sonra hedefe de verilir
+    mtime: Optional[float] = None
+
+
+def _entry_name(entry: RemoteFile) -> str:
+    return entry.name.strip("/")
+
+
+def etag_matches(local_path: str, etag: Optional[str]) -> Optional[bool]:
+    """
+    Compare a local file with an S3 ETag. Only single-part ETags are plain
+    MD5 digests; for anything else None is returned (unknown).
+    """
+    if not etag:
+        return None
+    etag = etag.strip('"')
+    if len(etag) != 32 or "-" in etag:
+        return None
+    md5 = hashlib.md5()
+    with open(local_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            md5.update(chunk)
+    return md5.hexdigest() == etag
+
+
+class SyncPlanner:
+    """
+    Compares a local and a remote tree one directory at a time and yields the
+    actions needed to make the destination match the source.
+
+    Only one directory listing per side is held in memory at once. A file is
+    considered changed when its size differs or the source copy is newer than
+    the destination copy; when the remote side carries a single-part S3 ETag,
+    a same-size file that only looks newer is checked against the local MD5
+    before it is re-sent. In BOTH mode nothing is deleted and the newer side
+    wins; files whose age cannot be told apart are reported as conflicts.
+    Transfer actions carry the source's mtime so the queue can give it to
+    the copy; otherwise every copy would look newer than its source on the
+    next run and BOTH mode would send it back.
+    """
+
+    def __init__(
+        self,
+        connector: BaseConnector,
+        local_root: str,
+        remote_root: str,
+        mode: SyncMode = SyncMode.UPLOAD,
+        delete: bool = False,
+        use_etag: bool = True,
+    ):
+        self.connector = connector
+        self.local_root = local_root
+        self.remote_root = remote_root
+        self.mode = SyncMode(mode)
+        self.delete = delete and self.mode != SyncMode.BOTH
+        self.use_etag = use_etag
+        self.unchanged = 0
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+    def actions(self) -> Iterator[SyncAction]:
+        local_exists = os.path.isdir(self.local_root)
+        try:
+            root_listing = self.connector.list_directory(self.remote_root)
+            remote_exists = True
+        except Exception:
+            root_listing, remote_exists = [], False
+
+        if not local_exists and self.mode != SyncMode.UPLOAD:
+            yield SyncAction(SyncOp.MKDIR_LOCAL, "", self.local_root, self.remote_root, is_directory=True)
+            local_exists = True
+        elif not remote_exists and self.mode != SyncMode.DOWNLOAD:
+            yield SyncAction(SyncOp.MKDIR_REMOTE, "", self.local_root, self.remote_root, is_directory=True)
+            remote_exists = True
+
+        stack = [("", self.local_root, self.remote_root, local_exists, remote_exists)]
+        while stack and not self.cancelled:
+            rel, local_dir, remote_dir, has_local, has_remote = stack.pop()
+            local = {e.name: e for e in list_local(local_dir)} if has_local else {}
+            if not rel:
+                listing = root_listing
+            else:
+                listing = self.connector.list_directory(remote_dir) if has_remote else []
+            remote = {_entry_name(e): e for e in listing}
+
+            for name in sorted(set(local) | set(remote)):
+                if self.cancelled:
+                    return
+                child_rel = f"{rel}/{name}" if rel else name
+                l, r = local.get(name), remote.get(name)
+                local_path = l.path if l else os.path.join(local_dir, name)
+                remote_path = r.path if r else join_remote(remote_dir, name)
+                if r and r.is_directory:
+                    remote_path = remote_path.rstrip("/") if self.connector.needs_directories else remote_path
+
+                if (l and l.is_directory) or (r and r.is_directory):
+                    if l and r and l.is_directory != r.is_directory:
+                        yield SyncAction(SyncOp.CONFLICT, child_rel, local_path, remote_path, reason="Dosya/klasör çakışması")
+                        continue
+                    yield from self._directory(child_rel, local_path, remote_path, l, r, stack)
+                else:
+                    yield from self._file(child_rel, local_path, remote_path, l, r)
+
+    def _directory(self, rel, local_path, remote_path, l, r, stack) -> Iterator[SyncAction]:
+        if l and not r:
+            if self.mode == SyncMode.DOWNLOAD:
+                if self.delete:
+                    yield from self._delete_tree(rel, local_path, remote_path, remote_side=False)
+                return
+            yield SyncAction(SyncOp.MKDIR_REMOTE, rel, local_path, remote_path, is_directory=True, reason="Yeni klasör")
+        elif r and not l:
+            if self.mode == SyncMode.UPLOAD:
+                if self.delete:
+                    yield from self._delete_tree(rel, local_path, remote_path, remote_side=True)
+                return
+            yield SyncAction(SyncOp.MKDIR_LOCAL, rel, local_path, remote_path, is_directory=True, reason="Yeni klasör")
+        stack.append((rel, local_path, remote_path, l is not None, r is not None))
+
+    def _file(self, rel, local_path, remote_path, l, r) -> Iterator[SyncAction]:
+        if l and not r:
+            if self.mode == SyncMode.DOWNLOAD:
+                if self.delete:
+                    yield SyncAction(SyncOp.DELETE_LOCAL, rel, local_path, remote_path, l.size, reason="Kaynakta yok")
+            else:
+                yield SyncAction(SyncOp.UPLOAD, rel, local_path, remote_path, l.size, reason="Yeni dosya", mtime=l.mtime)
+            return
+        if r and not l:
+            if self.mode == SyncMode.UPLOAD:
+                if self.delete:
+                    yield SyncAction(SyncOp.DELETE_REMOTE, rel, local_path, remote_path, r.size, reason="Kaynakta yok")
+            else:
+                yield SyncAction(SyncOp.DOWNLOAD, rel, local_path, remote_path, r.size, reason="Yeni dosya", mtime=r.mtime)
+            return
+
+        newer = self._newer(l, r)
+        if self.mode == SyncMode.BOTH:
+            if l.size == r.size and newer is None:
+                self.unchanged += 1
+            elif newer == "local" and not self._same_content(l, r):
+                yield SyncAction(SyncOp.UPLOAD, rel, local_path, remote_path, l.size, reason="Yerel daha yeni", mtime=l.mtime)
+            elif newer == "remote" and not self._same_content(l, r):
+                yield SyncAction(SyncOp.DOWNLOAD, rel, local_path, remote_path, r.size, reason="Uzak daha yeni", mtime=r.mtime)
+            elif newer is None:
+                yield SyncAction(SyncOp.CONFLICT, rel, local_path, remote_path, reason="Boyut farklı, tarih belirsiz")
+            else:
+                self.unchanged += 1
+            return
+
+        src, src_side = (l, "local") if self.mode == SyncMode.UPLOAD else (r, "remote")
+        op = SyncOp.UPLOAD if self.mode == SyncMode.UPLOAD else SyncOp.DOWNLOAD
+        if l.size != r.size:
+            yield SyncAction(op, rel, local_path, remote_path, src.size, reason="Boyut farklı", mtime=src.mtime)
+        elif newer == src_side and not self._same_content(l, r):
+            yield SyncAction(op, rel, local_path, remote_path, src.size, reason="Kaynak daha yeni", mtime=src.mtime)
+        else:
+            self.unchanged += 1
+
+    def _newer(self, l: RemoteFile, r: RemoteFile) -> Optional[str]:
+        if l.mtime is None or r.mtime is None:
+            return None
+        if l.mtime > r.mtime + MTIME_TOLERANCE:
+            return "local"
+        if r.mtime > l.mtime + MTIME_TOLERANCE:
+            return "remote"
+        return None
+
+    def _same_content(self, l: RemoteFile, r: RemoteFile) -> bool:
+        if not self.use_etag or l.size != r.size:
+            return False
+        try:
+            return bool(etag_matches(l.path, r.etag))
+        except OSError:
+            return False
+
+    def _delete_tree(self, rel, local_path, remote_path, remote_side: bool) -> Iterator[SyncAction]:
+        """Delete actions for a whole extraneous directory, contents first."""
+        if remote_side:
+            entries = self.connector.list_directory(remote_path)
+        else:
+            entries = list_local(local_path)
+        for entry in entries:
+            name = _entry_name(entry)
+            child_rel = f"{rel}/{name}"
+            child_local = os.path.join(local_path, name)
+            child_remote = entry.path if remote_side else join_remote(remote_path, name)
+            if entry.is_directory:
+                if remote_side and self.connector.needs_directories:
+                    child_remote = child_remote.rstrip("/")
+                yield from self._delete_tree(child_rel, child_local, child_remote, remote_side)
+            else:
+                op = SyncOp.DELETE_REMOTE if remote_side else SyncOp.DELETE_LOCAL
+                yield SyncAction(op, child_rel, child_local, child_remote, entry.size, reason="Kaynakta yok")
+        # S3'te klasör sadece önektir; içi boşalınca kendiliğinden kaybolur
+        if not remote_side or self.connector.needs_directories:
+            op = SyncOp.DELETE_REMOTE if remote_side else SyncOp.DELETE_LOCAL
+            yield SyncAction(op, rel, local_path, remote_path, is_directory=True, reason="Kaynakta yok")
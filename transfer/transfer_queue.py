@@ -0,0 +1,543 @@
+"""Worker-pool based transfer queue."""
+
+import itertools
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Iterable, Optional
+
+from connectors.base import BaseConnector
+from connectors.ratelimit import BULK, INTERACTIVE, PRIORITIES, PRIORITY
+from .autotune import Autotuner, TuningLimits
+from .progress import ProgressAggregator, TransferStats
+from .sync import SyncAction, SyncMode, SyncOp, SyncPlanner
+from .walker import join_remote, walk_local, walk_remote
+
+
+class JobState(str, Enum):
+    """Lifecycle state of a transfer job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class TransferCancelled(Exception):
+    """Raised from a progress callback to abort a running transfer."""
+
+
+_job_ids = itertools.count(1)
+
+
+@dataclass
+class TransferJob:
+    """
+    A single file transfer. direction is "download" or "upload".
+
+    With resume=True an interrupted earlier attempt is continued where the
+    connector can prove the source is unchanged. priority is INTERACTIVE for
+    files the user picked one by one and BULK for files found by a tree walk
+    or sync; interactive jobs are started first and get the larger share
+    of a bandwidth cap.
+
+    mtime, when set, is given to the destination once the transfer is done.
+    With touch_source an upload to a backend that cannot set mtimes (S3)
+    moves the local file's mtime to the remote copy's instead, so a two-way
+    sync sees both copies as the same age either way.
+    """
+    direction: str
+    source: str
+    destination: str
+    size: int = 0
+    transferred: int = 0
+    resume: bool = True
+    priority: str = INTERACTIVE
+    mtime: Optional[float] = None
+    touch_source: bool = False
+    state: JobState = JobState.QUEUED
+    error: Optional[str] = None
+    rate: float = 0.0
+    id: int = field(default_factory=lambda: next(_job_ids))
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.source.rstrip("/")) or self.source
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds left at the current moving-average rate, if known."""
+        if self.rate <= 0 or self.size <= 0:
+            return None
+        return max(0, self.size - self.transferred) / self.rate
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (JobState.DONE, JobState.FAILED, JobState.CANCELLED)
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+
+@dataclass
+class TreeScan:
+    """A recursive transfer whose tree is walked while its files are being moved."""
+    direction: str
+    source: str
+    destination: str
+    files: int = 0
+    directories: int = 0
+    deleted: int = 0
+    skipped: int = 0
+    # Sync'te yapılamayan adımlar (ör. silinemeyen dosya); error sonuncuyu tutar
+    failed: int = 0
+    state: JobState = JobState.RUNNING
+    error: Optional[str] = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.source.rstrip("/")) or self.source
+
+    @property
+    def finished(self) -> bool:
+        return self.state != JobState.RUNNING
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+
+class TransferQueue:
+    """
+    Runs queued transfer jobs on up to max_workers threads.
+
+    All workers share one connector; connectors lease a pooled session per
+    operation, so concurrent jobs never share a control channel.
+    on_update(job) is called from worker threads whenever a job changes
+    state; on_scan_update(scan) likewise for recursive tree walks. Byte
+    progress is sampled at most every progress_interval seconds and
+    delivered as on_progress(jobs, stats), or through on_update when no
+    on_progress is given.
+
+    With autotune the worker count (and the connector's segments) is
+    adjusted while jobs run, within the given limits; see Autotuner.
+
+    Jobs are counted per state as they change, so the counts are cheap to
+    ask for on every update. Only the last MAX_FINISHED finished jobs are
+    kept; older ones are forgotten but stay in counts().
+    """
+
+    # Ağaç taraması, kuyrukta bu kadar iş birikince worker'ların yetişmesini bekler
+    MAX_BACKLOG = 1000
+    # Bu kadardan eski biten işler unutulur; on binlerce dosyalık ağaçta liste büyümesin
+    MAX_FINISHED = 1000
+    # Kapatma işaretleri (None) her öncelikteki işten sonra sıralanır
+    _STOP = len(PRIORITIES)
+
+    def __init__(
+        self,
+        connector: BaseConnector,
+        max_workers: int = 3,
+        on_update: Optional[Callable[[TransferJob], None]] = None,
+        on_scan_update: Optional[Callable[[TreeScan], None]] = None,
+        on_progress: Optional[Callable[[list[TransferJob], TransferStats], None]] = None,
+        progress_interval: float = 0.1,
+        autotune: Optional[TuningLimits] = None,
+    ):
+        self.connector = connector
+        self.max_workers = max(1, int(max_workers))
+        self.on_update = on_update
+        self.on_scan_update = on_scan_update
+        self.on_progress = on_progress
+        self._progress = ProgressAggregator(self._flush_progress, interval=progress_interval)
+        # (öncelik sırası, geliş sırası, iş): aynı öncelikte FIFO
+        self._pending: "queue.PriorityQueue[tuple[int, int, Optional[TransferJob]]]" = queue.PriorityQueue()
+        self._order = itertools.count()
+        # Gönderilme sırasıyla; biten işler _finished'da bitiş sırasıyla da tutulur
+        self._jobs: dict[int, TransferJob] = {}
+        self._finished: dict[int, None] = {}
+        self._counts = {state: 0 for state in JobState}
+        self._done_bytes = 0
+        # Sadece yürüyen taramalar
+        self._scans: list[TreeScan] = []
+        self._workers: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._tuner: Optional[Autotuner] = None
+        if autotune is not None:
+            self._tuner = Autotuner(
+                connector, autotune, self.max_workers, on_workers=self.set_max_workers, busy=self.active_count
+            )
+
+    def submit(self, job: TransferJob) -> TransferJob:
+        """Queue a job and start another worker if the pool is not full."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Transfer kuyruğu kapatıldı")
+            self._jobs[job.id] = job
+            self._counts[job.state] += 1
+            if job.finished:
+                self._track_finished(job)
+            if len(self._workers) < self.max_workers:
+                self._start_worker()
+        self._pending.put((PRIORITIES.index(job.priority), next(self._order), job))
+        if self._tuner:
+            self._tuner.start()
+        self._notify(job)
+        return job
+
+    def set_max_workers(self, max_workers: int) -> None:
+        """Change how many jobs run at once; surplus workers stop after their current job."""
+        with self._lock:
+            self.max_workers = max(1, int(max_workers))
+            while len(self._workers) < self.max_workers and not self._closed and not self._pending.empty():
+                self._start_worker()
+
+    def _start_worker(self) -> None:
+        t = threading.Thread(target=self._worker, daemon=True)
+        self._workers.append(t)
+        t.start()
+
+    def jobs(self) -> list[TransferJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def get_job(self, job_id: int) -> Optional[TransferJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def active_count(self) -> int:
+        """Number of jobs that are queued or running."""
+        with self._lock:
+            return self._counts[JobState.QUEUED] + self._counts[JobState.RUNNING]
+
+    def scanning_count(self) -> int:
+        """Number of recursive transfers still walking their tree."""
+        with self._lock:
+            return len(self._scans)
+
+    def counts(self) -> dict[JobState, int]:
+        """Jobs per state, including finished jobs that have since been forgotten; retried jobs count once."""
+        with self._lock:
+            return dict(self._counts)
+
+    def done_bytes(self) -> int:
+        """Bytes moved by the jobs counted as done."""
+        with self._lock:
+            return self._done_bytes
+
+    def submit_tree(self, direction: str, source: str, destination: str) -> TreeScan:
+        """
+        Transfer a directory recursively. The tree is walked on its own thread;
+        each directory is created on the destination side before its files
+        are queued, and files start moving while the walk is still going.
+        """
+        scan = TreeScan(direction, source, destination)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Transfer kuyruğu kapatıldı")
+            self._scans.append(scan)
+        threading.Thread(target=self._walk, args=(scan,), daemon=True).start()
+        return scan
+
+    def cancel(self, job: TransferJob) -> None:
+        job.cancel()
+        if self._set_state(job, JobState.CANCELLED, expect=JobState.QUEUED):
+            self._notify(job)
+
+    def submit_sync(self, planner: SyncPlanner, actions: Optional[Iterable[SyncAction]] = None) -> TreeScan:
+        """
+        Run a sync plan. By default the planner is consumed while it walks both
+        trees, so transfers begin before the comparison is finished; a plan
+        that was previewed earlier can be passed as actions instead.
+        """
+        scan = TreeScan("sync", planner.local_root, planner.remote_root)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Transfer kuyruğu kapatıldı")
+            self._scans.append(scan)
+        if actions is None:
+            actions = planner.actions()
+        threading.Thread(target=self._sync, args=(scan, planner, actions), daemon=True).start()
+        return scan
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            scans = list(self._scans)
+        for scan in scans:
+            scan.cancel()
+        for job in self.jobs():
+            if not job.finished:
+                self.cancel(job)
+
+    def retry(self, job: TransferJob) -> Optional[TransferJob]:
+        """Queue a failed or cancelled job again; it resumes where it stopped."""
+        if job.state not in (JobState.FAILED, JobState.CANCELLED):
+            return None
+        with self._lock:
+            if self._jobs.pop(job.id, None) is not None:
+                self._counts[job.state] -= 1
+                self._finished.pop(job.id, None)
+        return self.submit(TransferJob(
+            job.direction, job.source, job.destination, size=job.size, resume=True, priority=job.priority,
+            mtime=job.mtime, touch_source=job.touch_source,
+        ))
+
+    def clear_finished(self) -> list[TransferJob]:
+        """Forget finished jobs and return them."""
+        with self._lock:
+            done = [self._jobs.pop(job_id) for job_id in self._finished]
+            self._finished.clear()
+        return done
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel everything and stop the workers."""
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        self.cancel_all()
+        self._progress.close()
+        if self._tuner:
+            self._tuner.stop()
+        for _ in workers:
+            self._pending.put((self._STOP, next(self._order), None))
+        if wait:
+            for t in workers:
+                t.join()
+
+    def _walk(self, scan: TreeScan) -> None:
+        try:
+            if scan.direction == "download":
+                entries = walk_remote(self.connector, scan.source)
+                os.makedirs(scan.destination, exist_ok=True)
+            else:
+                entries = walk_local(scan.source)
+                if self.connector.needs_directories:
+                    self.connector.create_directory(scan.destination)
+
+            for rel, entry in entries:
+                if scan.cancelled:
+                    break
+                if scan.direction == "download":
+                    target = os.path.join(scan.destination, *rel.split("/"))
+                else:
+                    target = join_remote(scan.destination, rel)
+
+                if entry.is_directory:
+                    if scan.direction == "download":
+                        os.makedirs(target, exist_ok=True)
+                    elif self.connector.needs_directories:
+                        self.connector.create_directory(target)
+                    scan.directories += 1
+                else:
+                    while self._pending.qsize() >= self.MAX_BACKLOG and not scan.cancelled:
+                        time.sleep(0.05)
+                    self.submit(TransferJob(scan.direction, entry.path, target, size=entry.size, priority=BULK))
+                    scan.files += 1
+                if (scan.files + scan.directories) % 100 == 0:
+                    self._notify_scan(scan)
+            scan.state = JobState.CANCELLED if scan.cancelled else JobState.DONE
+        except Exception as e:
+            if scan.cancelled:
+                scan.state = JobState.CANCELLED
+            else:
+                scan.state = JobState.FAILED
+                scan.error = str(e)
+        self._end_scan(scan)
+
+    def _sync(self, scan: TreeScan, planner: SyncPlanner, actions: Iterable[SyncAction]) -> None:
+        try:
+            for action in actions:
+                if scan.cancelled:
+                    planner.cancel()
+                    break
+                op = action.op
+                if op in (SyncOp.UPLOAD, SyncOp.DOWNLOAD):
+                    while self._pending.qsize() >= self.MAX_BACKLOG and not scan.cancelled:
+                        time.sleep(0.05)
+                    if op == SyncOp.UPLOAD:
+                        job = TransferJob(
+                            "upload", action.local_path, action.remote_path, size=action.size, priority=BULK,
+                            mtime=action.mtime, touch_source=planner.mode == SyncMode.BOTH,
+                        )
+                    else:
+                        job = TransferJob(
+                            "download", action.remote_path, action.local_path, size=action.size, priority=BULK,
+                            mtime=action.mtime,
+                        )
+                    self.submit(job)
+                    scan.files += 1
+                elif op == SyncOp.MKDIR_LOCAL:
+                    os.makedirs(action.local_path, exist_ok=True)
+                    scan.directories += 1
+                elif op == SyncOp.MKDIR_REMOTE:
+                    if self.connector.needs_directories:
+                        self.connector.create_directory(action.remote_path)
+                    scan.directories += 1
+                elif op == SyncOp.DELETE_LOCAL:
+                    try:
+                        if action.is_directory:
+                            os.rmdir(action.local_path)
+                        else:
+                            os.remove(action.local_path)
+                        scan.deleted += 1
+                    except OSError as e:
+                        scan.failed += 1
+                        scan.error = f"Silinemedi: {action.local_path} ({e.strerror})"
+                elif op == SyncOp.DELETE_REMOTE:
+                    # Silinemeyen dosya planın geri kalanını durdurmaz; aktarım hataları gibi sayılır
+                    if self.connector.delete(action.remote_path):
+                        scan.deleted += 1
+                    else:
+                        scan.failed += 1
+                        scan.error = f"Silinemedi: {action.remote_path}"
+                else:
+                    scan.skipped += 1
+                if (scan.files + scan.directories + scan.deleted) % 100 == 0:
+                    self._notify_scan(scan)
+            scan.skipped += planner.unchanged
+            scan.state = JobState.CANCELLED if scan.cancelled else JobState.DONE
+        except Exception as e:
+            if scan.cancelled:
+                scan.state = JobState.CANCELLED
+            else:
+                scan.state = JobState.FAILED
+                scan.error = str(e)
+        self._end_scan(scan)
+
+    def _end_scan(self, scan: TreeScan) -> None:
+        with self._lock:
+            self._scans.remove(scan)
+        self._notify_scan(scan)
+
+    def _set_state(self, job: TransferJob, state: JobState, expect: Optional[JobState] = None) -> bool:
+        """Move job to state and keep the counts in step; with expect, only if the job is still in that state."""
+        with self._lock:
+            if expect is not None and job.state != expect:
+                return False
+            tracked = job.id in self._jobs
+            if tracked:
+                self._counts[job.state] -= 1
+                self._counts[state] += 1
+            job.state = state
+            if not tracked:
+                return True
+            if job.finished:
+                if state == JobState.DONE:
+                    self._done_bytes += job.transferred
+                self._track_finished(job)
+            else:
+                self._finished.pop(job.id, None)
+        return True
+
+    def _track_finished(self, job: TransferJob) -> None:
+        # Kilit tutulurken çağrılır
+        self._finished[job.id] = None
+        while len(self._finished) > self.MAX_FINISHED:
+            oldest = next(iter(self._finished))
+            del self._finished[oldest]
+            del self._jobs[oldest]
+
+    def _notify_scan(self, scan: TreeScan) -> None:
+        if self.on_scan_update:
+            try:
+                self.on_scan_update(scan)
+            except Exception:
+                pass
+
+    def _flush_progress(self, jobs: list[TransferJob], stats: TransferStats) -> None:
+        if self.on_progress:
+            self.on_progress(jobs, stats)
+        else:
+            for job in jobs:
+                self._notify(job)
+
+    def _notify(self, job: TransferJob) -> None:
+        if self.on_update:
+            try:
+                self.on_update(job)
+            except Exception:
+                pass
+
+    def _worker(self) -> None:
+        while True:
+            item = self._pending.get()
+            job = item[2]
+            if job is None:
+                break
+            with self._lock:
+                surplus = len(self._workers) > self.max_workers
+                if surplus:
+                    self._workers.remove(threading.current_thread())
+            if surplus:
+                # İş sayısı düşürüldü; işi sıradaki worker'a bırak
+                self._pending.put(item)
+                break
+            if job.cancelled:
+                if job.state != JobState.CANCELLED:
+                    self._set_state(job, JobState.CANCELLED)
+                    self._notify(job)
+                continue
+            token = PRIORITY.set(job.priority)
+            try:
+                self._run(self.connector, job)
+            except Exception as e:
+                if job.cancelled:
+                    self._set_state(job, JobState.CANCELLED)
+                else:
+                    job.error = str(e)
+                    self._set_state(job, JobState.FAILED)
+            finally:
+                PRIORITY.reset(token)
+            self._progress.finish(job)
+            job.rate = 0.0
+            self._notify(job)
+
+    def _run(self, connector: BaseConnector, job: TransferJob) -> None:
+        self._set_state(job, JobState.RUNNING)
+        self._notify(job)
+
+        def progress(current: int, total: int):
+            if job.cancelled:
+                raise TransferCancelled()
+            job.transferred = current
+            job.size = total
+            self._progress.report(job)
+
+        if job.direction == "download":
+            ok = connector.download_file(job.source, job.destination, progress_callback=progress, resume=job.resume)
+        else:
+            ok = connector.upload_file(job.source, job.destination, progress_callback=progress, resume=job.resume)
+        if job.cancelled:
+            raise TransferCancelled()
+        if ok is False:
+            raise RuntimeError("Bağlantı yok")
+        job.transferred = job.size = max(job.size, job.transferred)
+        if job.mtime is not None:
+            self._keep_mtime(connector, job)
+        self._set_state(job, JobState.DONE)
+
+    @staticmethod
+    def _keep_mtime(connector: BaseConnector, job: TransferJob) -> None:
+        # Aktarım bitti; zaman ayarlanamazsa bir sonraki senkronizasyon dosyayı yeniden karşılaştırır
+        try:
+            if job.direction == "download":
+                os.utime(job.destination, (job.mtime, job.mtime))
+            elif not connector.set_mtime(job.destination, job.mtime) and job.touch_source:
+                info = connector.stat(job.destination)
+                if info is not None and info.mtime is not None:
+                    os.utime(job.source, (info.mtime, info.mtime))
+        except Exception:
+            pass
@@ -0,0 +1,67 @@
+"""Streaming directory tree walkers for recursive transfers."""
+
+import os
+from typing import Iterator
+
+from connectors.base import BaseConnector, RemoteFile
+
+
+def join_remote(base: str, name: str) -> str:
+    """Join a remote directory and a child name ("" is the S3 bucket root)."""
+    name = name.strip("/")
+    if not base:
+        return name
+    return f"{base.rstrip('/')}/{name}"
+
+
+def walk_remote(connector: BaseConnector, root: str) -> Iterator[tuple[str, RemoteFile]]:
+    """
+    Yield (relative_path, entry) for everything below root, one directory
+    listing at a time. A directory is always yielded before its contents, so
+    callers can create it on the other side before any file inside arrives.
+    Relative paths use "/" as separator.
+    """
+    stack = [(root, "")]
+    while stack:
+        path, rel = stack.pop()
+        for entry in connector.list_directory(path):
+            child_rel = f"{rel}/{entry.name.strip('/')}" if rel else entry.name.strip("/")
+            yield child_rel, entry
+            if entry.is_directory:
+                stack.append((entry.path, child_rel))
+
+
+def list_local(path: str) -> list[RemoteFile]:
+    """List one local directory as RemoteFile entries. Symlinked directories count as files."""
+    files = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                st = entry.stat()
+            except OSError:
+                continue
+            files.append(RemoteFile(
+                name=entry.name,
+                path=entry.path,
+                size=0 if is_dir else st.st_size,
+                is_directory=is_dir,
+                mtime=st.st_mtime
+            ))
+    return files
+
+
+def walk_local(root: str) -> Iterator[tuple[str, RemoteFile]]:
+    """Local counterpart of walk_remote built on os.scandir. Symlinked directories are not followed."""
+    stack = [(root, "")]
+    while stack:
+        path, rel = stack.pop()
+        try:
+            entries = list_local(path)
+        except OSError:
+            continue
+        for entry in entries:
+            child_rel = f"{rel}/{entry.name}" if rel else entry.name
+            yield child_rel, entry
+            if entry.is_directory:
+                stack.append((entry.path, child_rel))
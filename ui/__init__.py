@@ -2,6 +2,7 @@
 
 from .panels import FilePanel
 from .connection_dialog import ConnectionDialog
-from .progress_dialog import ProgressDialog
+from .queue_panel import QueuePanel
+from .sync_dialog import SyncDialog, SyncPreviewDialog
 
-__all__ = ["FilePanel", "ConnectionDialog", "ProgressDialog"]
+__all__ = ["FilePanel", "ConnectionDialog", "QueuePanel", "SyncDialog", "SyncPreviewDialog"]
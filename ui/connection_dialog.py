@@ -30,7 +30,7 @@ class ConnectionDialog(ttk.Toplevel):
         self.result = None
 
         self.title("Yeni Bağlantı")
-        self.geometry("520x520")
+        self.geometry("520x640")
         self.minsize(480, 450)
         self.resizable(True, True)
 
@@ -83,6 +83,7 @@ class ConnectionDialog(ttk.Toplevel):
 
         self._build_ftp_fields(content)
         self._build_s3_fields(content)
+        self._build_transfer_fields(content)
         self._on_protocol_change()
 
         # Kaydet seçeneği
@@ -130,6 +131,7 @@ class ConnectionDialog(ttk.Toplevel):
                     self.ftp_user.insert(0, c.get("username", ""))
                     self.ftp_pass.delete(0, tk.END)
                     self.ftp_pass.insert(0, c.get("password", ""))
+                    self.compress_var.set(bool(c.get("compression", False)))
                 else:
                     self.s3_access.delete(0, tk.END)
                     self.s3_access.insert(0, c.get("access_key", ""))
@@ -139,6 +141,15 @@ class ConnectionDialog(ttk.Toplevel):
                     self.s3_region.insert(0, c.get("region", "us-east-1"))
                     self.s3_bucket.delete(0, tk.END)
                     self.s3_bucket.insert(0, c.get("bucket", ""))
+                    self.s3_part_size.delete(0, tk.END)
+                    self.s3_part_size.insert(0, str(c.get("s3_part_size_mb", 8)))
+                    self.s3_threshold.delete(0, tk.END)
+                    self.s3_threshold.insert(0, str(c.get("s3_threshold_mb", 16)))
+                    self.s3_concurrency.delete(0, tk.END)
+                    self.s3_concurrency.insert(0, str(c.get("s3_max_concurrency", 8)))
+                self.workers_var.set(str(c.get("transfer_workers", 3)))
+                self.rate_limit_var.set(str(c.get("rate_limit_kbps", 0)))
+                self.autotune_var.set(bool(c.get("autotune", False)))
                 self.save_name_var.set(name)
                 break
 
@@ -173,6 +184,11 @@ class ConnectionDialog(ttk.Toplevel):
         self.ftp_pass = ttk.Entry(ftp_inner, width=35, show="•")
         self.ftp_pass.grid(row=3, column=1, sticky=EW, pady=3)
 
+        self.compress_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            ftp_inner, text="Sıkıştırma (SSH zlib / FTP MODE Z)", variable=self.compress_var
+        ).grid(row=4, column=1, sticky=W, pady=3)
+
         ftp_inner.columnconfigure(1, weight=1)
 
     def _build_s3_fields(self, parent):
@@ -198,16 +214,52 @@ class ConnectionDialog(ttk.Toplevel):
         self.s3_bucket = ttk.Entry(s3_inner, width=35)
         self.s3_bucket.grid(row=3, column=1, sticky=EW, pady=3)
 
+        ttk.Label(s3_inner, text="Parça boyutu (MB):").grid(row=4, column=0, sticky=W, pady=3, padx=(0, 10))
+        self.s3_part_size = ttk.Entry(s3_inner, width=10)
+        self.s3_part_size.grid(row=4, column=1, sticky=W, pady=3)
+        self.s3_part_size.insert(0, "8")
+
+        ttk.Label(s3_inner, text="Çok parçalı eşik (MB):").grid(row=5, column=0, sticky=W, pady=3, padx=(0, 10))
+        self.s3_threshold = ttk.Entry(s3_inner, width=10)
+        self.s3_threshold.grid(row=5, column=1, sticky=W, pady=3)
+        self.s3_threshold.insert(0, "16")
+
+        ttk.Label(s3_inner, text="Eşzamanlı parça:").grid(row=6, column=0, sticky=W, pady=3, padx=(0, 10))
+        self.s3_concurrency = ttk.Entry(s3_inner, width=10)
+        self.s3_concurrency.grid(row=6, column=1, sticky=W, pady=3)
+        self.s3_concurrency.insert(0, "8")
+
         s3_inner.columnconfigure(1, weight=1)
 
+    def _build_transfer_fields(self, parent):
+        self.transfer_frame = ttk.LabelFrame(parent, text="Transfer Ayarları")
+        self.transfer_frame.pack(fill=X, pady=5)
+        transfer_inner = ttk.Frame(self.transfer_frame)
+        transfer_inner.pack(fill=X, padx=15, pady=10)
+
+        ttk.Label(transfer_inner, text="Eşzamanlı transfer:").grid(row=0, column=0, sticky=W, pady=3, padx=(0, 10))
+        self.workers_var = tk.StringVar(value="3")
+        ttk.Spinbox(transfer_inner, from_=1, to=16, textvariable=self.workers_var, width=8).grid(row=0, column=1, sticky=W, pady=3)
+
+        ttk.Label(transfer_inner, text="Hız sınırı (KB/s, 0 = yok):").grid(row=1, column=0, sticky=W, pady=3, padx=(0, 10))
+        self.rate_limit_var = tk.StringVar(value="0")
+        ttk.Spinbox(
+            transfer_inner, from_=0, to=1_000_000, increment=100, textvariable=self.rate_limit_var, width=8
+        ).grid(row=1, column=1, sticky=W, pady=3)
+
+        self.autotune_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            transfer_inner, text="Eşzamanlılığı otomatik ayarla", variable=self.autotune_var
+        ).grid(row=2, column=1, sticky=W, pady=3)
+
     def _on_protocol_change(self):
         proto = self.protocol_var.get()
         if proto == "s3":
             self.ftp_frame.pack_forget()
-            self.s3_frame.pack(fill=BOTH, expand=True, pady=5)
+            self.s3_frame.pack(fill=BOTH, expand=True, pady=5, before=self.transfer_frame)
         else:
             self.s3_frame.pack_forget()
-            self.ftp_frame.pack(fill=BOTH, expand=True, pady=5)
+            self.ftp_frame.pack(fill=BOTH, expand=True, pady=5, before=self.transfer_frame)
             default_port = 22 if proto == "sftp" else 21
             self.ftp_port.delete(0, tk.END)
             self.ftp_port.insert(0, str(default_port))
@@ -222,6 +274,9 @@ class ConnectionDialog(ttk.Toplevel):
                     "secret_key": self.s3_secret.get(),
                     "region": self.s3_region.get().strip() or "us-east-1",
                     "bucket": self.s3_bucket.get().strip(),
+                    "s3_part_size_mb": max(5, int(self.s3_part_size.get() or 8)),
+                    "s3_threshold_mb": max(5, int(self.s3_threshold.get() or 16)),
+                    "s3_max_concurrency": max(1, int(self.s3_concurrency.get() or 8)),
                 }
                 if not config["bucket"]:
                     messagebox.showwarning("Uyarı", "Bucket adı girin.")
@@ -234,10 +289,14 @@ class ConnectionDialog(ttk.Toplevel):
                     "port": port,
                     "username": self.ftp_user.get().strip(),
                     "password": self.ftp_pass.get(),
+                    "compression": self.compress_var.get(),
                 }
                 if not config["host"]:
                     messagebox.showwarning("Uyarı", "Sunucu adresi girin.")
                     return
+            config["transfer_workers"] = max(1, int(self.workers_var.get() or 3))
+            config["rate_limit_kbps"] = max(0, int(self.rate_limit_var.get() or 0))
+            config["autotune"] = self.autotune_var.get()
 
             if self.save_var.get():
                 name = self.save_name_var.get().strip() or config.get("host", config.get("bucket", "Bağlantı"))
@@ -247,7 +306,7 @@ class ConnectionDialog(ttk.Toplevel):
             self.result = config
             self.destroy()
         except ValueError:
-            messagebox.showerror("Hata", "Geçersiz port numarası.")
+            messagebox.showerror("Hata", "Geçersiz port veya sayı değeri.")
         except Exception as e:
             messagebox.showerror("Bağlantı Hatası", str(e))
 
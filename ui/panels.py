@@ -2,7 +2,7 @@
 
 import os
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import font, messagebox
 from typing import Callable, Optional
 
 import ttkbootstrap as ttk
@@ -21,8 +21,31 @@ def format_size(size: int) -> str:
     return f"{size:.1f} PB"
 
 
+def format_rate(bytes_per_second: float) -> str:
+    """Format a throughput for display."""
+    if bytes_per_second < 1:
+        return "-"
+    return format_size(int(bytes_per_second)) + "/s"
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """Format an ETA as m:ss or h:mm:ss."""
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
 class FilePanel(ttk.Frame):
-    """Single file browser panel (local or remote)."""
+    """
+    Single file browser panel (local or remote).
+
+    The Treeview only ever holds as many rows as fit on screen; scrolling
+    rewrites those rows from the backing list, so a listing of any size
+    costs the same to show. Selection is kept as indices into that list.
+    """
 
     def __init__(
         self,
@@ -32,6 +55,7 @@ class FilePanel(ttk.Frame):
         on_navigate: Optional[Callable[[str], None]] = None,
         on_select: Optional[Callable[[str, bool], None]] = None,
         on_double_click: Optional[Callable[[str, bool], None]] = None,
+        on_refresh: Optional[Callable[[str], None]] = None,
         **kwargs
     ):
         super().__init__(parent, **kwargs)
@@ -40,10 +64,18 @@ class FilePanel(ttk.Frame):
         self.on_navigate = on_navigate
         self.on_select = on_select
         self.on_double_click = on_double_click
+        self.on_refresh = on_refresh
         self.current_path = "/" if is_remote else os.path.expanduser("~")
         self.selected_path: Optional[str] = None
         self.selected_is_dir: bool = False
         self._items: list[RemoteFile] = []
+        self._offset = 0
+        self._rows = 0
+        self._row_height = 0
+        self._selection: set[int] = set()
+        self._cursor: Optional[int] = None
+        self._anchor: Optional[int] = None
+        self._on_cancel_loading: Optional[Callable[[], None]] = None
         self.show_hidden = False
         self._build_ui()
 
@@ -68,17 +100,23 @@ class FilePanel(ttk.Frame):
 
         ttk.Button(header, text="↺", bootstyle=OUTLINE, width=3, command=self.refresh).pack(side=LEFT, padx=2)
         ttk.Button(header, text="↑", bootstyle=OUTLINE, width=3, command=self._go_up).pack(side=LEFT, padx=2)
+        # Sadece uzun bir listeleme sürerken görünür
+        self.cancel_btn = ttk.Button(header, text="✕", bootstyle="danger-outline", width=3, command=self._cancel_loading)
+
+        self.status_var = ttk.StringVar(value="")
+        ttk.Label(self, textvariable=self.status_var, font=("Helvetica", 9)).pack(side=BOTTOM, anchor=W, padx=5)
 
         self.tree_frame = ttk.Frame(self)
         self.tree_frame.pack(fill=BOTH, expand=True, padx=5, pady=5)
 
         columns = ("name", "size", "modified")
+        # Seçim Treeview'e bırakılmaz; satırlar kaydırdıkça yeniden kullanılıyor
         self.tree = ttk.Treeview(
             self.tree_frame,
             columns=columns,
             show="headings",
             height=15,
-            selectmode="browse",
+            selectmode="none",
             bootstyle="secondary"
         )
         self.tree.heading("name", text="İsim")
@@ -88,15 +126,26 @@ class FilePanel(ttk.Frame):
         self.tree.column("size", width=80, minwidth=60)
         self.tree.column("modified", width=120, minwidth=80)
 
-        scrollbar = ttk.Scrollbar(self.tree_frame)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        scrollbar.configure(command=self.tree.yview)
+        self.scrollbar = ttk.Scrollbar(self.tree_frame, command=self._on_scrollbar)
 
         self.tree.pack(side=LEFT, fill=BOTH, expand=True)
-        scrollbar.pack(side=RIGHT, fill=Y)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
 
-        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<Button-1>", lambda e: self._on_click(e, extend=False, toggle=False))
+        self.tree.bind("<Shift-Button-1>", lambda e: self._on_click(e, extend=True, toggle=False))
+        self.tree.bind("<Control-Button-1>", lambda e: self._on_click(e, extend=False, toggle=True))
         self.tree.bind("<Double-1>", self._on_double_click)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_to(self._offset - 3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_to(self._offset + 3))
+        self.tree.bind("<Up>", lambda e: self._move_cursor(-1, e))
+        self.tree.bind("<Down>", lambda e: self._move_cursor(1, e))
+        self.tree.bind("<Prior>", lambda e: self._move_cursor(-max(1, self._rows - 1), e))
+        self.tree.bind("<Next>", lambda e: self._move_cursor(max(1, self._rows - 1), e))
+        self.tree.bind("<Home>", lambda e: self._move_cursor(-len(self._items), e))
+        self.tree.bind("<End>", lambda e: self._move_cursor(len(self._items), e))
+        self.tree.bind("<Return>", lambda e: self._open_cursor())
         self.tree.bind("<BackSpace>", lambda e: self._go_up())
 
     def _on_show_hidden_change(self):
@@ -121,45 +170,193 @@ class FilePanel(ttk.Frame):
             if self.on_navigate:
                 self.on_navigate(parent)
 
-    def _on_select(self, event):
-        sel = self.tree.selection()
-        if sel:
-            item = self.tree.item(sel[0])
-            idx = self.tree.index(sel[0])
-            if 0 <= idx < len(self._items):
-                f = self._items[idx]
-                self.selected_path = f.path
-                self.selected_is_dir = f.is_directory
-                if self.on_select:
-                    self.on_select(f.path, f.is_directory)
+    # --- Sanal liste -------------------------------------------------
+
+    def _on_resize(self, event):
+        if not self._row_height:
+            self._row_height = self._measure_row_height()
+        # Başlık satırı da bir satır yüksekliği kadar yer tutar
+        rows = max(1, event.height // self._row_height - 1)
+        if rows != self._rows:
+            self._set_row_count(rows)
+            self._render()
+
+    def _measure_row_height(self) -> int:
+        style = ttk.Style()
+        try:
+            height = int(style.lookup("Treeview", "rowheight") or 0)
+        except (ValueError, tk.TclError):
+            height = 0
+        if not height:
+            height = font.nametofont("TkDefaultFont").metrics("linespace") + 4
+        return height
+
+    def _set_row_count(self, rows: int):
+        for i in range(self._rows, rows):
+            self.tree.insert("", END, iid=f"r{i}", values=("", "", ""))
+        for i in range(rows, self._rows):
+            self.tree.delete(f"r{i}")
+        self._rows = rows
+
+    def _render(self):
+        """Write the visible window of the backing list into the recycled rows."""
+        total = len(self._items)
+        self._offset = max(0, min(self._offset, total - self._rows))
+        selected = []
+        for i in range(self._rows):
+            idx = self._offset + i
+            iid = f"r{i}"
+            if idx < total:
+                self.tree.item(iid, values=self._row_values(self._items[idx]))
+                if idx in self._selection:
+                    selected.append(iid)
+            else:
+                self.tree.item(iid, values=("", "", ""))
+        self.tree.selection_set(selected)
+        if total > self._rows:
+            self.scrollbar.set(self._offset / total, (self._offset + self._rows) / total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _row_values(self, f: RemoteFile) -> tuple:
+        size_str = format_size(f.size) if not f.is_directory else "<DIR>"
+        mod_str = f.modified or "-"
+        name = f.name + "/" if f.is_directory and not f.name.endswith("/") else f.name
+        return (name, size_str, mod_str)
+
+    def _scroll_to(self, offset: int):
+        offset = max(0, min(offset, len(self._items) - self._rows))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * len(self._items)))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (max(1, self._rows - 1) if args[2] == "pages" else 1)
+            self._scroll_to(self._offset + step)
+
+    def _on_wheel(self, event):
+        # Windows'ta delta 120'nin katları, macOS'ta küçük tam sayılar
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self._scroll_to(self._offset - 3 * delta)
+
+    def _index_at(self, y: int) -> Optional[int]:
+        iid = self.tree.identify_row(y)
+        if not iid:
+            return None
+        idx = self._offset + int(iid[1:])
+        return idx if idx < len(self._items) else None
+
+    def _on_click(self, event, extend: bool, toggle: bool):
+        self.tree.focus_set()
+        if self.tree.identify_region(event.x, event.y) == "heading":
+            return
+        idx = self._index_at(event.y)
+        if idx is None:
+            if not extend and not toggle:
+                self._selection.clear()
+                self.selected_path = None
+                self._render()
+            return "break"
+        self._select(idx, extend, toggle)
+        return "break"
+
+    def _select(self, idx: int, extend: bool = False, toggle: bool = False):
+        if extend and self._anchor is not None:
+            lo, hi = sorted((self._anchor, idx))
+            self._selection = set(range(lo, hi + 1))
+        elif toggle:
+            self._selection ^= {idx}
+            self._anchor = idx
+        else:
+            self._selection = {idx}
+            self._anchor = idx
+        self._cursor = idx
+        if idx < self._offset:
+            self._offset = idx
+        elif idx >= self._offset + self._rows:
+            self._offset = idx - self._rows + 1
+        self._render()
+
+        f = self._items[idx]
+        if idx not in self._selection:
+            # Ctrl ile seçimden çıkarılan satır seçili sayılmaz
+            self.selected_path = None
+            return
+        self.selected_path = f.path
+        self.selected_is_dir = f.is_directory
+        if self.on_select:
+            self.on_select(f.path, f.is_directory)
+
+    def _move_cursor(self, step: int, event):
+        if not self._items:
+            return "break"
+        start = self._cursor if self._cursor is not None else (-1 if step > 0 else len(self._items))
+        idx = max(0, min(len(self._items) - 1, start + step))
+        self._select(idx, extend=bool(event.state & 0x0001))
+        return "break"
+
+    def _open_cursor(self):
+        if self._cursor is not None and self._cursor < len(self._items) and self.on_double_click:
+            f = self._items[self._cursor]
+            self.on_double_click(f.path, f.is_directory)
 
     def _on_double_click(self, event):
-        sel = self.tree.selection()
-        if sel:
-            idx = self.tree.index(sel[0])
-            if 0 <= idx < len(self._items):
-                f = self._items[idx]
-                if self.on_double_click:
-                    self.on_double_click(f.path, f.is_directory)
+        idx = self._index_at(event.y)
+        if idx is not None and self.on_double_click:
+            f = self._items[idx]
+            self.on_double_click(f.path, f.is_directory)
 
     def set_path(self, path: str):
         self.current_path = path
         self.path_var.set(path if path else "/")
 
     def refresh(self):
-        if self.on_navigate:
+        if self.on_refresh:
+            self.on_refresh(self.current_path)
+        elif self.on_navigate:
             self.on_navigate(self.current_path)
 
     def load_items(self, items: list[RemoteFile]):
-        self._items = items
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        """Replace the listing; only the visible rows are touched."""
+        self._items = list(items)
+        self._offset = 0
+        self._selection.clear()
+        self._cursor = self._anchor = None
+        self.selected_path = None
+        self._render()
+
+    def begin_loading(self, on_cancel: Optional[Callable[[], None]] = None):
+        """Clear the panel for a listing that will arrive in batches."""
+        self.load_items([])
+        self._on_cancel_loading = on_cancel
+        self.cancel_btn.pack(side=LEFT, padx=2)
+        self.status_var.set("Yükleniyor...")
 
-        for f in items:
-            size_str = format_size(f.size) if not f.is_directory else "<DIR>"
-            mod_str = f.modified or "-"
-            name = f.name + "/" if f.is_directory and not f.name.endswith("/") else f.name
-            self.tree.insert("", END, values=(name, size_str, mod_str))
+    def append_items(self, items: list[RemoteFile]):
+        """Add a batch of rows at the end while a listing is still arriving."""
+        self._items.extend(items)
+        self._render()
+        self.status_var.set(f"Yükleniyor... {len(self._items)} öğe")
+
+    def finish_loading(self, items: Optional[list[RemoteFile]] = None):
+        """
+        End a batched listing. items is the complete sorted listing; None
+        means the listing was cut short and the rows so far are kept.
+        """
+        self._on_cancel_loading = None
+        self.cancel_btn.pack_forget()
+        if items is not None:
+            self.load_items(items)
+            self.status_var.set("")
+        else:
+            self.status_var.set(f"Liste yarıda kesildi ({len(self._items)} öğe)")
+
+    def _cancel_loading(self):
+        if self._on_cancel_loading:
+            self._on_cancel_loading()
 
     def load_local_items(self, path: str):
         items = []
@@ -191,3 +388,10 @@ class FilePanel(ttk.Frame):
         if self.selected_path:
             return (self.selected_path, self.selected_is_dir)
         return None
+
+    def get_selected_items(self) -> list[tuple[str, bool]]:
+        """Return (path, is_dir) for every selected row."""
+        return [
+            (self._items[idx].path, self._items[idx].is_directory)
+            for idx in sorted(self._selection) if idx < len(self._items)
+        ]
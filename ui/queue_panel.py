@@ -0,0 +1,172 @@
+"""Non-modal transfer queue view."""
+
+from typing import Callable, Optional
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+from transfer import JobState, TransferJob
+from .panels import format_duration, format_rate, format_size
+
+
+STATE_LABELS = {
+    JobState.QUEUED: "Sırada",
+    JobState.RUNNING: "Aktarılıyor",
+    JobState.DONE: "Tamamlandı",
+    JobState.FAILED: "Hata",
+    JobState.CANCELLED: "İptal edildi",
+}
+
+
+class QueuePanel(ttk.Frame):
+    """
+    Lists transfer jobs with their state and progress.
+
+    At most MAX_ROWS rows are kept: queued jobs beyond that get a row once
+    they start, and the oldest finished rows make room for new ones.
+    """
+
+    # Büyük ağaç aktarımında Treeview on binlerce satırla yavaşlamasın
+    MAX_ROWS = 500
+
+    def __init__(
+        self,
+        parent,
+        on_cancel: Optional[Callable[[list[int]], None]] = None,
+        on_cancel_all: Optional[Callable[[], None]] = None,
+        on_clear: Optional[Callable[[], None]] = None,
+        on_retry: Optional[Callable[[list[int]], None]] = None,
+        on_rate_limit: Optional[Callable[[int], None]] = None,
+        **kwargs
+    ):
+        super().__init__(parent, **kwargs)
+        self.on_rate_limit = on_rate_limit
+        self.on_cancel = on_cancel
+        self.on_retry = on_retry
+        self.on_cancel_all = on_cancel_all
+        self.on_clear = on_clear
+        # Satırı olan biten işler, bitiş sırasıyla
+        self._finished: dict[str, None] = {}
+        self._rows = 0
+        self._build_ui()
+
+    def _build_ui(self):
+        header = ttk.Frame(self)
+        header.pack(fill=X, padx=5, pady=(5, 2))
+
+        ttk.Label(header, text="Transfer Kuyruğu", font=("Helvetica", 11, "bold")).pack(side=LEFT)
+        self.summary_var = ttk.StringVar(value="")
+        ttk.Label(header, textvariable=self.summary_var).pack(side=LEFT, padx=10)
+
+        ttk.Button(header, text="Bitenleri Temizle", bootstyle=OUTLINE, command=self._clear).pack(side=RIGHT, padx=2)
+        ttk.Button(header, text="Tümünü İptal", bootstyle="danger-outline", command=self._cancel_all).pack(side=RIGHT, padx=2)
+        ttk.Button(header, text="İptal", bootstyle=OUTLINE, command=self._cancel_selected).pack(side=RIGHT, padx=2)
+        ttk.Button(header, text="Yeniden Dene", bootstyle=OUTLINE, command=self._retry_selected).pack(side=RIGHT, padx=2)
+
+        # Aktarımlar sürerken değiştirilebilir; 0 sınırsız
+        self.rate_limit_var = ttk.StringVar(value="0")
+        limit = ttk.Spinbox(
+            header, from_=0, to=1_000_000, increment=100, width=8,
+            textvariable=self.rate_limit_var, command=self._apply_rate_limit,
+        )
+        limit.bind("<Return>", lambda e: self._apply_rate_limit())
+        limit.bind("<FocusOut>", lambda e: self._apply_rate_limit())
+        limit.pack(side=RIGHT, padx=(2, 10))
+        ttk.Label(header, text="Hız sınırı (KB/s):").pack(side=RIGHT)
+
+        tree_frame = ttk.Frame(self)
+        tree_frame.pack(fill=BOTH, expand=True, padx=5, pady=5)
+
+        columns = ("name", "direction", "state", "progress", "detail")
+        self.tree = ttk.Treeview(
+            tree_frame,
+            columns=columns,
+            show="headings",
+            height=6,
+            selectmode="extended",
+            bootstyle="secondary"
+        )
+        self.tree.heading("name", text="Dosya")
+        self.tree.heading("direction", text="Yön")
+        self.tree.heading("state", text="Durum")
+        self.tree.heading("progress", text="İlerleme")
+        self.tree.heading("detail", text="Ayrıntı")
+        self.tree.column("name", width=250, minwidth=150)
+        self.tree.column("direction", width=70, minwidth=60)
+        self.tree.column("state", width=100, minwidth=80)
+        self.tree.column("progress", width=280, minwidth=100)
+        self.tree.column("detail", width=300, minwidth=100)
+
+        scrollbar = ttk.Scrollbar(tree_frame)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.configure(command=self.tree.yview)
+
+        self.tree.pack(side=LEFT, fill=BOTH, expand=True)
+        scrollbar.pack(side=RIGHT, fill=Y)
+
+    def update_job(self, job: TransferJob):
+        """Insert or refresh the row for a job."""
+        direction = "⬇ İndir" if job.direction == "download" else "⬆ Yükle"
+        if job.size > 0:
+            pct = min(100, int(100 * job.transferred / job.size))
+            progress = f"{pct}%  ({format_size(job.transferred)} / {format_size(job.size)})"
+        else:
+            progress = "-"
+        if job.state == JobState.RUNNING and job.rate > 0:
+            progress += f"  {format_rate(job.rate)}  {format_duration(job.eta)}"
+        detail = job.error or job.destination
+        values = (job.name, direction, STATE_LABELS.get(job.state, job.state), progress, detail)
+        iid = str(job.id)
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=values)
+        elif job.state == JobState.RUNNING or self._rows < self.MAX_ROWS:
+            self.tree.insert("", END, iid=iid, values=values)
+            self._rows += 1
+        else:
+            return
+        # Yer açmak için en eski biten satırlar gider
+        while self._rows > self.MAX_ROWS and self._finished:
+            oldest = next(iter(self._finished))
+            del self._finished[oldest]
+            self.tree.delete(oldest)
+            self._rows -= 1
+        if job.finished:
+            self._finished.setdefault(iid)
+
+    def remove_jobs(self, jobs: list[TransferJob]):
+        for job in jobs:
+            iid = str(job.id)
+            self._finished.pop(iid, None)
+            if self.tree.exists(iid):
+                self.tree.delete(iid)
+                self._rows -= 1
+
+    def set_summary(self, text: str):
+        self.summary_var.set(text)
+
+    def _cancel_selected(self):
+        ids = [int(iid) for iid in self.tree.selection()]
+        if ids and self.on_cancel:
+            self.on_cancel(ids)
+
+    def _retry_selected(self):
+        ids = [int(iid) for iid in self.tree.selection()]
+        if ids and self.on_retry:
+            self.on_retry(ids)
+
+    def _apply_rate_limit(self):
+        try:
+            kbps = max(0, int(float(self.rate_limit_var.get() or 0)))
+        except ValueError:
+            kbps = 0
+        self.rate_limit_var.set(str(kbps))
+        if self.on_rate_limit:
+            self.on_rate_limit(kbps)
+
+    def _cancel_all(self):
+        if self.on_cancel_all:
+            self.on_cancel_all()
+
+    def _clear(self):
+        if self.on_clear:
+            self.on_clear()
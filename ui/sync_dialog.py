@@ -0,0 +1,141 @@
+"""Dialogs for mirroring a local and a remote folder."""
+
+import tkinter as tk
+from typing import Callable
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+from transfer import SyncAction, SyncMode, SyncOp
+from .panels import format_size
+
+
+OP_LABELS = {
+    SyncOp.UPLOAD: "⬆ Yükle",
+    SyncOp.DOWNLOAD: "⬇ İndir",
+    SyncOp.MKDIR_REMOTE: "📁 Uzakta oluştur",
+    SyncOp.MKDIR_LOCAL: "📁 Yerelde oluştur",
+    SyncOp.DELETE_REMOTE: "🗑 Uzaktan sil",
+    SyncOp.DELETE_LOCAL: "🗑 Yerelden sil",
+    SyncOp.CONFLICT: "⚠ Çakışma",
+}
+
+
+class SyncDialog(ttk.Toplevel):
+    """Asks for the sync direction and options."""
+
+    def __init__(self, parent, local_path: str, remote_path: str, on_start: Callable[[dict], None], **kwargs):
+        super().__init__(parent, **kwargs)
+        self.on_start = on_start
+
+        self.title("Senkronize Et")
+        self.geometry("480x330")
+        self.resizable(True, False)
+
+        self.transient(parent)
+        self.grab_set()
+
+        main = ttk.Frame(self)
+        main.pack(fill=BOTH, expand=True, padx=20, pady=20)
+
+        ttk.Label(main, text=f"Yerel: {local_path}").pack(anchor=W)
+        ttk.Label(main, text=f"Uzak: {remote_path or '/'}").pack(anchor=W, pady=(0, 10))
+
+        ttk.Label(main, text="Yön", font=("Helvetica", 10, "bold")).pack(anchor=W, pady=(0, 5))
+        self.mode_var = tk.StringVar(value=SyncMode.UPLOAD.value)
+        for mode, label in (
+            (SyncMode.UPLOAD, "Yerel → Uzak (uzak klasörü yerelin aynısı yap)"),
+            (SyncMode.DOWNLOAD, "Uzak → Yerel (yerel klasörü uzağın aynısı yap)"),
+            (SyncMode.BOTH, "İki yönlü (önce önizleme gösterilir, daha yeni olan kazanır)"),
+        ):
+            ttk.Radiobutton(
+                main, text=label, variable=self.mode_var, value=mode.value, command=self._on_mode_change
+            ).pack(anchor=W)
+
+        self.delete_var = tk.BooleanVar(value=False)
+        self.delete_check = ttk.Checkbutton(
+            main, text="Kaynakta olmayan dosyaları hedeften sil", variable=self.delete_var
+        )
+        self.delete_check.pack(anchor=W, pady=(10, 0))
+        self.etag_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            main, text="Aynı boyutlu dosyalarda S3 ETag (MD5) karşılaştır", variable=self.etag_var
+        ).pack(anchor=W, pady=(5, 0))
+
+        btn_frame = ttk.Frame(main)
+        btn_frame.pack(fill=X, side=BOTTOM)
+        self.start_btn = ttk.Button(btn_frame, text="Başlat", bootstyle=SUCCESS, command=lambda: self._start(False))
+        self.start_btn.pack(side=RIGHT, padx=5)
+        ttk.Button(btn_frame, text="Önizle", bootstyle=INFO, command=lambda: self._start(True)).pack(side=RIGHT, padx=5)
+        ttk.Button(btn_frame, text="İptal", bootstyle=SECONDARY, command=self.destroy).pack(side=RIGHT)
+
+    def _on_mode_change(self):
+        both = self.mode_var.get() == SyncMode.BOTH.value
+        self.delete_check.configure(state=DISABLED if both else NORMAL)
+        self.start_btn.configure(state=DISABLED if both else NORMAL)
+
+    def _start(self, preview: bool):
+        options = {
+            "mode": SyncMode(self.mode_var.get()),
+            "delete": self.delete_var.get(),
+            "use_etag": self.etag_var.get(),
+            "preview": preview or self.mode_var.get() == SyncMode.BOTH.value,
+        }
+        self.destroy()
+        self.on_start(options)
+
+
+class SyncPreviewDialog(ttk.Toplevel):
+    """Shows a computed sync plan and lets the user apply it."""
+
+    def __init__(self, parent, actions: list[SyncAction], unchanged: int, on_apply: Callable[[], None], **kwargs):
+        super().__init__(parent, **kwargs)
+        self.on_apply = on_apply
+
+        self.title("Senkronizasyon Önizleme")
+        self.geometry("760x460")
+        self.minsize(500, 300)
+
+        self.transient(parent)
+
+        main = ttk.Frame(self)
+        main.pack(fill=BOTH, expand=True, padx=10, pady=10)
+
+        conflicts = sum(1 for a in actions if a.op == SyncOp.CONFLICT)
+        total = sum(a.size for a in actions if a.op in (SyncOp.UPLOAD, SyncOp.DOWNLOAD))
+        summary = f"{len(actions) - conflicts} işlem ({format_size(total)} aktarılacak), {unchanged} değişmemiş dosya"
+        if conflicts:
+            summary += f", {conflicts} çakışma (uygulanmaz)"
+        ttk.Label(main, text=summary).pack(anchor=W, pady=(0, 5))
+
+        tree_frame = ttk.Frame(main)
+        tree_frame.pack(fill=BOTH, expand=True)
+        self.tree = ttk.Treeview(tree_frame, columns=("op", "path", "size", "reason"), show="headings", bootstyle="secondary")
+        self.tree.heading("op", text="İşlem")
+        self.tree.heading("path", text="Yol")
+        self.tree.heading("size", text="Boyut")
+        self.tree.heading("reason", text="Neden")
+        self.tree.column("op", width=140, minwidth=100)
+        self.tree.column("path", width=340, minwidth=150)
+        self.tree.column("size", width=90, minwidth=60)
+        self.tree.column("reason", width=160, minwidth=80)
+        scrollbar = ttk.Scrollbar(tree_frame, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.pack(side=LEFT, fill=BOTH, expand=True)
+        scrollbar.pack(side=RIGHT, fill=Y)
+
+        for action in actions:
+            size = format_size(action.size) if action.size else "-"
+            self.tree.insert("", END, values=(OP_LABELS[action.op], action.rel or "/", size, action.reason))
+
+        btn_frame = ttk.Frame(main)
+        btn_frame.pack(fill=X, pady=(10, 0))
+        apply_btn = ttk.Button(btn_frame, text="Uygula", bootstyle=SUCCESS, command=self._apply)
+        apply_btn.pack(side=RIGHT, padx=5)
+        if len(actions) == conflicts:
+            apply_btn.configure(state=DISABLED)
+        ttk.Button(btn_frame, text="Kapat", bootstyle=SECONDARY, command=self.destroy).pack(side=RIGHT)
+
+    def _apply(self):
+        self.destroy()
+        self.on_apply()